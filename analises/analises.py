@@ -1,16 +1,30 @@
-def verificar(jogo: list, possibilidades: list, resultado_concursos: list):
+from processamento.combinatoria import ranquear
+from processamento.sorteados import BitsetSorteados
+
+
+def verificar(jogo: list, possibilidades: list, resultado_concursos):
 	"""
 	Verifica se o jogo existe na lista de resultados possíveis e
 	se ele ainda não foi sorteado.
 	
 	:param jogo: Jogo criado
-	:param possibilidades: Combinações possíveis da Lotofácil
-	:param resultado_concursos: Resultado de todos os concursos
+	:param possibilidades: Mantido por compatibilidade; a existência do jogo é
+	verificada pelo sistema combinatório (pode ser None)
+	:param resultado_concursos: Resultado de todos os concursos ou o
+	BitsetSorteados correspondente (consulta O(1))
 	
 	return: Retorna False - (Jogo não aceito) e True - (Jogo aceito)	
 	"""
 
-	if jogo in possibilidades and jogo not in resultado_concursos:
-		return True
-	else:
+	if list(jogo) != sorted(jogo):
+		return False
+
+	try:
+		indice = ranquear(jogo)
+	except ValueError:
 		return False
+
+	if isinstance(resultado_concursos, BitsetSorteados):
+		return not resultado_concursos.contem_indices([indice])[0]
+
+	return list(jogo) not in resultado_concursos
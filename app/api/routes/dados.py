@@ -1,10 +1,12 @@
 """Endpoints para exposição pública dos dados históricos."""
 
-from typing import List
+from datetime import date
+from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 
-from app.etl import ConcursoFiltro, carregar_estatisticas, listar_concursos
+from app.etl import ConcursoFiltro, carregar_estatisticas, carregar_resumo, listar_concursos
 from app.features import calcular_estatisticas_avancadas
 
 router = APIRouter()
@@ -20,12 +22,42 @@ def listar_concursos_endpoint(
     offset: int = Query(0, ge=0),
     formato: str = Query("wide", pattern="^(wide|long)$"),
     atualizar: bool = Query(False, description="Força atualização do histórico antes de listar."),
+    data_inicio: Optional[date] = Query(None, description="Primeira data de sorteio (AAAA-MM-DD)."),
+    data_fim: Optional[date] = Query(None, description="Última data de sorteio (AAAA-MM-DD)."),
+    after_concurso: Optional[int] = Query(
+        None,
+        ge=0,
+        description="Cursor: lista a partir do concurso seguinte a este (dispensa offset em páginas profundas).",
+    ),
 ):
-    filtro = ConcursoFiltro(limit=limit, offset=offset, formato=formato, atualizar=atualizar)
+    filtro = ConcursoFiltro(
+        limit=limit,
+        offset=offset,
+        formato=formato,
+        atualizar=atualizar,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        apos_concurso=after_concurso,
+    )
     registros = listar_concursos(filtro)
     if not registros and offset > 0:
         raise HTTPException(status_code=404, detail="Offset além do total de concursos.")
-    return registros
+    # Os registros já saem com tipos nativos; dispensa a validação linha a linha do response_model
+    return JSONResponse(content=registros)
+
+
+@router.get(
+    "/ultimo",
+    summary="Último concurso disponível (número, data e total de concursos)",
+    response_model=dict,
+)
+def ultimo_concurso_endpoint(
+    atualizar: bool = Query(False, description="Atualiza o histórico antes de responder."),
+):
+    resumo = carregar_resumo(atualizar=atualizar)
+    if resumo is None:
+        raise HTTPException(status_code=404, detail="Nenhum concurso disponível.")
+    return resumo
 
 
 @router.get(
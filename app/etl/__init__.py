@@ -7,11 +7,15 @@ from app.etl.concursos import (
     carregar_resumo,
     listar_concursos,
 )
+from app.etl.historico import Historico, HistoricoStore, obter_historico
 
 __all__ = [
     "ConcursoFiltro",
+    "Historico",
+    "HistoricoStore",
     "carregar_concursos",
     "carregar_estatisticas",
     "carregar_resumo",
     "listar_concursos",
+    "obter_historico",
 ]
@@ -2,16 +2,20 @@
 
 import json
 from dataclasses import dataclass
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from dados import scrapping_resultados
+from dados import armazem, scrapping_resultados, snapshots
 
 RESULTADOS_CSV = scrapping_resultados.DESTINO_PADRAO
 CONCURSOS_LONG_CSV = scrapping_resultados.DESTINO_LONG
 ESTATISTICAS_JSON = scrapping_resultados.DESTINO_STATS
+META_JSON = scrapping_resultados.DESTINO_META
+BANCO = armazem.BANCO
 
 
 @dataclass
@@ -20,77 +24,199 @@ class ConcursoFiltro:
     offset: int = 0
     formato: Literal["wide", "long"] = "wide"
     atualizar: bool = False
+    data_inicio: Optional[date] = None
+    data_fim: Optional[date] = None
+    apos_concurso: Optional[int] = None
 
 
-def carregar_concursos(
-    filtro: ConcursoFiltro = ConcursoFiltro(),
-) -> pd.DataFrame:
+def snapshot_atual(publicados: Optional[scrapping_resultados.Caminhos] = None) -> Optional[str]:
     """
-    Carrega os concursos em formato largo (default) ou longo.
+    Identifica o snapshot do histórico publicado pelo ETL (seu id).
+
+    Não confundir com calculos.versao.versao_dados, que é o hash do conteúdo
+    de um DataFrame já carregado.
+
+    Sem snapshot (histórico anterior a eles) vale (mtime_ns, tamanho) do meta
+    ou, na falta dele, do próprio resultados.csv.
     """
 
-    if filtro.atualizar or not RESULTADOS_CSV.exists():
+    publicados = publicados or scrapping_resultados.caminhos_publicados()
+    if publicados.snapshot is not None:
+        return publicados.snapshot
+
+    for arquivo in (publicados.meta, publicados.csv):
+        try:
+            informacoes = arquivo.stat()
+        except FileNotFoundError:
+            continue
+        return f"{informacoes.st_mtime_ns}-{informacoes.st_size}"
+    return None
+
+
+def garantir_banco(atualizar: bool = False) -> None:
+    """
+    Executa o ETL se pedido (ou sem histórico) e garante que o banco reflita
+    ao menos o snapshot publicado.
+
+    O ETL atualiza o banco logo após publicar; se isso ainda não aconteceu
+    (ou falhou), o banco é completado a partir do CSV do snapshot.
+    """
+
+    if atualizar or not scrapping_resultados.caminhos_publicados().csv.exists():
         scrapping_resultados.atualizar_resultados()
 
-    if filtro.formato == "long":
-        if filtro.atualizar or not CONCURSOS_LONG_CSV.exists():
-            # Garantir que a visão esteja atualizada
-            base = pd.read_csv(RESULTADOS_CSV, sep=";", encoding="utf8")
-            scrapping_resultados.gerar_concursos_long(base, CONCURSOS_LONG_CSV)
-        df = pd.read_csv(CONCURSOS_LONG_CSV, sep=";", encoding="utf8")
-    else:
-        df = pd.read_csv(RESULTADOS_CSV, sep=";", encoding="utf8")
+    with scrapping_resultados.fixar_publicados() as publicados:
+        snapshot = publicados.snapshot
+        if snapshot is not None:
+            registrada = armazem.versao_registrada(BANCO)
+            if registrada is not None and registrada >= snapshot:
+                return
+
+        ultimo = armazem.ultimo_concurso(BANCO)
+        if ultimo is not None:
+            meta = scrapping_resultados.ler_json(publicados.meta) or {}
+            esperado = meta.get("ultimo_concurso")
+            if esperado is None or int(esperado) <= ultimo:
+                if snapshot is not None:
+                    armazem.registrar_versao(snapshot, BANCO)
+                return
 
-    return df
+        base = pd.read_csv(publicados.csv, sep=";", encoding="utf8")
+        armazem.atualizar_armazem(base, BANCO, versao=snapshot)
+
+
+def carregar_concursos(
+    filtro: ConcursoFiltro = ConcursoFiltro(),
+    paginar: bool = False,
+) -> pd.DataFrame:
+    """
+    Carrega os concursos em formato largo (default) ou longo, em ordem de concurso.
+
+    Período, formato, cursor (apos_concurso) e, com paginar=True,
+    limit/offset são resolvidos no banco SQLite; sem paginar, todos os
+    concursos do período são retornados.
+    """
+
+    garantir_banco(filtro.atualizar)
+
+    limit = filtro.limit if paginar else None
+    offset = filtro.offset if paginar else 0
+    consulta = armazem.consultar_long if filtro.formato == "long" else armazem.consultar
+    return consulta(
+        limit,
+        offset,
+        filtro.data_inicio,
+        filtro.data_fim,
+        apos_concurso=filtro.apos_concurso,
+        banco=BANCO,
+    )
 
 
 def listar_concursos(filtro: ConcursoFiltro = ConcursoFiltro()) -> List[Dict[str, object]]:
     """Retorna um subconjunto paginado dos concursos no formato amigável."""
 
-    df = carregar_concursos(filtro)
-    df = df.sort_values("Concurso")
-    fatia = df.iloc[filtro.offset : filtro.offset + filtro.limit]
-    registros: List[Dict[str, object]] = []
+    fatia = carregar_concursos(filtro, paginar=True)
+    return serializar_colunas(fatia)
 
-    for _, row in fatia.iterrows():
-        registros.append(_normalizar_registro(row.to_dict()))
-    return registros
 
+# Nome amigável de cada coluna do CSV, calculado uma única vez por nome
+_NOMES: Dict[str, Tuple[str, bool]] = {}
 
-def _normalizar_registro(registro: Dict[str, object]) -> Dict[str, object]:
-    """Converte chaves do CSV para snake_case com nomes amigáveis."""
 
-    mapeado = {}
-    for key, value in registro.items():
+def _normalizar_nome(coluna: str) -> Tuple[str, bool]:
+    """Converte a chave do CSV para snake_case e indica se o valor é inteiro."""
+
+    if coluna not in _NOMES:
         novo_nome = (
-            key.lower()
+            coluna.lower()
             .replace(" ", "_")
             .replace("á", "a")
             .replace("ó", "o")
             .replace("ú", "u")
         )
-        if novo_nome.startswith("b"):
-            mapeado[novo_nome] = int(value)
-        elif novo_nome == "concurso":
-            mapeado["concurso"] = int(value)
-        elif novo_nome == "ganhou":
-            mapeado["ganhou"] = int(value)
-        else:
-            mapeado[novo_nome] = value
-    return mapeado
+        inteiro = novo_nome.startswith("b") or novo_nome in ("concurso", "ganhou")
+        _NOMES[coluna] = (novo_nome, inteiro)
+    return _NOMES[coluna]
+
+
+def _valores_coluna(serie: pd.Series, inteiro: bool) -> list:
+    # Converte a coluna inteira de uma vez (tipos nativos do Python, NaN -> None)
+    if inteiro and serie.notna().all():
+        return serie.to_numpy(dtype=np.int64).tolist()
+    if serie.dtype.kind in "iub":
+        return serie.tolist()
+    return serie.astype(object).where(serie.notna(), None).tolist()
+
+
+def serializar_colunas(dados: pd.DataFrame) -> List[Dict[str, object]]:
+    """Monta os registros amigáveis coluna a coluna, sem iterar linha a linha no pandas."""
+
+    nomes: List[str] = []
+    valores = []
+    for coluna in dados.columns:
+        nome, inteiro = _normalizar_nome(str(coluna))
+        nomes.append(nome)
+        valores.append(_valores_coluna(dados[coluna], inteiro))
+    return [dict(zip(nomes, linha)) for linha in zip(*valores)]
+
+
+# Último resumo calculado e a versão do histórico em que foi lido
+_RESUMO: Tuple[Optional[str], Optional[dict]] = (None, None)
+# Marca do CURRENT (snapshots.marca_atual) em que o resumo em cache foi validado
+_MARCA_RESUMO: Optional[Tuple[int, int, int]] = None
+
+
+def _ler_resumo(publicados: scrapping_resultados.Caminhos) -> Optional[dict]:
+    meta = scrapping_resultados.ler_json(publicados.meta) or {}
+    if meta.get("ultimo_concurso") is not None:
+        return {
+            "concurso": int(meta["ultimo_concurso"]),
+            "data": meta.get("ultima_data"),
+            "total_concursos": meta.get("total_concursos"),
+            "atualizado_em": meta.get("atualizado_em"),
+        }
+
+    # Sem meta: a última linha do banco, pelo índice de Concurso
+    garantir_banco()
+    concursos = armazem.consultar(limit=1, decrescente=True, banco=BANCO)
+    if concursos.empty:
+        return None
+    resumo = scrapping_resultados.obter_resumo_ultimo_concurso(concursos)
+    resumo["total_concursos"] = None
+    resumo["atualizado_em"] = None
+    return resumo
 
 
 def carregar_resumo(atualizar: bool = False) -> Optional[dict]:
     """
     Retorna informações básicas do último concurso disponível.
+
+    O resumo vem do meta gravado pelo ETL e fica em memória até um novo
+    snapshot ser publicado. Com o resumo em cache basta um stat do CURRENT;
+    o snapshot só é fixado quando o meta precisa ser relido.
     """
 
-    concursos = carregar_concursos(
-        ConcursoFiltro(atualizar=atualizar, limit=1, offset=0, formato="wide")
-    )
-    if concursos.empty:
-        return None
-    return scrapping_resultados.obter_resumo_ultimo_concurso(concursos)
+    global _RESUMO, _MARCA_RESUMO
+
+    versao_cache, resumo = _RESUMO
+    if not atualizar and versao_cache is not None:
+        marca = snapshots.marca_atual()
+        if marca is not None and marca == _MARCA_RESUMO:
+            return dict(resumo) if resumo is not None else None
+        if snapshot_atual() == versao_cache:
+            _MARCA_RESUMO = marca
+            return dict(resumo) if resumo is not None else None
+
+    if atualizar or not scrapping_resultados.caminhos_publicados().csv.exists():
+        garantir_banco(atualizar)
+
+    marca = snapshots.marca_atual()
+    with scrapping_resultados.fixar_publicados() as publicados:
+        versao = snapshot_atual(publicados)
+        resumo = _ler_resumo(publicados)
+        _RESUMO = (versao, resumo)
+        _MARCA_RESUMO = marca
+    return dict(resumo) if resumo is not None else None
 
 
 def carregar_estatisticas(atualizar: bool = False) -> Dict[str, object]:
@@ -98,7 +224,8 @@ def carregar_estatisticas(atualizar: bool = False) -> Dict[str, object]:
     Retorna as estatísticas básicas (frequência de dezenas, totais, etc.).
     """
 
-    if atualizar or not ESTATISTICAS_JSON.exists():
+    if atualizar or not scrapping_resultados.caminhos_publicados().stats.exists():
         scrapping_resultados.atualizar_resultados()
 
-    return json.loads(ESTATISTICAS_JSON.read_text(encoding="utf8"))
+    with scrapping_resultados.fixar_publicados() as publicados:
+        return json.loads(publicados.stats.read_text(encoding="utf8"))
@@ -0,0 +1,120 @@
+"""Histórico de concursos em memória, compartilhado pelos módulos do backend."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.etl.concursos import ConcursoFiltro, carregar_concursos, garantir_banco, snapshot_atual
+from processamento.mascara import empacotar_vetores
+
+
+def _somente_leitura(*arrays: np.ndarray) -> None:
+    for array in arrays:
+        array.setflags(write=False)
+
+
+@dataclass(frozen=True)
+class Historico:
+    """
+    Concursos em ordem crescente como matriz de presença (N, 25) uint8.
+
+    A coluna i indica se a dezena i + 1 foi sorteada. Todos os arrays são
+    somente leitura: o mesmo objeto é entregue a todos os chamadores.
+    """
+
+    concursos: np.ndarray
+    datas: np.ndarray
+    presenca: np.ndarray
+    sorteios: np.ndarray
+    mascaras: np.ndarray
+    versao: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.concursos)
+
+    @property
+    def ultimo_concurso(self) -> Optional[int]:
+        return int(self.concursos[-1]) if len(self.concursos) else None
+
+    def posicao(self, concurso: int) -> int:
+        """Índice da primeira linha com número de concurso >= `concurso`."""
+
+        return int(np.searchsorted(self.concursos, concurso))
+
+    def pivot(self) -> pd.DataFrame:
+        """Matriz de presença como DataFrame (índice Concurso, colunas 1 a 25)."""
+
+        return pd.DataFrame(
+            self.presenca.astype(int),
+            index=pd.Index(self.concursos, name="Concurso"),
+            columns=range(1, 26),
+        )
+
+    @classmethod
+    def de_dados(cls, dados: pd.DataFrame, versao: Optional[str] = None) -> "Historico":
+        """Monta o histórico a partir dos concursos em formato largo."""
+
+        dados = dados.sort_values("Concurso", kind="stable")
+        col_dezenas = [col for col in dados.columns if col.startswith("B")]
+        sorteios = dados[col_dezenas].to_numpy(dtype=np.uint8)
+        presenca = np.zeros((len(dados), 25), dtype=np.uint8)
+        np.put_along_axis(presenca, sorteios.astype(np.int64) - 1, 1, axis=1)
+
+        if "Data Sorteio" in dados.columns:
+            datas = pd.to_datetime(dados["Data Sorteio"], dayfirst=True, errors="coerce")
+            datas = datas.to_numpy(dtype="datetime64[D]")
+        else:
+            datas = np.full(len(dados), np.datetime64("NaT"), dtype="datetime64[D]")
+
+        concursos = dados["Concurso"].to_numpy(dtype=np.int64)
+        mascaras = empacotar_vetores(presenca) if len(presenca) else np.zeros(0, dtype=np.uint32)
+        _somente_leitura(concursos, datas, presenca, sorteios, mascaras)
+        return cls(concursos, datas, presenca, sorteios, mascaras, versao)
+
+
+class HistoricoStore:
+    """
+    Carrega o histórico uma vez por processo e o recarrega apenas quando o
+    ETL publica um novo snapshot (id devolvido por snapshot_atual).
+    """
+
+    def __init__(self) -> None:
+        self._historico: Optional[Historico] = None
+        self._trava = threading.Lock()
+
+    def obter(self, atualizar: bool = False) -> Historico:
+        if atualizar:
+            garantir_banco(atualizar=True)
+
+        versao = snapshot_atual()
+        historico = self._historico
+        if historico is not None and historico.versao == versao:
+            return historico
+
+        with self._trava:
+            historico = self._historico
+            versao = snapshot_atual()
+            if historico is None or historico.versao != versao:
+                # A versão é lida antes dos dados: uma gravação durante a carga força nova leitura
+                dados = carregar_concursos(ConcursoFiltro())
+                historico = Historico.de_dados(dados, versao)
+                self._historico = historico
+        return historico
+
+    def invalidar(self) -> None:
+        with self._trava:
+            self._historico = None
+
+
+HISTORICO = HistoricoStore()
+
+
+def obter_historico(atualizar: bool = False) -> Historico:
+    """Histórico compartilhado do processo (atualizar=True executa o ETL antes)."""
+
+    return HISTORICO.obter(atualizar=atualizar)
@@ -7,9 +7,12 @@ from typing import Dict, Tuple
 
 import pandas as pd
 
-from app.etl import ConcursoFiltro, carregar_concursos
+from app.etl import obter_historico
+from processamento.mascara import contar, empacotar
 
 MOLDURA = {1, 2, 3, 4, 5, 6, 10, 11, 15, 16, 20, 21, 22, 23, 24, 25}
+MASCARA_PARES = int(empacotar([range(2, 26, 2)])[0])
+MASCARA_MOLDURA = int(empacotar([sorted(MOLDURA)])[0])
 
 
 @dataclass
@@ -19,27 +22,7 @@ class DatasetConfig:
 
 
 def _carregar_pivot(atualizar: bool = False) -> pd.DataFrame:
-    filtro = ConcursoFiltro(atualizar=atualizar, formato="long")
-    long_df = carregar_concursos(filtro).sort_values("Concurso")
-    long_df["Sorteada"] = 1
-    pivot = (
-        long_df.pivot_table(
-            index="Concurso",
-            columns="Dezena",
-            values="Sorteada",
-            aggfunc="max",
-            fill_value=0,
-        )
-        .sort_index()
-        .astype(int)
-    )
-
-    for dezena in range(1, 26):
-        if dezena not in pivot.columns:
-            pivot[dezena] = 0
-
-    pivot = pivot.reindex(sorted(pivot.columns), axis=1)
-    return pivot
+    return obter_historico(atualizar=atualizar).pivot()
 
 
 def preparar_dataset_dezena(
@@ -98,16 +81,15 @@ def preparar_dataset_jogo(atualizar: bool = False) -> pd.DataFrame:
     Cria dataset por concurso (15 dezenas) com vetores 25 bits e agregados.
     """
 
-    pivot = _carregar_pivot(atualizar=atualizar)
+    historico = obter_historico(atualizar=atualizar)
+    pivot = historico.pivot()
+    mascaras = historico.mascaras
     dataset = pivot.copy()
     dataset.columns = [f"dezena_{int(col):02d}" for col in dataset.columns]
 
-    pares_cols = [col for col in dataset.columns if int(col.split("_")[1]) % 2 == 0]
-    moldura_cols = [col for col in dataset.columns if int(col.split("_")[1]) in MOLDURA]
-
-    dataset["pares"] = dataset[pares_cols].sum(axis=1)
+    dataset["pares"] = contar(mascaras & MASCARA_PARES).astype(int)
     dataset["impares"] = 15 - dataset["pares"]
-    dataset["moldura"] = dataset[moldura_cols].sum(axis=1)
+    dataset["moldura"] = contar(mascaras & MASCARA_MOLDURA).astype(int)
     dataset["miolo"] = 15 - dataset["moldura"]
     dataset["soma_dezenas"] = _calcular_soma_dezenas(pivot)
 
@@ -118,7 +100,5 @@ def preparar_dataset_jogo(atualizar: bool = False) -> pd.DataFrame:
 
 
 def _calcular_soma_dezenas(pivot: pd.DataFrame) -> pd.Series:
-    soma = pd.Series(0, index=pivot.index, dtype=int)
-    for dezena in pivot.columns:
-        soma += pivot[dezena] * int(dezena)
-    return soma
+    dezenas = pivot.columns.to_numpy(dtype=int)
+    return pd.Series(pivot.to_numpy() @ dezenas, index=pivot.index, dtype=int)
@@ -2,21 +2,19 @@
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
 from typing import Dict, Iterable, List, Tuple
 
-import pandas as pd
+import numpy as np
 
-from app.etl import ConcursoFiltro, carregar_concursos
+from app.etl import Historico, obter_historico
 
 MOLDURA = {1, 2, 3, 4, 5, 6, 10, 11, 15, 16, 20, 21, 22, 23, 24, 25}
 MIOLO = set(range(1, 26)) - MOLDURA
 
-
-def _carregar_long(atualizar: bool = False) -> pd.DataFrame:
-    filtro = ConcursoFiltro(atualizar=atualizar, formato="long")
-    df = carregar_concursos(filtro)
-    return df.sort_values("Concurso")
+# Colunas da matriz de presença (coluna i = dezena i + 1)
+COLUNAS_PARES = np.arange(1, 25, 2)
+COLUNAS_MOLDURA = np.array(sorted(MOLDURA)) - 1
 
 
 def calcular_estatisticas_avancadas(
@@ -28,68 +26,63 @@ def calcular_estatisticas_avancadas(
     Gera estatísticas por dezena e distribuições globais.
     """
 
-    df = _carregar_long(atualizar=atualizar)
-    dezenas_metrics = _metricas_por_dezena(df, janelas_freq, janelas_presenca)
-    distribuicoes = _distribuicoes_jogos(df)
+    historico = obter_historico(atualizar=atualizar)
+    dezenas_metrics = _metricas_por_dezena(historico, janelas_freq, janelas_presenca)
+    distribuicoes = _distribuicoes_jogos(historico)
     return {"dezenas": dezenas_metrics, "distribuicoes": distribuicoes}
 
 
+def _contagem_janela(historico: Historico, janela: int) -> np.ndarray:
+    # Sorteios de cada dezena nos concursos numerados a partir de ultimo - janela + 1
+    ultimo = int(historico.concursos[-1])
+    primeiro = int(historico.concursos[0])
+    limite = max(primeiro, ultimo - janela + 1)
+    return historico.presenca[historico.posicao(limite):].sum(axis=0, dtype=np.int64)
+
+
 def _metricas_por_dezena(
-    df: pd.DataFrame,
+    historico: Historico,
     janelas_freq: Iterable[int],
     janelas_presenca: Iterable[int],
 ) -> Dict[int, Dict[str, float]]:
-    ultimo = int(df["Concurso"].max())
-    primeiro = int(df["Concurso"].min())
+    ultimo = int(historico.concursos[-1])
     base = {dezena: {} for dezena in range(1, 26)}
 
     for janela in janelas_freq:
-        limite = max(primeiro, ultimo - janela + 1)
-        subset = df[df["Concurso"] >= limite]
-        contagem = subset["Dezena"].value_counts()
+        contagem = _contagem_janela(historico, janela)
         for dezena in base:
-            base[dezena][f"freq_{janela}"] = int(contagem.get(dezena, 0))
+            base[dezena][f"freq_{janela}"] = int(contagem[dezena - 1])
 
-    atrasos = _calcular_atrasos(df, ultimo)
+    atrasos = _calcular_atrasos(historico, ultimo)
     for dezena, atraso in atrasos.items():
         base[dezena]["atraso_atual"] = atraso
 
     for janela in janelas_presenca:
-        limite = max(primeiro, ultimo - janela + 1)
-        subset = df[df["Concurso"] >= limite]
-        contagem = subset["Dezena"].value_counts()
+        contagem = _contagem_janela(historico, janela)
         for dezena in base:
-            base[dezena][f"presenca_{janela}"] = int(contagem.get(dezena, 0))
+            base[dezena][f"presenca_{janela}"] = int(contagem[dezena - 1])
 
     return base
 
 
-def _calcular_atrasos(df: pd.DataFrame, ultimo: int) -> Dict[int, int]:
-    atrasos: Dict[int, int] = {}
-    for dezena in range(1, 26):
-        concursos = df[df["Dezena"] == dezena]["Concurso"]
-        if concursos.empty:
-            atrasos[dezena] = ultimo
-        else:
-            atrasos[dezena] = int(ultimo - concursos.max())
-    return atrasos
-
+def _calcular_atrasos(historico: Historico, ultimo: int) -> Dict[int, int]:
+    presente = historico.presenca.astype(bool)
+    # Última linha em que cada dezena aparece (argmax na matriz invertida)
+    sorteada = presente.any(axis=0)
+    ultima_linha = len(presente) - 1 - presente[::-1].argmax(axis=0)
+    atrasos = np.where(sorteada, ultimo - historico.concursos[ultima_linha], ultimo)
+    return {dezena: int(atrasos[dezena - 1]) for dezena in range(1, 26)}
 
-def _distribuicoes_jogos(df: pd.DataFrame) -> Dict[str, List[Dict[str, float]]]:
-    jogos = df.groupby("Concurso")["Dezena"].apply(list)
-    pares_impares = Counter()
-    moldura_miolo = Counter()
 
-    for dezenas in jogos:
-        pares = sum(1 for dezena in dezenas if dezena % 2 == 0)
-        impares = len(dezenas) - pares
-        pares_impares[(pares, impares)] += 1
+def _distribuicoes_jogos(historico: Historico) -> Dict[str, List[Dict[str, float]]]:
+    quantidades = historico.presenca.sum(axis=1, dtype=np.int64)
+    pares = historico.presenca[:, COLUNAS_PARES].sum(axis=1, dtype=np.int64)
+    moldura = historico.presenca[:, COLUNAS_MOLDURA].sum(axis=1, dtype=np.int64)
 
-        moldura = sum(1 for dezena in dezenas if dezena in MOLDURA)
-        miolo = len(dezenas) - moldura
-        moldura_miolo[(moldura, miolo)] += 1
+    pares_impares = Counter(zip(pares.tolist(), (quantidades - pares).tolist()))
+    moldura_miolo = Counter(zip(moldura.tolist(), (quantidades - moldura).tolist()))
 
-    total = len(jogos)
+    total = len(historico)
     return {
         "pares_impares": _formata_distribuicao(pares_impares, total, ("pares", "impares")),
         "moldura_miolo": _formata_distribuicao(moldura_miolo, total, ("moldura", "miolo")),
@@ -6,11 +6,11 @@ from pathlib import Path
 from typing import Dict, List, Sequence
 
 import joblib
-import numpy as np
 
 from app.features import DatasetConfig, calcular_estatisticas_avancadas, preparar_dataset_dezena
 from app.ml.pipelines.dezena import carregar_modelo_dezena
 from app.core.logging import log_entretenimento
+from processamento.mascara import empacotar, para_vetores
 
 
 def sugerir_dezenas(
@@ -31,7 +31,8 @@ def sugerir_dezenas(
     if usar_modelo:
         try:
             modelo = carregar_modelo_dezena()
-            dataset = preparar_dataset_dezena(atualizar=atualizar, config=DatasetConfig())
+            # O histórico já foi atualizado (se pedido) pelas estatísticas acima
+            dataset = preparar_dataset_dezena(atualizar=False, config=DatasetConfig())
             ultimos = (
                 dataset.groupby("dezena").tail(1).set_index("dezena").drop(columns=["sorteada"])
             )
@@ -85,14 +86,12 @@ def score_jogos(
     try:
         modelo = joblib.load(Path("./models/jogo/model.joblib"))
         # Prepara estrutura 25 bits
-        representacoes = []
         for jogo in jogos:
             if len(jogo) != 15:
                 raise ValueError("Cada jogo deve conter exatamente 15 dezenas.")
-            vetor = [1 if (i + 1) in jogo else 0 for i in range(25)]
-            representacoes.append(vetor)
+        representacoes = para_vetores(empacotar(jogos))
 
-        proba = modelo.predict_proba(np.array(representacoes))[:, 1]
+        proba = modelo.predict_proba(representacoes)[:, 1]
         resultados = [
             {"jogo": sorted(jogo), "score": round(float(score), 4)}
             for jogo, score in zip(jogos, proba)
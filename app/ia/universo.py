@@ -7,17 +7,21 @@ from datetime import datetime
 from pathlib import Path
 from typing import Callable, List, Optional
 import csv
+import time
 
-import pandas as pd
+import numpy as np
 
 from calculos.pesos import calcular_numero_pesos
 from dados.dados import carregar_dados
-from dados.busca import buscar
-from modelo.modelo import criar_modelo
-from processamento.possibilidades import obter_possibilidades
+from modelo.inferencia import ModeloNumpy
+from modelo.modelo import buscar_modelo_cache, hash_dados, obter_modelo, parametros_modelo
+from modelo.paralelo import treinar_paralelo
+from modelo.tabela import obter_tabela
+from processamento.combinatoria import TOTAL_COMBINACOES
 from processamento.resultados import resultados_ordenados
-from processamento.reajustar_dados import remover_resultado_concursos
-from sorteios.sortear import sortear_numeros
+from processamento.sorteados import carregar_sorteados
+from sorteios.lote import avaliar_candidatos
+from sorteios.sortear import ajustar_pesos, gerador_aleatorio
 
 
 TESTE_PATH = Path("./base/testes_fechamentos.csv")
@@ -32,6 +36,56 @@ class UniversoGerado:
     timestamp: str
     acuracia_alvo: float
     probabilidade_alvo: float
+    duracao_busca: float = 0.0
+    iteracoes_por_segundo: float = 0.0
+
+
+def _treinar_em_sequencia(dados, acuracia_min, max_retreinos, progresso):
+    modelo = None
+    pontuacao = 0.0
+    for tentativa in range(1, max_retreinos + 1):
+        # A primeira tentativa reaproveita um modelo do cache com a acurácia pedida
+        modelo, pontuacao = obter_modelo(dados, acuracia_min=acuracia_min, usar_cache=tentativa == 1, numpy=True)
+        if progresso:
+            progresso(f"Treinamento {tentativa}/{max_retreinos} – acurácia {pontuacao*100:.2f}%")
+        if pontuacao >= acuracia_min:
+            break
+    else:
+        raise RuntimeError(
+            f"Não foi possível atingir a acurácia solicitada ({acuracia_min*100:.2f}%) "
+            f"após {max_retreinos} treinos (melhor {pontuacao*100:.2f}%). "
+            "Reduza o alvo ou execute um treinamento manual."
+        )
+    return modelo, pontuacao
+
+
+def _treinar_em_paralelo(dados, acuracia_min, max_retreinos, processos, progresso):
+    encontrado = buscar_modelo_cache(hash_dados(), parametros_modelo(), acuracia_min, numpy=True)
+    if encontrado is not None:
+        if progresso:
+            progresso(f"Modelo reaproveitado do cache – acurácia {encontrado[1]*100:.2f}%")
+        return encontrado
+
+    def avisar(semente: int, pontuacao: float) -> None:
+        if progresso:
+            progresso(f"Treinamento (semente {semente}) – acurácia {pontuacao*100:.2f}%")
+
+    modelo, pontuacao, relatorio = treinar_paralelo(
+        dados,
+        acuracia_min,
+        tentativas=max_retreinos,
+        processos=processos,
+        progresso=avisar,
+    )
+    if not relatorio.atingiu:
+        raise RuntimeError(
+            f"Não foi possível atingir a acurácia solicitada ({acuracia_min*100:.2f}%) "
+            f"após {len(relatorio.pontuacoes)} treinos (melhor {pontuacao*100:.2f}%). "
+            "Reduza o alvo ou execute um treinamento manual."
+        )
+    if progresso:
+        progresso(relatorio.resumo())
+    return modelo, pontuacao
 
 
 def gerar_universo_neural(
@@ -41,75 +95,98 @@ def gerar_universo_neural(
     max_iteracoes: int = 200000,
     max_retreinos: int = 20,
     progresso: Optional[Callable[[str], None]] = None,
+    tamanho_lote: int = 4096,
+    semente: Optional[int] = None,
+    usar_tabela: bool = False,
+    processos_treino: int = 1,
 ) -> UniversoGerado:
     """
     Recria a lógica original (jogar.py) para gerar universos com apoio da rede neural.
+
+    Os candidatos são sorteados e avaliados em blocos de ``tamanho_lote`` (uma
+    chamada ao modelo por bloco); o primeiro candidato aceito na ordem do
+    bloco é escolhido e ``iteracoes`` conta as tentativas até ele, como no
+    laço original.
+
+    Com ``usar_tabela`` (opcional) o universo é sorteado de modo uniforme entre
+    os jogos inéditos da tabela de pontuações do modelo, sem os pesos das
+    dezenas usados na amostragem; a primeira consulta pontua as 3.268.760
+    combinações (cerca de 26 MB em disco).
+
+    Com ``processos_treino > 1`` os até ``max_retreinos`` treinos rodam em
+    paralelo, um por semente, e param assim que um modelo atinge a acurácia.
     """
 
     if n_dezenas < 15 or n_dezenas > 21:
         raise ValueError("O universo deve conter entre 15 e 21 dezenas.")
 
     dados = carregar_dados()
-    modelo = None
-    pontuacao = 0.0
-    for tentativa in range(1, max_retreinos + 1):
-        modelo, pontuacao = criar_modelo(dados)
-        if progresso:
-            progresso(f"Treinamento {tentativa}/{max_retreinos} – acurácia {pontuacao*100:.2f}%")
-        if pontuacao >= acuracia_min:
-            break
+    if processos_treino > 1:
+        modelo, pontuacao = _treinar_em_paralelo(dados, acuracia_min, max_retreinos, processos_treino, progresso)
     else:
-        raise RuntimeError(
-            f"Não foi possível atingir a acurácia solicitada ({acuracia_min*100:.2f}%) "
-            f"após {max_retreinos} treinos (melhor {pontuacao*100:.2f}%). "
-            "Reduza o alvo ou execute um treinamento manual."
-        )
+        modelo, pontuacao = _treinar_em_sequencia(dados, acuracia_min, max_retreinos, progresso)
+
+    # A busca e a tabela usam a propagação em NumPy (mesmas saídas, sem o custo do Keras)
+    if not isinstance(modelo, ModeloNumpy):
+        modelo = ModeloNumpy.de_keras(modelo)
 
     peso, numero_pesos = calcular_numero_pesos(dados)
-    possibilidades = obter_possibilidades()
     resultado_concursos = resultados_ordenados(dados)
-    possibilidades_atualizadas = remover_resultado_concursos(possibilidades, resultado_concursos)
-    indice_possibilidades = len(possibilidades_atualizadas) - 1
-    if indice_possibilidades < 0:
+    jogos_sorteados = carregar_sorteados()
+    jogos_sorteados.adicionar(resultado_concursos)
+    if jogos_sorteados.quantidade >= TOTAL_COMBINACOES:
         raise RuntimeError("Não há possibilidades disponíveis para gerar novos universos.")
 
+    pesos = ajustar_pesos(peso, numero_pesos)
+    rng = gerador_aleatorio(semente)
     probabilidade = 0.0
-    jogo_aceito = False
     iteracoes = 0
-    sequencia = []
+    sequencia: List[int] = []
+    inicio = time.perf_counter()
+
+    if usar_tabela:
+        if progresso:
+            progresso("Consultando a tabela de pontuações do modelo...")
+        tabela = obter_tabela(modelo)
+        candidatos = tabela.consultar(probabilidade_min, jogos_sorteados, casas=2)
+        if not candidatos.size:
+            raise RuntimeError(
+                f"Nenhum jogo inédito com probabilidade >= {probabilidade_min}% para o modelo treinado."
+            )
+        indice = int(candidatos[rng.integers(candidatos.size)])
+        iteracoes = 1
+        probabilidade = round(float(tabela.pontuacoes[indice]) * 100, 2)
+        sequencia = tabela.jogos([indice])[0].tolist()
+        if progresso:
+            progresso(f"{candidatos.size} jogos inéditos com probabilidade >= {probabilidade_min}% na tabela.")
 
-    while probabilidade < probabilidade_min or not jogo_aceito:
-        iteracoes += 1
-        if iteracoes > max_iteracoes:
+    while not sequencia:
+        if iteracoes >= max_iteracoes:
             raise RuntimeError("Número máximo de tentativas excedido ao buscar universo válido.")
 
-        sorteados = sortear_numeros(peso, numero_pesos)
-        jogo = sorted([numeros[0] for numeros in sorteados])
+        quantidade = min(tamanho_lote, max_iteracoes - iteracoes)
+        avaliados = avaliar_candidatos(modelo, pesos, jogos_sorteados, quantidade, rng)
+        probabilidades = np.round(avaliados["previsao"] * 100, 2)
+        aceitos = np.nonzero((probabilidades >= probabilidade_min) & avaliados["ineditos"])[0]
 
-        y_alvo = pd.DataFrame(sorteados).iloc[:, 0].to_numpy(dtype="int16")
-        y_alvo = y_alvo.reshape(1, 15)
-        previsao = modelo.predict(y_alvo, verbose=0)
-        predicao_alvo = float(previsao.reshape(-1)[0])
-        probabilidade = round(predicao_alvo * 100, 2)
+        if aceitos.size:
+            indice = int(aceitos[0])
+            iteracoes += indice + 1
+            probabilidade = float(probabilidades[indice])
+            sequencia = sorted(int(numero) for numero in avaliados["jogos"][indice])
+        else:
+            iteracoes += quantidade
+            probabilidade = float(probabilidades[-1])
 
-        if progresso and iteracoes % 200 == 0:
+        if progresso:
+            decorrido = time.perf_counter() - inicio
             progresso(
-                f"Tentativa {iteracoes}: probabilidade atual {probabilidade:.2f}% "
-                f"(alvo {probabilidade_min}%); universo {'aceito' if jogo_aceito else 'em busca'}."
+                f"Tentativa {iteracoes}: melhor probabilidade do bloco {probabilidades.max():.2f}% "
+                f"(alvo {probabilidade_min}%); universo {'aceito' if sequencia else 'em busca'} "
+                f"– {iteracoes / decorrido if decorrido else 0:,.0f} tentativas/s."
             )
 
-        if probabilidade >= probabilidade_min:
-            indice = buscar(
-                possibilidades_atualizadas,
-                0,
-                indice_possibilidades,
-                jogo,
-            )
-            jogo_aceito = indice is not None
-            if jogo_aceito:
-                sequencia = jogo
-        else:
-            jogo_aceito = False
+    duracao = time.perf_counter() - inicio
 
     dezenas_universo = sequencia.copy()
     if n_dezenas > 15:
@@ -125,7 +202,8 @@ def gerar_universo_neural(
     if progresso:
         progresso(
             f"Universo encontrado após {iteracoes} tentativas "
-            f"(probabilidade {probabilidade:.2f}%, acurácia alcançada {pontuacao*100:.2f}%)."
+            f"(probabilidade {probabilidade:.2f}%, acurácia alcançada {pontuacao*100:.2f}%, "
+            f"{duracao:.1f}s)."
         )
 
     return UniversoGerado(
@@ -136,6 +214,8 @@ def gerar_universo_neural(
         timestamp=datetime.utcnow().isoformat() + "Z",
         acuracia_alvo=acuracia_min,
         probabilidade_alvo=probabilidade_min,
+        duracao_busca=round(duracao, 3),
+        iteracoes_por_segundo=round(iteracoes / duracao, 1) if duracao else 0.0,
     )
 
 
@@ -6,11 +6,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Iterable, List, Sequence
 
+import numpy as np
 import pandas as pd
 
 from app.auditoria.storage import ResultadoAposta, salvar_resultados
 from app.core.logging import log_entretenimento
-from app.etl import ConcursoFiltro, carregar_concursos
+from app.etl import ConcursoFiltro, carregar_concursos, obter_historico
+from processamento.mascara import empacotar, matriz_acertos
 
 
 @dataclass
@@ -37,22 +39,36 @@ def conferir_jogos(
     """Compara cada jogo com todos os concursos e contabiliza os acertos."""
 
     col_dezenas = [col for col in concursos.columns if col.startswith("B")]
-    resultados: List[ResultadoSimulacao] = []
+    if concursos.empty or not len(jogos):
+        return []
+
+    sorteios = empacotar(concursos[col_dezenas].to_numpy(dtype="int64"))
+    ids = concursos["Concurso"].to_numpy(dtype="int64")
+    return conferir_mascaras(jogos, sorteios, ids)
+
 
-    for _, linha in concursos.iterrows():
-        concurso_id = int(linha["Concurso"])
-        sorteio = set(int(linha[col]) for col in col_dezenas)
-        for jogo in jogos:
-            acertos = len(sorteio.intersection(set(jogo)))
-            if acertos >= 11:
-                premio = PREMIOS_FIXOS.get(acertos, 0.0)
-                resultados.append(
-                    ResultadoSimulacao(
-                        concurso=concurso_id,
-                        acertos=acertos,
-                        premio_estimado=premio,
-                    )
-                )
+def conferir_mascaras(
+    jogos: Sequence[Sequence[int]],
+    sorteios: np.ndarray,
+    ids: np.ndarray,
+) -> List[ResultadoSimulacao]:
+    """Compara cada jogo com os sorteios já em máscaras de 25 bits."""
+
+    resultados: List[ResultadoSimulacao] = []
+    if not len(sorteios) or not len(jogos):
+        return resultados
+
+    acertos = matriz_acertos(empacotar(jogos), sorteios)
+
+    for linha, coluna in zip(*np.nonzero(acertos >= 11)):
+        total = int(acertos[linha, coluna])
+        resultados.append(
+            ResultadoSimulacao(
+                concurso=int(ids[linha]),
+                acertos=total,
+                premio_estimado=PREMIOS_FIXOS.get(total, 0.0),
+            )
+        )
     return resultados
 
 
@@ -62,8 +78,10 @@ def simular_intervalo(
     atualizar: bool = False,
     registrar: bool = False,
 ) -> Dict[str, object]:
-    concursos = carregar_resultados(atualizar=atualizar).iloc[intervalo]
-    return _montar_relatorio(jogos, concursos, registrar=registrar)
+    historico = obter_historico(atualizar=atualizar)
+    return _montar_relatorio(
+        jogos, historico.mascaras[intervalo], historico.concursos[intervalo], registrar=registrar
+    )
 
 
 def simular_ultimos(
@@ -79,26 +97,28 @@ def simular_ultimos(
     if ultimos <= 0:
         raise ValueError("O parâmetro 'ultimos' deve ser positivo.")
 
-    concursos = carregar_resultados(atualizar=atualizar)
-    total = len(concursos)
+    historico = obter_historico(atualizar=atualizar)
+    total = len(historico)
     inicio = max(total - ultimos, 0)
-    fatia = concursos.iloc[inicio:total]
-    return _montar_relatorio(jogos, fatia, registrar=registrar)
+    return _montar_relatorio(
+        jogos, historico.mascaras[inicio:total], historico.concursos[inicio:total], registrar=registrar
+    )
 
 
 def _montar_relatorio(
     jogos: Sequence[Sequence[int]],
-    concursos: pd.DataFrame,
+    sorteios: np.ndarray,
+    ids: np.ndarray,
     registrar: bool,
 ) -> Dict[str, object]:
-    resultados = conferir_jogos(jogos, concursos)
+    resultados = conferir_mascaras(jogos, sorteios, ids)
     if registrar:
         registrar_resultados(resultados)
     log_entretenimento("Simulação histórica")
     total_premios = sum(res.premio_estimado for res in resultados)
     distribuicao = _distribuicao_acertos(resultados)
     return {
-        "total_concursos": len(concursos),
+        "total_concursos": len(sorteios),
         "resultados": [res.__dict__ for res in resultados],
         "distribuicao_acertos": distribuicao,
         "premio_estimado_total": round(total_premios, 2),
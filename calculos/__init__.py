@@ -1,7 +1,9 @@
-from . import frequencia, faltantes, pesos
+from . import ciclos, frequencia, faltantes, pesos, versao
 
 __all__ = [
+    'ciclos',
     'frequencia',
     'faltantes',
     'pesos',
+    'versao',
 ]
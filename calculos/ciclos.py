@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from processamento.sorteados import dezenas_sorteadas
+
+# Máscara com as 25 dezenas (ciclo fechado)
+CICLO_COMPLETO = (1 << 25) - 1
+
+# Concursos avaliados por vez ao procurar o fechamento de um ciclo
+JANELA = 64
+
+
+def _mascaras(sorteios):
+    sorteios = np.asarray(sorteios, dtype=np.int64)
+    return np.bitwise_or.reduce(np.left_shift(1, sorteios - 1), axis=1)
+
+
+def _contar(mascaras):
+    # Quantidade de dezenas (bits) de cada máscara
+    bytes_mascaras = np.asarray(mascaras, dtype='>u4').view(np.uint8).reshape(-1, 4)
+    return np.unpackbits(bytes_mascaras, axis=1).sum(axis=1)
+
+
+def _faltantes(mascara):
+    return [dezena for dezena in range(1, 26) if not mascara >> (dezena - 1) & 1]
+
+
+@dataclass
+class TabelaCiclos:
+    """
+    Ciclo das dezenas de cada concurso.
+
+    ciclo: número do ciclo fechado no concurso (0 - o ciclo continua aberto).
+    jogo: posição do concurso dentro do ciclo (1 - primeiro concurso do ciclo).
+    falta: quantidade de dezenas que ainda faltam no ciclo após o concurso.
+    """
+
+    ciclo: np.ndarray
+    jogo: np.ndarray
+    falta: np.ndarray
+    mascara: int
+
+    @property
+    def ultimo_jogos(self):
+        """Quantidade de concursos realizados após o último ciclo fechado."""
+        return int(self.jogo[-1]) if len(self.jogo) and self.ciclo[-1] == 0 else 0
+
+    @property
+    def faltantes(self):
+        """Dezenas que faltam para fechar o ciclo em andamento."""
+        return _faltantes(self.mascara) if self.ultimo_jogos else []
+
+
+def calcular_ciclos(sorteios):
+    """
+    Calcula os ciclos das dezenas a partir da matriz de sorteios.
+
+    Cada ciclo é acumulado com bitwise_or.accumulate sobre uma janela de
+    concursos até que as 25 dezenas tenham sido sorteadas.
+
+    :param sorteios: Array (concursos, 15) com as dezenas, em ordem de concurso.
+
+    :return: TabelaCiclos com uma posição por concurso.
+    """
+
+    mascaras = _mascaras(sorteios) if len(sorteios) else np.zeros(0, dtype=np.int64)
+    total = len(mascaras)
+
+    ciclo = np.zeros(total, dtype=np.int64)
+    jogo = np.zeros(total, dtype=np.int64)
+    falta = np.zeros(total, dtype=np.int64)
+
+    inicio = 0
+    numero = 0
+    acumulado = np.zeros(0, dtype=np.int64)
+    while inicio < total:
+        janela = JANELA
+        while True:
+            fim = min(inicio + janela, total)
+            acumulado = np.bitwise_or.accumulate(mascaras[inicio:fim])
+            fechados = np.flatnonzero(acumulado == CICLO_COMPLETO)
+            if fechados.size or fim == total:
+                break
+            janela *= 2
+
+        if fechados.size:
+            fim = inicio + int(fechados[0]) + 1
+            acumulado = acumulado[:fim - inicio]
+            numero += 1
+            ciclo[fim - 1] = numero
+
+        jogo[inicio:fim] = np.arange(1, fim - inicio + 1)
+        falta[inicio:fim] = 25 - _contar(acumulado)
+        inicio = fim
+
+    aberto = 0 if not total or ciclo[-1] else int(acumulado[-1])
+    return TabelaCiclos(ciclo, jogo, falta, aberto)
+
+
+class RastreadorCiclos:
+    """
+    Ciclo das dezenas em andamento, atualizado concurso a concurso.
+    """
+
+    def __init__(self, ciclos_fechados=0, jogo=0, mascara=0, ultimo_concurso=0):
+        self.ciclos_fechados = ciclos_fechados
+        self.jogo = jogo
+        self.mascara = mascara
+        self.ultimo_concurso = ultimo_concurso
+
+    @property
+    def faltantes(self):
+        """Dezenas que faltam para fechar o ciclo em andamento."""
+        return _faltantes(self.mascara) if self.jogo else []
+
+    def adicionar(self, concurso, dezenas):
+        """
+        Registra um concurso no ciclo em andamento.
+
+        :param concurso: Número do concurso.
+        :param dezenas: Dezenas sorteadas no concurso.
+
+        :return: (ciclo fechado no concurso ou 0, posição no ciclo, dezenas faltantes).
+        """
+        for dezena in dezenas:
+            self.mascara |= 1 << (int(dezena) - 1)
+        self.jogo += 1
+        self.ultimo_concurso = max(self.ultimo_concurso, int(concurso))
+
+        posicao = self.jogo
+        falta = 25 - bin(self.mascara).count('1')
+        if self.mascara == CICLO_COMPLETO:
+            self.ciclos_fechados += 1
+            self.jogo = 0
+            self.mascara = 0
+            return self.ciclos_fechados, posicao, falta
+
+        return 0, posicao, falta
+
+    def adicionar_lote(self, dados):
+        """
+        Registra os concursos posteriores ao último processado.
+
+        :param dados: DataFrame com as colunas Concurso e as 15 dezenas sorteadas.
+
+        :return: A quantidade de concursos processados.
+        """
+        novos = dados[dados['Concurso'] > self.ultimo_concurso].sort_values('Concurso')
+        for concurso, dezenas in zip(novos['Concurso'], dezenas_sorteadas(novos)):
+            self.adicionar(concurso, dezenas)
+        return len(novos)
+
+    @classmethod
+    def de_dados(cls, dados):
+        """
+        Cria o rastreador a partir de todos os concursos, em uma única passada vetorizada.
+
+        :param dados: DataFrame com as colunas Concurso e as 15 dezenas sorteadas.
+        """
+        dados = dados.sort_values('Concurso')
+        tabela = calcular_ciclos(dezenas_sorteadas(dados))
+        ultimo = int(dados['Concurso'].max()) if len(dados) else 0
+        return cls(int(tabela.ciclo.max(initial=0)), tabela.ultimo_jogos, tabela.mascara, ultimo)
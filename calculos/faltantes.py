@@ -1,8 +1,17 @@
 from dataclasses import dataclass
 from typing import List
 
+import numpy as np
+
+from calculos.ciclos import calcular_ciclos
 from calculos.frequencia import gerar_frequencia
-from random import choice, choices
+from calculos.versao import versao_dados
+from processamento.sorteados import dezenas_sorteadas
+
+# Ciclos e histogramas (Jogo, Falta) já calculados por versão dos dados
+_TABELAS = {}
+_HISTOGRAMAS = {}
+MAX_CACHE = 8
 
 
 @dataclass
@@ -13,47 +22,127 @@ class AjusteDezenas:
     ajuste_restantes: int
 
 
-def ultimo_jogos(base_dados):
+def _guardar(cache, versao, valor):
+    if len(cache) >= MAX_CACHE:
+        cache.pop(next(iter(cache)))
+    cache[versao] = valor
+    return valor
+
+
+def tabela_ciclos(base_dados):
     """
-    Encontra a quantidade de jogos realizados posteriormente ao ltimo ciclo fechado.
+    Calcula o ciclo de cada concurso a partir das dezenas sorteadas.
+
+    A tabela é calculada uma vez por versão dos dados, sem depender das
+    colunas Ciclo/Jogo/Falta da guia Importar_Ciclo.
 
     :param base_dados: DataFrame da base de dados.
 
-    :return: a quantidade de jogos.
+    :return: TabelaCiclos em ordem de concurso.
     """
 
-    # Carrega a base de dados
-    dados = base_dados.copy()
+    versao = versao_dados(base_dados)
+    if versao in _TABELAS:
+        return _TABELAS[versao]
+
+    if 'Concurso' in base_dados.columns:
+        base_dados = base_dados.sort_values('Concurso', kind='stable')
+    return _guardar(_TABELAS, versao, calcular_ciclos(dezenas_sorteadas(base_dados)))
+
+
+def histograma_ciclo(base_dados):
+    """
+    Conta os concursos por posição no ciclo (Jogo) e dezenas faltantes (Falta).
+
+    O histograma é calculado uma vez por versão dos dados.
+
+    :param base_dados: DataFrame da base de dados.
+
+    :return: Matriz onde [jogo, falta] é a quantidade de concursos.
+    """
+
+    versao = versao_dados(base_dados)
+    if versao in _HISTOGRAMAS:
+        return _HISTOGRAMAS[versao]
+
+    tabela = tabela_ciclos(base_dados)
+    valores = np.column_stack((tabela.jogo, tabela.falta))
+    valores = valores[(valores >= 0).all(axis=1)]
+
+    if len(valores):
+        formato = tuple(valores.max(axis=0) + 1)
+    else:
+        formato = (1, 1)
 
-    # O maior ciclo fechado
-    maior = max(dados['Ciclo'])
+    histograma = np.zeros(formato, dtype=np.int64)
+    np.add.at(histograma, (valores[:, 0], valores[:, 1]), 1)
+    histograma.setflags(write=False)
 
-    # 4ndice do ltimo ciclo fechado
-    ciclo = int(dados.query(f'Ciclo == {maior}')['Concurso'].index[0])
+    return _guardar(_HISTOGRAMAS, versao, histograma)
 
-    # Quantidade de jogos realizados ap3s o ltimo ciclo fechado
-    jogos = len(dados.iloc[ciclo + 1:])
 
-    return jogos
+def _pesos_ciclo(histograma, jogo, faltas):
+    # Quantidade de concursos na posição jogo com cada quantidade de faltantes
+    return [
+        int(histograma[jogo, falta]) if jogo < histograma.shape[0] and falta < histograma.shape[1] else 0
+        for falta in faltas
+    ]
 
 
-def numeros_faltantes_ciclo(base_dados):
+def estado_ciclo(base_dados):
+    """
+    Obtém os jogos realizados após o último ciclo fechado e as dezenas faltantes.
+
+    O ciclo é calculado a partir das dezenas sorteadas (tabela_ciclos), tanto
+    para a planilha quanto para o base/resultados.csv.
+
+    :param base_dados: DataFrame da base de dados.
+
+    :return: a quantidade de jogos e a lista de dezenas faltantes.
+    """
+
+    tabela = tabela_ciclos(base_dados)
+    return tabela.ultimo_jogos, tabela.faltantes
+
+
+def _sortear_quantidade(jogo, pesos, rng):
+    pesos = np.asarray(pesos, dtype=np.float64)
+    if pesos.sum() <= 0:
+        raise ValueError('A soma dos pesos deve ser maior que zero.')
+    return [int(rng.choice(jogo, p=pesos / pesos.sum()))]
+
+
+def _sortear_faltantes(num_faltantes, quantidade, rng):
+    numeros = num_faltantes[:]
+    faltantes = list()
+
+    for _ in range(quantidade):
+        if not numeros:
+            break
+        numero_sorteado = numeros[int(rng.integers(len(numeros)))]
+        numeros.remove(numero_sorteado)
+        faltantes.append(numero_sorteado)
+
+    return faltantes
+
+
+def numeros_faltantes_ciclo(base_dados, rng=None):
     """
     Obtem o(s) n9mero(s) faltante(s) para fechar o ciclo das dezenas.
 
     :param base_dados: DataFrame da base de dados.
+    :param rng: numpy.random.Generator usado nos sorteios (None - gerador novo).
 
     :return: o(s) n9mero(s) faltante(s) sorteado(s) e o percentual de reajuste de peso.
     """
 
+    rng = np.random.default_rng(rng)
     dados = base_dados.copy()
-    jogos = ultimo_jogos(dados)
+    jogos, num_faltantes = estado_ciclo(dados)
     frequencia = gerar_frequencia(dados)
 
     maior_peso = next(iter(frequencia[0].values()), 0)
 
-    relacao_numeros = list(dados.iloc[-1, 22:32].values)
-    num_faltantes = [numero for numero in relacao_numeros if numero > 0]
     qtde_faltantes = len(num_faltantes)
 
     ajuste_padrao = AjusteDezenas(num_faltantes, maior_peso, [], 0)
@@ -63,18 +152,9 @@ def numeros_faltantes_ciclo(base_dados):
 
     if jogos == 1:
         jogo = list(range(1, 8))
-        pesos = [len(dados.query(f'Jogo == 2 & Falta == {i}')) for i in jogo]
-        n_dz = choices(jogo, weights=pesos, k=1)
-
-        numeros = num_faltantes[:]
-        faltantes = list()
-
-        for _ in range(n_dz[0]):
-            if not numeros:
-                break
-            numero_sorteado = choice(numeros)
-            numeros.remove(numero_sorteado)
-            faltantes.append(numero_sorteado)
+        pesos = _pesos_ciclo(histograma_ciclo(dados), 2, jogo)
+        n_dz = _sortear_quantidade(jogo, pesos, rng)
+        faltantes = _sortear_faltantes(num_faltantes, n_dz[0], rng)
 
         restantes = [numero for numero in num_faltantes if numero not in faltantes]
 
@@ -83,18 +163,9 @@ def numeros_faltantes_ciclo(base_dados):
     if jogos in (2, 3, 4):
         referencia = jogos + 1
         jogo = list(range(0, qtde_faltantes + 1))
-        pesos = [len(dados.query(f'Jogo == {referencia} & Falta == {i}')) for i in jogo]
-        n_dz = choices(jogo, weights=pesos, k=1)
-
-        numeros = num_faltantes[:]
-        faltantes = list()
-
-        for _ in range(n_dz[0]):
-            if not numeros:
-                break
-            numero_sorteado = choice(numeros)
-            numeros.remove(numero_sorteado)
-            faltantes.append(numero_sorteado)
+        pesos = _pesos_ciclo(histograma_ciclo(dados), referencia, jogo)
+        n_dz = _sortear_quantidade(jogo, pesos, rng)
+        faltantes = _sortear_faltantes(num_faltantes, n_dz[0], rng)
 
         if qtde_faltantes == n_dz[0] or n_dz[0] == 0:
             return ajuste_padrao
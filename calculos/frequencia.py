@@ -1,41 +1,96 @@
-from collections import OrderedDict
+import numpy as np
 
+from processamento.sorteados import dezenas_sorteadas
 
-def gerar_frequencia(base_dados):
+
+def contar_dezenas(sorteios):
     """
-    Gera a frequência que cada número foi sorteado na totalização dos concursos.
+    Conta quantas vezes cada dezena foi sorteada.
 
-    :param base_dados: DataFrame da base de dados.
+    :param sorteios: Array (quantidade, 15) com as dezenas sorteadas.
 
-    :return: a frequência dos números e a quantidade de sorteios(concursos).
+    :return: Array com 25 posições (posição 0 = dezena 1).
     """
-    # Carrega a base de dados
-    dados = base_dados.copy()
 
-    sorteios = dados.iloc[:, 2:17].values
-    qtde_sorteios = len(sorteios)
+    sorteios = np.asarray(sorteios, dtype=np.int64).ravel()
+    return np.bincount(sorteios, minlength=26)[1:26]
+
+
+def ordenar_frequencia(contagem):
+    """
+    Cria o dicionário das frequências ordenado da maior para a menor.
 
-    lista_frequencia = list()
-    valor = 0
+    Em caso de empate, a maior dezena vem primeiro.
 
-    for i in range(1, 26):
-        for sorteio in sorteios:
-            for numero in sorteio:
-                if numero == i:
-                    valor += 1
+    :param contagem: Array com a contagem das dezenas 1 a 25.
+
+    :return: Dicionário {dezena: frequência}.
+    """
+
+    contagem = np.asarray(contagem, dtype=np.int64)
+    dezenas = np.arange(1, 26)
+    ordem = np.lexsort((-dezenas, -contagem))
+    return {int(dezenas[i]): int(contagem[i]) for i in ordem}
+
+
+class FrequenciaDezenas:
+    """
+    Contagem acumulada das dezenas sorteadas, atualizada concurso a concurso.
+    """
 
-        lista_frequencia.append(valor)
-        valor = 0
+    def __init__(self, contagem=None, qtde_sorteios=0, ultimo_concurso=0):
+        if contagem is None:
+            contagem = np.zeros(25, dtype=np.int64)
+        self.contagem = np.asarray(contagem, dtype=np.int64)
+        self.qtde_sorteios = qtde_sorteios
+        self.ultimo_concurso = ultimo_concurso
 
-    # Cria os índices para a lista de frequência
-    lista_frequencia = [[indice + 1, vlr] for indice, vlr in enumerate(lista_frequencia)]
+    def adicionar(self, concurso, dezenas):
+        """
+        Soma as 15 dezenas de um concurso à contagem.
 
-    # Ordena a lista pela maior frequência
-    lista_frequencia = sorted([[valor[1], valor] for valor in lista_frequencia], reverse=True)
+        :param concurso: Número do concurso.
+        :param dezenas: Dezenas sorteadas no concurso.
+        """
+        for dezena in dezenas:
+            self.contagem[int(dezena) - 1] += 1
+        self.qtde_sorteios += 1
+        self.ultimo_concurso = max(self.ultimo_concurso, int(concurso))
 
-    # Cria o dicionário das frequências
-    # noinspection PyTypeChecker
-    frequencia = dict(OrderedDict(frequencia[1] for frequencia in lista_frequencia))
+    def adicionar_lote(self, dados):
+        """
+        Soma à contagem os concursos posteriores ao último processado.
 
-    return frequencia, qtde_sorteios
+        :param dados: DataFrame com as colunas Concurso e as 15 dezenas sorteadas.
+
+        :return: A quantidade de concursos processados.
+        """
+        novos = dados[dados['Concurso'] > self.ultimo_concurso]
+        if novos.empty:
+            return 0
+
+        self.contagem += contar_dezenas(dezenas_sorteadas(novos))
+        self.qtde_sorteios += len(novos)
+        self.ultimo_concurso = int(novos['Concurso'].max())
+        return len(novos)
+
+    def frequencia(self):
+        """
+        Retorna a frequência no mesmo formato do gerar_frequencia.
+        """
+        return ordenar_frequencia(self.contagem), self.qtde_sorteios
+
+
+def gerar_frequencia(base_dados):
+    """
+    Gera a frequência que cada número foi sorteado na totalização dos concursos.
+
+    As dezenas são contadas com numpy.bincount em uma única passada.
+
+    :param base_dados: DataFrame da base de dados.
+
+    :return: a frequência dos números e a quantidade de sorteios(concursos).
+    """
 
+    sorteios = base_dados.iloc[:, 2:17].to_numpy(dtype=np.int64)
+    return ordenar_frequencia(contar_dezenas(sorteios)), len(sorteios)
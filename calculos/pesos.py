@@ -1,58 +1,85 @@
-from random import choice
+import numpy as np
 
 from calculos.frequencia import gerar_frequencia
 from calculos.faltantes import numeros_faltantes_ciclo
+from calculos.versao import versao_dados
 
+# Faixa do fator somado aos pesos repetidos para diferenciá-los
+FATOR_DISTINCAO = (0.0001, 0.001)
 
-def calcular_pesos(base_dados):
-    """
-    Calcula o peso de cada dezena.
+# Pesos já calculados por versão dos dados (somente com o gerador padrão)
+_CACHE = {}
+MAX_CACHE = 8
 
-    :param base_dados: DataFrame da base de dados.
 
-    :return: lista com os pesos(percentual de ocorrncia de cada dezena considerando o ajuste para aquelas
-    que so faltantes para completar o ciclo das dezenas).
-    """
+def _gerador_padrao(versao):
+    # Mesma versão dos dados -> mesma semente em qualquer processo
+    return np.random.default_rng(int(versao, 16))
+
 
+def _calcular_vetor(base_dados, rng):
     frequencia, qtde_sorteios = gerar_frequencia(base_dados)
-    ajustes = numeros_faltantes_ciclo(base_dados)
+    ajustes = numeros_faltantes_ciclo(base_dados, rng=rng)
 
-    num_faltantes = ajustes.faltantes
-    ajuste_faltantes = ajustes.ajuste_faltantes
-    num_restante = ajustes.restantes
-    ajuste_restante = ajustes.ajuste_restantes
+    contagem = np.array([frequencia[i] for i in range(1, 26)], dtype=np.int64)
+    dezenas = np.arange(1, 26)
 
-    fator_distincao = [float('0.000' + str(n)) for n in range(100, 10000)]
+    faltantes = np.isin(dezenas, ajustes.faltantes)
+    restantes = np.isin(dezenas, ajustes.restantes) & ~faltantes
 
-    l_peso = list()
-    tem_restantes = bool(num_restante)
+    ajustada = contagem.copy()
+    ajustada[faltantes] = contagem[faltantes] // 2 + ajustes.ajuste_faltantes
+    ajustada[restantes] = contagem[restantes] // 2 + ajustes.ajuste_restantes
 
-    for i in range(1, 26):
-        if i in num_faltantes:
-            peso = (frequencia[i] // 2 + ajuste_faltantes) / qtde_sorteios
-        elif tem_restantes and i in num_restante:
-            peso = (frequencia[i] // 2 + ajuste_restante) / qtde_sorteios
-        else:
-            peso = frequencia[i] / qtde_sorteios
+    pesos = ajustada / qtde_sorteios
+
+    # Pesos repetidos (a partir da segunda ocorrência) recebem um fator de distinção
+    _, primeiros = np.unique(pesos, return_index=True)
+    repetidos = np.ones(len(pesos), dtype=bool)
+    repetidos[primeiros] = False
+    pesos[repetidos] += rng.uniform(*FATOR_DISTINCAO, size=int(repetidos.sum()))
+
+    return pesos
+
+
+def calcular_pesos(base_dados, rng=None):
+    """
+    Calcula o peso de cada dezena.
+
+    Sem rng, os sorteios usam um gerador com semente derivada da versão dos
+    dados e o resultado fica em cache: todos os processos obtêm os mesmos
+    pesos para a mesma base.
+
+    :param base_dados: DataFrame da base de dados.
+    :param rng: numpy.random.Generator usado nos sorteios e nos desempates (sem cache).
+
+    :return: lista com os pesos(percentual de ocorrência de cada dezena considerando o ajuste para aquelas
+    que são faltantes para completar o ciclo das dezenas).
+    """
+
+    if rng is not None:
+        return _calcular_vetor(base_dados, rng).tolist()
 
-        if peso in l_peso:
-            l_peso.append(peso + choice(fator_distincao))
-        else:
-            l_peso.append(peso)
+    versao = versao_dados(base_dados)
+    if versao not in _CACHE:
+        if len(_CACHE) >= MAX_CACHE:
+            _CACHE.pop(next(iter(_CACHE)))
+        _CACHE[versao] = _calcular_vetor(base_dados, _gerador_padrao(versao))
 
-    return l_peso
+    return _CACHE[versao].tolist()
 
 
-def calcular_numero_pesos(base_dados):
+def calcular_numero_pesos(base_dados, rng=None):
     """
-    Gera um dicionrio contendo os nmeros e os seus pesos.
+    Gera um dicionário contendo os números e os seus pesos.
 
     :param base_dados: DataFrame da base de dados.
+    :param rng: numpy.random.Generator usado no cálculo (default: gerador da versão dos dados).
 
-    :return: a relao de nmeros com os seus pesos.
+    :return: a relação de números com os seus pesos.
     """
 
-    peso = calcular_pesos(base_dados)
+    peso = calcular_pesos(base_dados, rng)
 
     n_peso = dict()
 
@@ -0,0 +1,17 @@
+from hashlib import sha256
+
+from pandas.util import hash_pandas_object
+
+
+def versao_dados(base_dados):
+    """
+    Identifica o conteúdo da base de dados (hash do DataFrame, independente
+    do snapshot do ETL devolvido por app.etl.concursos.snapshot_atual).
+
+    :param base_dados: DataFrame da base de dados.
+
+    :return: os 16 primeiros caracteres do SHA-256 do conteúdo.
+    """
+
+    valores = hash_pandas_object(base_dados, index=True).to_numpy()
+    return sha256(valores.tobytes()).hexdigest()[:16]
@@ -0,0 +1 @@
+"""Configuração do pytest: a raiz do repositório entra no sys.path dos testes."""
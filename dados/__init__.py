@@ -1,8 +1,12 @@
-from . import busca, dados, scrapping_resultados, gerar_combinacoes
+from . import api_concursos, armazem, busca, colunar, dados, scrapping_resultados, snapshots, gerar_combinacoes
 
 __all__ = [
+    'api_concursos',
+    'armazem',
     'busca',
+    'colunar',
     'dados',
     'scrapping_resultados',
+    'snapshots',
     'gerar_combinacoes',
 ]
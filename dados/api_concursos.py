@@ -0,0 +1,294 @@
+"""
+Busca concorrente de concursos individuais na API de resultados da Caixa.
+
+Usada para preencher apenas os concursos que faltam no histórico local, sem
+baixar a planilha completa.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.client
+import json
+import logging
+import random
+import ssl
+from queue import Empty, LifoQueue
+from typing import Dict, Iterable, List, Optional, Protocol
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+URL_CONCURSO = "https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/{concurso}"
+URL_ULTIMO = "https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil"
+
+SIMULTANEOS = 8
+TENTATIVAS = 4
+ESPERA_BASE = 0.5
+TIMEOUT = 30
+
+# Respostas que justificam uma nova tentativa
+STATUS_RETENTAVEIS = {408, 425, 429, 500, 502, 503, 504}
+
+LOGGER = logging.getLogger("lotofacil.dados")
+
+
+class ErroHttp(Exception):
+    """Resposta HTTP com status de erro."""
+
+    def __init__(self, status: int, url: str) -> None:
+        super().__init__(f"HTTP {status} em {url}")
+        self.status = status
+        self.url = url
+
+
+class Transporte(Protocol):
+    """Cliente usado nas buscas; substituível por um servidor falso nos testes."""
+
+    async def obter_json(self, url: str) -> Dict[str, object]:
+        ...
+
+    async def fechar(self) -> None:
+        ...
+
+
+class TransporteHttp:
+    """
+    Cliente HTTP com conexões keep-alive reaproveitadas entre requisições.
+
+    Cada requisição roda em uma thread do executor padrão do asyncio usando uma
+    conexão http.client retirada do pool (uma nova é aberta se o pool estiver vazio).
+    """
+
+    def __init__(self, timeout: float = TIMEOUT, verificar_ssl: bool = False) -> None:
+        self.timeout = timeout
+        self.contexto = ssl.create_default_context()
+        if not verificar_ssl:
+            self.contexto.check_hostname = False
+            self.contexto.verify_mode = ssl.CERT_NONE
+        self._pools: Dict[tuple, LifoQueue] = {}
+
+    def _conectar(self, esquema: str, host: str) -> http.client.HTTPConnection:
+        if esquema == "https":
+            return http.client.HTTPSConnection(host, timeout=self.timeout, context=self.contexto)
+        return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    def _requisitar(self, url: str) -> Dict[str, object]:
+        partes = urlsplit(url)
+        chave = (partes.scheme, partes.netloc)
+        pool = self._pools.setdefault(chave, LifoQueue())
+        try:
+            conexao = pool.get_nowait()
+        except Empty:
+            conexao = self._conectar(*chave)
+
+        caminho = partes.path or "/"
+        if partes.query:
+            caminho += "?" + partes.query
+
+        try:
+            conexao.request(
+                "GET",
+                caminho,
+                headers={"Accept": "application/json", "Connection": "keep-alive"},
+            )
+            resposta = conexao.getresponse()
+            corpo = resposta.read()
+        except Exception:
+            conexao.close()
+            raise
+
+        if resposta.will_close:
+            conexao.close()
+        else:
+            pool.put(conexao)
+
+        if resposta.status >= 400:
+            raise ErroHttp(resposta.status, url)
+        return json.loads(corpo)
+
+    async def obter_json(self, url: str) -> Dict[str, object]:
+        return await asyncio.to_thread(self._requisitar, url)
+
+    async def fechar(self) -> None:
+        for pool in self._pools.values():
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except Empty:
+                    break
+        self._pools.clear()
+
+
+async def obter_com_retentativas(
+    transporte: Transporte,
+    url: str,
+    tentativas: int = TENTATIVAS,
+    espera_base: float = ESPERA_BASE,
+) -> Dict[str, object]:
+    """Busca o JSON repetindo falhas transitórias com espera exponencial e jitter."""
+
+    for tentativa in range(tentativas):
+        try:
+            return await transporte.obter_json(url)
+        except ErroHttp as erro:
+            if erro.status not in STATUS_RETENTAVEIS or tentativa == tentativas - 1:
+                raise
+        except (OSError, http.client.HTTPException, asyncio.TimeoutError, ValueError):
+            if tentativa == tentativas - 1:
+                raise
+        await asyncio.sleep(espera_base * 2 ** tentativa * random.uniform(0.5, 1.5))
+
+    raise RuntimeError("Nenhuma tentativa realizada")
+
+
+# Falhas de rede/HTTP após as tentativas: o preenchimento para no concurso e segue na próxima execução
+FALHAS_REDE = (ErroHttp, OSError, http.client.HTTPException, asyncio.TimeoutError)
+
+
+def concursos_faltantes(ultimo_salvo: int, ultimo_disponivel: int) -> List[int]:
+    """Números dos concursos posteriores ao último salvo."""
+
+    return list(range(int(ultimo_salvo) + 1, int(ultimo_disponivel) + 1))
+
+
+def converter_concurso(resposta: Dict[str, object]) -> Dict[str, object]:
+    """Converte o JSON de um concurso para as colunas do resultados.csv."""
+
+    dezenas = resposta.get("dezenasSorteadasOrdemSorteio") or resposta["listaDezenas"]
+    registro: Dict[str, object] = {
+        "Concurso": int(resposta["numero"]),
+        "Data Sorteio": resposta.get("dataApuracao"),
+    }
+    for posicao, dezena in enumerate(dezenas, start=1):
+        registro[f"B{posicao}"] = int(dezena)
+
+    for rateio in resposta.get("listaRateioPremio") or []:
+        if rateio.get("faixa") == 1:
+            registro["Ganhou"] = int(rateio.get("numeroDeGanhadores", 0))
+            break
+
+    return registro
+
+
+async def buscar_concursos(
+    concursos: Iterable[int],
+    transporte: Optional[Transporte] = None,
+    simultaneos: int = SIMULTANEOS,
+    tentativas: int = TENTATIVAS,
+    espera_base: float = ESPERA_BASE,
+    url: str = URL_CONCURSO,
+) -> List[Dict[str, object]]:
+    """
+    Busca os concursos em paralelo, no máximo `simultaneos` por vez.
+
+    Retorna os registros em ordem de concurso até a primeira falha de rede
+    (FALHAS_REDE), para que o histórico continue contíguo; os concursos
+    seguintes ficam para a próxima execução. Qualquer outro erro (ex.: JSON
+    em formato inesperado) é propagado.
+    """
+
+    proprio = transporte is None
+    transporte = transporte or TransporteHttp()
+    limite = asyncio.Semaphore(simultaneos)
+
+    async def buscar(concurso: int) -> Dict[str, object]:
+        async with limite:
+            resposta = await obter_com_retentativas(
+                transporte, url.format(concurso=concurso), tentativas, espera_base
+            )
+        return converter_concurso(resposta)
+
+    concursos = sorted(concursos)
+    try:
+        resultados = await asyncio.gather(
+            *(buscar(concurso) for concurso in concursos), return_exceptions=True
+        )
+    finally:
+        if proprio:
+            await transporte.fechar()
+
+    for resultado in resultados:
+        if isinstance(resultado, BaseException) and not isinstance(resultado, FALHAS_REDE):
+            raise resultado
+
+    registros = []
+    for concurso, resultado in zip(concursos, resultados):
+        if isinstance(resultado, BaseException):
+            LOGGER.warning(
+                "Concurso %s indisponível (%s); preenchimento interrompido com %s de %s concursos",
+                concurso,
+                resultado,
+                len(registros),
+                len(concursos),
+            )
+            break
+        registros.append(resultado)
+    return registros
+
+
+async def ultimo_disponivel(
+    transporte: Transporte,
+    url: str = URL_ULTIMO,
+    tentativas: int = TENTATIVAS,
+    espera_base: float = ESPERA_BASE,
+) -> int:
+    """Número do concurso mais recente publicado pela API."""
+
+    resposta = await obter_com_retentativas(transporte, url, tentativas, espera_base)
+    return int(resposta["numero"])
+
+
+async def _baixar_faltantes(
+    ultimo_salvo: int,
+    transporte: Optional[Transporte],
+    simultaneos: int,
+    tentativas: int,
+    espera_base: float,
+    url_concurso: str,
+    url_ultimo: str,
+) -> pd.DataFrame:
+    proprio = transporte is None
+    transporte = transporte or TransporteHttp()
+    try:
+        ultimo = await ultimo_disponivel(transporte, url_ultimo, tentativas, espera_base)
+        registros = await buscar_concursos(
+            concursos_faltantes(ultimo_salvo, ultimo),
+            transporte,
+            simultaneos,
+            tentativas,
+            espera_base,
+            url_concurso,
+        )
+    finally:
+        if proprio:
+            await transporte.fechar()
+    return pd.DataFrame(registros)
+
+
+def baixar_faltantes(
+    ultimo_salvo: int,
+    transporte: Optional[Transporte] = None,
+    simultaneos: int = SIMULTANEOS,
+    tentativas: int = TENTATIVAS,
+    espera_base: float = ESPERA_BASE,
+    url_concurso: str = URL_CONCURSO,
+    url_ultimo: str = URL_ULTIMO,
+) -> pd.DataFrame:
+    """
+    Baixa somente os concursos posteriores a `ultimo_salvo`.
+
+    :return: DataFrame com Concurso, Data Sorteio, B1..B15 e Ganhou (vazio se não há novos).
+    """
+
+    return asyncio.run(
+        _baixar_faltantes(
+            ultimo_salvo,
+            transporte,
+            simultaneos,
+            tentativas,
+            espera_base,
+            url_concurso,
+            url_ultimo,
+        )
+    )
@@ -0,0 +1,240 @@
+"""
+Armazenamento indexado (SQLite) do histórico de concursos.
+
+Mantém as mesmas colunas do resultados.csv, com índice único em Concurso e
+índice na data do sorteio (ISO), para que consultas paginadas e por período
+não precisem ler o histórico inteiro.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+
+BANCO = Path("./base/concursos.sqlite")
+TABELA = "concursos"
+# Chave/valor com a versão (id do snapshot do ETL) que o banco reflete
+TABELA_META = "meta"
+CHAVE_VERSAO = "snapshot"
+COLUNA_DATA = "data_iso"
+COLUNA_ORIGEM_DATA = "Data Sorteio"
+
+Data = Union[date, str, None]
+
+
+def _nome(coluna: str) -> str:
+    return '"' + str(coluna).replace('"', '""') + '"'
+
+
+def conectar(banco: Path = BANCO) -> sqlite3.Connection:
+    """Abre o banco em modo WAL (leituras não bloqueiam a gravação do ETL)."""
+
+    banco.parent.mkdir(parents=True, exist_ok=True)
+    conexao = sqlite3.connect(banco)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    return conexao
+
+
+def colunas(conexao: sqlite3.Connection) -> List[str]:
+    """Colunas do histórico gravadas na tabela (sem a coluna de data ISO)."""
+
+    info = conexao.execute(f"PRAGMA table_info({TABELA})").fetchall()
+    return [linha[1] for linha in info if linha[1] != COLUNA_DATA]
+
+
+def _criar_tabela(conexao: sqlite3.Connection, nomes: List[str]) -> None:
+    definicoes = [
+        f"{_nome(coluna)} INTEGER" if coluna == "Concurso" or coluna.startswith("B") else _nome(coluna)
+        for coluna in nomes
+    ]
+    definicoes.append(f"{COLUNA_DATA} TEXT")
+    conexao.execute(f"CREATE TABLE {TABELA} ({', '.join(definicoes)})")
+    conexao.execute(f'CREATE UNIQUE INDEX idx_{TABELA}_concurso ON {TABELA} ("Concurso")')
+    conexao.execute(f"CREATE INDEX idx_{TABELA}_data ON {TABELA} ({COLUNA_DATA})")
+
+
+def _data_iso(dados: pd.DataFrame) -> pd.Series:
+    if COLUNA_ORIGEM_DATA not in dados.columns:
+        return pd.Series(None, index=dados.index, dtype=object)
+    datas = pd.to_datetime(dados[COLUNA_ORIGEM_DATA], dayfirst=True, errors="coerce")
+    return datas.dt.strftime("%Y-%m-%d").where(datas.notna(), None)
+
+
+def ultimo_concurso(banco: Path = BANCO) -> Optional[int]:
+    """Maior concurso gravado (None se o banco ainda não existe)."""
+
+    if not banco.exists():
+        return None
+    with closing(sqlite3.connect(banco)) as conexao:
+        try:
+            linha = conexao.execute(f'SELECT MAX("Concurso") FROM {TABELA}').fetchone()
+        except sqlite3.OperationalError:
+            return None
+    return None if linha[0] is None else int(linha[0])
+
+
+def versao_registrada(banco: Path = BANCO) -> Optional[str]:
+    """Id do snapshot do ETL refletido pelo banco (None se não registrado)."""
+
+    if not banco.exists():
+        return None
+    with closing(sqlite3.connect(banco)) as conexao:
+        try:
+            linha = conexao.execute(
+                f"SELECT valor FROM {TABELA_META} WHERE chave = ?", (CHAVE_VERSAO,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+    return None if linha is None else linha[0]
+
+
+def _registrar_versao(conexao: sqlite3.Connection, versao: str) -> None:
+    # Ids de snapshot são ordenáveis pelo tempo: a versão registrada nunca regride
+    conexao.execute(f"CREATE TABLE IF NOT EXISTS {TABELA_META} (chave TEXT PRIMARY KEY, valor TEXT)")
+    conexao.execute(
+        f"INSERT INTO {TABELA_META} (chave, valor) VALUES (?, ?) "
+        f"ON CONFLICT(chave) DO UPDATE SET valor = excluded.valor WHERE excluded.valor > {TABELA_META}.valor",
+        (CHAVE_VERSAO, versao),
+    )
+
+
+def registrar_versao(versao: str, banco: Path = BANCO) -> None:
+    """Registra que o banco já contém os concursos do snapshot `versao`."""
+
+    with closing(conectar(banco)) as conexao:
+        with conexao:
+            _registrar_versao(conexao, versao)
+
+
+def atualizar_armazem(dados: pd.DataFrame, banco: Path = BANCO, versao: Optional[str] = None) -> int:
+    """
+    Grava os concursos posteriores ao último salvo em uma única transação.
+
+    Com `versao` (id do snapshot publicado), registra na mesma transação que
+    o banco reflete esse snapshot.
+
+    :return: quantidade de concursos inseridos.
+    """
+
+    with closing(conectar(banco)) as conexao:
+        with conexao:
+            existentes = colunas(conexao)
+            if not existentes:
+                existentes = list(dados.columns)
+                _criar_tabela(conexao, existentes)
+
+            ultimo = conexao.execute(f'SELECT MAX("Concurso") FROM {TABELA}').fetchone()[0]
+            novos = dados if ultimo is None else dados[dados["Concurso"] > ultimo]
+            if not novos.empty:
+                novos = novos.sort_values("Concurso").reindex(columns=existentes)
+                novos[COLUNA_DATA] = _data_iso(novos)
+                valores = novos.astype(object).where(novos.notna(), None)
+
+                nomes = ", ".join(_nome(coluna) for coluna in novos.columns)
+                marcadores = ", ".join("?" for _ in novos.columns)
+                conexao.executemany(
+                    f"INSERT OR REPLACE INTO {TABELA} ({nomes}) VALUES ({marcadores})",
+                    valores.itertuples(index=False, name=None),
+                )
+            if versao is not None:
+                _registrar_versao(conexao, versao)
+    return len(novos)
+
+
+def _texto_data(valor: Data) -> Optional[str]:
+    if valor is None:
+        return None
+    return valor.isoformat() if isinstance(valor, date) else str(valor)
+
+
+def consultar(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    data_inicio: Data = None,
+    data_fim: Data = None,
+    decrescente: bool = False,
+    apos_concurso: Optional[int] = None,
+    banco: Path = BANCO,
+) -> pd.DataFrame:
+    """
+    Consulta concursos em formato largo, em ordem de concurso.
+
+    Filtros, ordenação e paginação são resolvidos pelo SQLite usando os índices.
+    Com apos_concurso (paginação por cursor) a busca começa direto no índice,
+    sem percorrer as linhas anteriores como o OFFSET.
+    """
+
+    condicoes = []
+    parametros: List[object] = []
+    if data_inicio is not None:
+        condicoes.append(f"{COLUNA_DATA} >= ?")
+        parametros.append(_texto_data(data_inicio))
+    if data_fim is not None:
+        condicoes.append(f"{COLUNA_DATA} <= ?")
+        parametros.append(_texto_data(data_fim))
+    if apos_concurso is not None:
+        condicoes.append('"Concurso" > ?')
+        parametros.append(int(apos_concurso))
+
+    with closing(sqlite3.connect(banco)) as conexao:
+        selecao = ", ".join(_nome(coluna) for coluna in colunas(conexao))
+        sql = f"SELECT {selecao} FROM {TABELA}"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        sql += ' ORDER BY "Concurso"' + (" DESC" if decrescente else "")
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            parametros.extend([-1 if limit is None else int(limit), int(offset)])
+        return pd.read_sql_query(sql, conexao, params=parametros)
+
+
+def para_long(dados: pd.DataFrame) -> pd.DataFrame:
+    """Converte concursos largos na visão long (uma linha por dezena), em ordem de concurso."""
+
+    dezenas_cols = [col for col in dados.columns if col.startswith("B")]
+    id_vars = [col for col in ("Concurso", COLUNA_ORIGEM_DATA) if col in dados.columns]
+    long_df = dados.melt(
+        id_vars=id_vars,
+        value_vars=dezenas_cols,
+        var_name="Posicao",
+        value_name="Dezena",
+        ignore_index=False,
+    )
+    long_df["Sorteada"] = 1
+    # melt agrupa por posição; o índice original devolve a ordem de concurso
+    return long_df.sort_index(kind="stable").reset_index(drop=True)
+
+
+def consultar_long(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    data_inicio: Data = None,
+    data_fim: Data = None,
+    apos_concurso: Optional[int] = None,
+    banco: Path = BANCO,
+) -> pd.DataFrame:
+    """
+    Consulta a visão long paginando pelas linhas de dezenas.
+
+    Cada concurso tem uma linha por dezena, então só os concursos que cobrem a
+    faixa pedida são lidos do banco.
+    """
+
+    with closing(sqlite3.connect(banco)) as conexao:
+        por_concurso = sum(1 for coluna in colunas(conexao) if coluna.startswith("B")) or 1
+
+    primeiro = offset // por_concurso
+    quantidade = None if limit is None else -(-(offset + limit) // por_concurso) - primeiro
+    largo = consultar(
+        quantidade, primeiro, data_inicio, data_fim, apos_concurso=apos_concurso, banco=banco
+    )
+
+    inicio = offset - primeiro * por_concurso
+    long_df = para_long(largo)
+    fim = None if limit is None else inicio + limit
+    return long_df.iloc[inicio:fim].reset_index(drop=True)
@@ -0,0 +1,179 @@
+from hashlib import sha256
+from os import makedirs, path, replace, stat
+from shutil import rmtree
+import json
+
+import numpy as np
+from pandas import DataFrame, api, to_numeric
+
+# Diretório das cópias colunares das planilhas (uma pasta por guia)
+DIR_CACHE = './base/cache'
+ARQ_META = 'meta.json'
+VERSAO = 1
+
+# Menor tipo inteiro gravado (evita estouro em somas e produtos das dezenas)
+INTEIRO_MINIMO = np.int16
+
+# Bytes lidos por vez ao calcular o hash da planilha
+BLOCO_HASH = 1 << 20
+
+
+def hash_arquivo(arquivo):
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo.
+
+    :param arquivo: caminho do arquivo.
+    :return: o hash em hexadecimal.
+    """
+
+    resumo = sha256()
+    with open(arquivo, 'rb') as origem:
+        for bloco in iter(lambda: origem.read(BLOCO_HASH), b''):
+            resumo.update(bloco)
+
+    return resumo.hexdigest()
+
+
+def _converter_coluna(serie):
+    # Retorna o array tipado da coluna e o tipo registrado no meta
+    if api.types.is_bool_dtype(serie):
+        return serie.to_numpy(dtype=np.bool_), 'bool'
+
+    if api.types.is_datetime64_any_dtype(serie):
+        return serie.to_numpy(dtype='datetime64[ns]'), 'data'
+
+    if api.types.is_numeric_dtype(serie):
+        if serie.notna().all() and (serie == serie.round()).all():
+            valores = to_numeric(serie, downcast='integer').to_numpy()
+            return valores.astype(np.promote_types(valores.dtype, INTEIRO_MINIMO)), 'inteiro'
+        return serie.to_numpy(dtype=np.float64), 'real'
+
+    nulos = serie.isna()
+    return serie.where(~nulos, '').astype(str).to_numpy(dtype=str), 'texto'
+
+
+def salvar_colunas(dados, destino, origem=None):
+    """
+    Grava o DataFrame como um arquivo .npy por coluna.
+
+    :param dados: DataFrame a gravar.
+    :param destino: diretório da cópia colunar.
+    :param origem: arquivo de origem, registrado com tamanho, mtime e hash.
+    :return: o dicionário de metadados gravado.
+    """
+
+    temporario = destino + '.tmp'
+    rmtree(temporario, ignore_errors=True)
+    makedirs(temporario)
+
+    colunas = []
+    for indice, nome in enumerate(dados.columns):
+        serie = dados[nome]
+        valores, tipo = _converter_coluna(serie)
+        arquivo = f'coluna_{indice}.npy'
+        np.save(path.join(temporario, arquivo), valores)
+
+        coluna = {'nome': nome, 'arquivo': arquivo, 'tipo': tipo}
+        if tipo == 'texto' and serie.isna().any():
+            coluna['nulos'] = f'nulos_{indice}.npy'
+            np.save(path.join(temporario, coluna['nulos']), serie.isna().to_numpy())
+        colunas.append(coluna)
+
+    meta = {'versao': VERSAO, 'linhas': len(dados), 'colunas': colunas}
+    if origem is not None:
+        informacoes = stat(origem)
+        meta['origem'] = {
+            'tamanho': informacoes.st_size,
+            'mtime_ns': informacoes.st_mtime_ns,
+            'sha256': hash_arquivo(origem),
+        }
+
+    with open(path.join(temporario, ARQ_META), 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, ensure_ascii=False, indent=2)
+
+    rmtree(destino, ignore_errors=True)
+    replace(temporario, destino)
+
+    return meta
+
+
+def ler_meta(destino):
+    """
+    Lê os metadados da cópia colunar.
+
+    :param destino: diretório da cópia colunar.
+    :return: o dicionário de metadados ou None se a cópia não existir.
+    """
+
+    arq_meta = path.join(destino, ARQ_META)
+    if not path.exists(arq_meta):
+        return None
+
+    with open(arq_meta, encoding='utf-8') as arquivo:
+        meta = json.load(arquivo)
+
+    return meta if meta.get('versao') == VERSAO else None
+
+
+def cache_valido(destino, origem):
+    """
+    Verifica se a cópia colunar corresponde ao arquivo de origem.
+
+    Tamanho e mtime iguais validam a cópia sem ler a planilha; se apenas o
+    mtime mudou, o hash do conteúdo decide (e o mtime é atualizado no meta).
+
+    :param destino: diretório da cópia colunar.
+    :param origem: arquivo de origem (planilha).
+    :return: True se a cópia pode ser usada.
+    """
+
+    meta = ler_meta(destino)
+    if meta is None or 'origem' not in meta:
+        return False
+
+    informacoes = stat(origem)
+    registrado = meta['origem']
+    if informacoes.st_size != registrado['tamanho']:
+        return False
+
+    if informacoes.st_mtime_ns == registrado['mtime_ns']:
+        return True
+
+    if hash_arquivo(origem) != registrado['sha256']:
+        return False
+
+    registrado['mtime_ns'] = informacoes.st_mtime_ns
+    temporario = path.join(destino, ARQ_META + '.tmp')
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, ensure_ascii=False, indent=2)
+    replace(temporario, path.join(destino, ARQ_META))
+
+    return True
+
+
+def carregar_colunas(destino, mmap=False):
+    """
+    Lê a cópia colunar como DataFrame.
+
+    :param destino: diretório da cópia colunar.
+    :param mmap: True - colunas numéricas mapeadas em memória (somente leitura).
+    :return: o DataFrame.
+    """
+
+    meta = ler_meta(destino)
+    if meta is None:
+        raise FileNotFoundError(f'Cópia colunar não encontrada: {destino}')
+
+    modo = 'r' if mmap else None
+    colunas = {}
+    for coluna in meta['colunas']:
+        arquivo = path.join(destino, coluna['arquivo'])
+        if coluna['tipo'] == 'texto':
+            valores = np.load(arquivo).astype(object)
+            if 'nulos' in coluna:
+                valores[np.load(path.join(destino, coluna['nulos']))] = None
+        else:
+            valores = np.load(arquivo, mmap_mode=modo)
+        colunas[coluna['nome']] = valores
+
+    return DataFrame(colunas, copy=not mmap)
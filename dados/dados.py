@@ -1,21 +1,39 @@
+from os import path
+
 from sklearn.model_selection import train_test_split
 
 from pandas import ExcelFile, read_excel
 
+from dados.colunar import DIR_CACHE, cache_valido, carregar_colunas, salvar_colunas
+
+CAMINHO = './base/base_dados.xlsx'
+
 
-def carregar_dados(guia='Importar_Ciclo'):
+def carregar_dados(guia='Importar_Ciclo', caminho=CAMINHO, usar_cache=True, mmap=False):
     """
     Importando os dados da planilha do Excel gerando o dataframe da
     base de dados.
 
+    A guia é convertida uma vez para uma cópia colunar (um .npy por coluna,
+    com inteiros tipados) em {DIR_CACHE}; as chamadas seguintes leem a cópia
+    enquanto o tamanho/mtime ou o hash da planilha não mudarem.
+
+    :param guia: guia da planilha com os dados.
+    :param caminho: arquivo da planilha (default: {CAMINHO}).
+    :param usar_cache: False - sempre lê a planilha com o openpyxl.
+    :param mmap: True - colunas numéricas mapeadas em memória (somente leitura).
+
     :return: a base de dados.
     """
 
-    caminho = './base/base_dados.xlsx'
-    planilha = ExcelFile(caminho)
-    dados = read_excel(planilha, guia)
+    if not usar_cache:
+        return read_excel(ExcelFile(caminho), guia)
+
+    destino = path.join(DIR_CACHE, guia)
+    if not cache_valido(destino, caminho):
+        salvar_colunas(read_excel(ExcelFile(caminho), guia), destino, origem=caminho)
 
-    return dados
+    return carregar_colunas(destino, mmap=mmap)
 
 
 def preparar_dados(base_dados):
@@ -1,6 +1,8 @@
-from itertools import combinations
-from csv import writer
-from os import path
+from math import comb
+from os import path, replace
+from zlib import crc32
+
+import numpy as np
 
 
 # Cabeçalho do arquivo
@@ -13,12 +15,144 @@ DEZENAS = [i for i in range(1, 26)]
 
 # Diretório
 DIR = './combinacoes/combinacoes.csv'
+DIR_BIN = './combinacoes/combinacoes.bin'
 
 # Quantidade de dezenas
 TM = 15
 
+# Quantidade de combinações processadas por bloco
+BLOCO = 500000
+
+
+def total_combinacoes(dz=DEZENAS, tm=TM):
+	"""
+	Quantidade de combinações possíveis das dezenas informadas.
+
+	:param dz: Dezenas da Lotofácil (default: {DEZENAS})
+	:param tm: Quantidade de dezenas para a combinação (default: {15})
+	"""
+
+	return comb(len(dz), tm)
+
 
-def criar_combinacoes_csv(dr=DIR, cb=CABECALHO, dz=DEZENAS, tm=TM):
+def dividir_faixas(total, partes):
+	"""
+	Divide o intervalo de índices [0, total) em faixas contíguas e disjuntas,
+	para que cada processo trabalhe em uma fatia do espaço de combinações.
+
+	:param total: Quantidade total de combinações
+	:param partes: Quantidade de faixas desejadas
+
+	:return: Lista de tuplas (inicio, fim) com fim exclusivo.
+	"""
+
+	partes = max(1, min(partes, total)) if total else 1
+	limites = [total * parte // partes for parte in range(partes + 1)]
+
+	return list(zip(limites[:-1], limites[1:]))
+
+
+def gerar_blocos(dz=DEZENAS, tm=TM, bloco=BLOCO, inicio=0, fim=None):
+	"""
+	Gera as combinações em blocos (arrays NumPy) na ordem lexicográfica,
+	sem materializar o espaço inteiro em memória.
+
+	:param dz: Dezenas do universo, podendo ser um subconjunto (default: {DEZENAS})
+	:param tm: Quantidade de dezenas para a combinação (default: {15})
+	:param bloco: Quantidade máxima de combinações por bloco (default: {BLOCO})
+	:param inicio: Primeiro índice da faixa (default: {0})
+	:param fim: Índice final (exclusivo) da faixa (default: total de combinações)
+
+	:return: Gerador de arrays uint8 (quantidade, tm) com as dezenas em ordem crescente.
+	"""
+	from processamento.combinatoria import desranquear_lote
+
+	dezenas = np.asarray(sorted(dz), dtype=np.uint8)
+	total = comb(len(dezenas), tm)
+	fim = total if fim is None else min(fim, total)
+
+	if inicio < 0 or inicio > fim:
+		raise ValueError(f'Faixa inválida: [{inicio}, {fim}).')
+
+	for atual in range(inicio, fim, bloco):
+		indices = np.arange(atual, min(atual + bloco, fim))
+		yield dezenas[desranquear_lote(indices, len(dezenas), tm) - 1]
+
+
+# Valores abaixo deste limite são formatados por tabela de consulta
+LIMITE_TABELA = 1024
+
+
+def _tokens_coluna(valores, sufixo):
+	"""
+	Formata uma coluna de inteiros não negativos em faixas de largura fixa
+	(dígitos seguidos do sufixo), completadas com zeros.
+	"""
+
+	maior = int(valores.max())
+	digitos_max = len(str(maior))
+	largura = digitos_max + len(sufixo)
+
+	if maior < LIMITE_TABELA:
+		tabela = np.zeros((maior + 1, largura), dtype=np.uint8)
+		for valor in range(maior + 1):
+			texto = str(valor).encode() + sufixo
+			tabela[valor, :len(texto)] = np.frombuffer(texto, dtype=np.uint8)
+		return tabela[valores]
+
+	tokens = np.zeros((valores.size, largura), dtype=np.uint8)
+	digitos = np.ones(valores.shape, dtype=np.int64)
+	limite = 10
+	while limite <= maior:
+		digitos += valores >= limite
+		limite *= 10
+
+	# Escreve da unidade para a casa mais alta, da direita para a esquerda
+	resto = valores.copy()
+	for casa in range(digitos_max):
+		linhas = np.nonzero(digitos > casa)[0]
+		tokens[linhas, digitos[linhas] - 1 - casa] = ord('0') + resto[linhas] % 10
+		resto //= 10
+
+	for indice, caractere in enumerate(sufixo):
+		tokens[np.arange(valores.size), digitos + indice] = caractere
+
+	return tokens
+
+
+def _formatar_csv(matriz, separador=b';', terminador=b'\r\n'):
+	"""
+	Converte uma matriz de inteiros não negativos em linhas CSV (bytes).
+	"""
+
+	matriz = np.asarray(matriz, dtype=np.int64)
+	linhas, colunas = matriz.shape
+	if not linhas:
+		return b''
+
+	tokens = [
+		_tokens_coluna(matriz[:, coluna], terminador if coluna == colunas - 1 else separador)
+		for coluna in range(colunas)
+	]
+
+	texto = np.concatenate(tokens, axis=1).ravel()
+	return texto[texto != 0].tobytes()
+
+
+def _escrever_csv(arquivo, blocos, cb, inicio=0):
+	"""
+	Escreve os blocos de combinações no CSV com a coluna de sequência.
+	"""
+	arquivo.write(';'.join(cb).encode() + b'\r\n')
+	seq = inicio + 1
+
+	for bloco in blocos:
+		linhas = np.column_stack([np.arange(seq, seq + len(bloco)), bloco])
+		arquivo.write(_formatar_csv(linhas))
+		seq += len(bloco)
+
+
+def criar_combinacoes_csv(dr=DIR, cb=CABECALHO, dz=DEZENAS, tm=TM, bloco=BLOCO):
 	"""
 	Cria um arquivo CSV com todos as combinações possíveis da Lotofácil. 
 	
@@ -26,23 +160,12 @@ def criar_combinacoes_csv(dr=DIR, cb=CABECALHO, dz=DEZENAS, tm=TM):
 	:param cb: Cabeçalho do arquivo CSV (default: {CABECALHO})
 	:param dz: Dezenas da Lotofácil (default: {DEZENAS})
 	:param tm: Quantidade de dezenas para a combinação (default: {15})
+	:param bloco: Quantidade de combinações escritas por vez (default: {BLOCO})
 	"""
 
 	if not path.exists(dr):
-		with open(dr, 'w', newline='') as arquivo:
-			add = writer(arquivo, delimiter=';')
-
-			add.writerow(cb)
-			indice = 1
-
-			for combinacao in combinations(dz, tm):
-				linha = list(combinacao)
-				linha.insert(0, indice)
-				
-				add.writerow(linha)
-
-				indice += 1
-
+		with open(dr, 'wb') as arquivo:
+			_escrever_csv(arquivo, gerar_blocos(dz, tm, bloco), cb)
 
 
 def criar_combinacoes(dz=DEZENAS, tm=TM):
@@ -56,11 +179,68 @@ def criar_combinacoes(dz=DEZENAS, tm=TM):
 
 	combinacoes = list()
 
-	for combinacao in combinations(dz, tm):
-		combinacoes.append(list(combinacao))
+	for bloco in gerar_blocos(dz, tm):
+		combinacoes.extend(bloco.tolist())
 
 	return combinacoes
 
 
+def criar_combinacoes_bin(dr=DIR_BIN, dz=DEZENAS, tm=TM, bloco=BLOCO):
+	"""
+	Cria o arquivo binário com todas as combinações possíveis da Lotofácil,
+	uma máscara de 25 bits (uint32) por combinação em ordem lexicográfica.
+
+	:param dr: Diretório aonde será salvo o arquivo (default: {DIR_BIN})
+	:param dz: Dezenas da Lotofácil (default: {DEZENAS})
+	:param tm: Quantidade de dezenas para a combinação (default: {15})
+	:param bloco: Quantidade de combinações geradas por vez (default: {BLOCO})
+	"""
+	from processamento.mascara import empacotar
+	from processamento.possibilidades import TAMANHO_CABECALHO, montar_cabecalho
+
+	total = comb(len(dz), tm)
+	temporario = dr + '.tmp'
+	checksum = 0
+
+	with open(temporario, 'wb') as arquivo:
+		arquivo.write(b'\0' * TAMANHO_CABECALHO)
+
+		for jogos in gerar_blocos(dz, tm, bloco):
+			dados = empacotar(jogos).astype('<u4').tobytes()
+
+			checksum = crc32(dados, checksum)
+			arquivo.write(dados)
+
+		arquivo.seek(0)
+		arquivo.write(montar_cabecalho(len(dz), tm, total, checksum))
+
+	# Publica o arquivo completo de uma vez para não expor escrita parcial
+	replace(temporario, dr)
+
+
+def exportar_combinacoes_csv(origem=DIR_BIN, dr=DIR, cb=CABECALHO, bloco=BLOCO):
+	"""
+	Exporta o arquivo binário de combinações para o formato CSV legado.
+
+	:param origem: Arquivo binário com as combinações (default: {DIR_BIN})
+	:param dr: Diretório aonde será salvo o CSV (default: {DIR})
+	:param cb: Cabeçalho do arquivo CSV (default: {CABECALHO})
+	:param bloco: Quantidade de combinações exportadas por vez (default: {BLOCO})
+	"""
+	from processamento.mascara import desempacotar_lote
+	from processamento.possibilidades import abrir_combinacoes, ler_cabecalho
+
+	mascaras = abrir_combinacoes(origem)
+	tm = ler_cabecalho(origem)['k']
+	blocos = (
+		desempacotar_lote(mascaras[inicio:inicio + bloco], tm)
+		for inicio in range(0, len(mascaras), bloco)
+	)
+
+	with open(dr, 'wb') as arquivo:
+		_escrever_csv(arquivo, blocos, cb)
+
+
 if __name__ == '__main__':	
+	criar_combinacoes_bin()
 	criar_combinacoes_csv()
@@ -4,11 +4,19 @@ Pipeline de ingestão do histórico oficial de concursos da Lotofácil.
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import io
 import json
+import os
 import ssl
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
 import pandas as pd
 
@@ -21,12 +29,97 @@ DESTINO_LONG = Path("./base/concursos_long.csv")
 DESTINO_STATS = Path("./base/estatisticas_concursos.json")
 DESTINO_META = Path("./base/meta_atualizacao.json")
 
+# O servidor da Caixa não apresenta a cadeia de certificados completa; a
+# verificação é desligada apenas no contexto usado pelo download.
+VERIFICAR_SSL = False
+TIMEOUT = 60
+
+
+@dataclass
+class Download:
+    """Resultado de um download condicional da planilha."""
+
+    conteudo: Optional[bytes]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    sha256: Optional[str] = None
+    inalterado: bool = False
+
+    def origem(self) -> Dict[str, Optional[str]]:
+        """Validadores gravados no meta para a próxima requisição."""
+
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "sha256": self.sha256,
+        }
+
+
+def contexto_ssl(verificar: bool = VERIFICAR_SSL) -> ssl.SSLContext:
+    """Cria o contexto TLS do download sem alterar o padrão global do processo."""
+
+    contexto = ssl.create_default_context()
+    if not verificar:
+        contexto.check_hostname = False
+        contexto.verify_mode = ssl.CERT_NONE
+    return contexto
+
+
+def baixar_planilha(
+    url: str = URL,
+    origem: Optional[Dict[str, Optional[str]]] = None,
+    timeout: float = TIMEOUT,
+) -> Download:
+    """
+    Baixa a planilha usando os validadores do download anterior.
+
+    Envia If-None-Match/If-Modified-Since; uma resposta 304 ou um conteúdo
+    com o mesmo SHA-256 já registrado é marcado como inalterado.
+    """
+
+    origem = origem or {}
+    requisicao = urllib.request.Request(url, headers={"User-Agent": "lotofacil-etl"})
+    if origem.get("etag"):
+        requisicao.add_header("If-None-Match", origem["etag"])
+    if origem.get("last_modified"):
+        requisicao.add_header("If-Modified-Since", origem["last_modified"])
+
+    contexto = contexto_ssl() if url.lower().startswith("https") else None
+    try:
+        with urllib.request.urlopen(requisicao, timeout=timeout, context=contexto) as resposta:
+            conteudo = resposta.read()
+            cabecalhos = resposta.headers
+    except urllib.error.HTTPError as erro:
+        if erro.code != 304:
+            raise
+        return Download(
+            None,
+            erro.headers.get("ETag") or origem.get("etag"),
+            erro.headers.get("Last-Modified") or origem.get("last_modified"),
+            origem.get("sha256"),
+            inalterado=True,
+        )
+
+    resumo = hashlib.sha256(conteudo).hexdigest()
+    return Download(
+        conteudo,
+        cabecalhos.get("ETag"),
+        cabecalhos.get("Last-Modified"),
+        resumo,
+        inalterado=resumo == origem.get("sha256"),
+    )
+
+
+def ler_planilha(conteudo: bytes) -> pd.DataFrame:
+    """Lê a planilha baixada a partir dos bytes em memória."""
+
+    return pd.read_excel(io.BytesIO(conteudo))
+
 
 def xls_resultados(url: str = URL) -> pd.DataFrame:
     """Obtém a planilha oficial (XLS) com todos os sorteios."""
 
-    ssl._create_default_https_context = ssl._create_unverified_context
-    return pd.read_excel(url)
+    return ler_planilha(baixar_planilha(url).conteudo)
 
 
 def preparar_resultados(dados: pd.DataFrame) -> pd.DataFrame:
@@ -89,19 +182,45 @@ def combinar_datasets(
     return combinado, max(novos, 0)
 
 
+def _temporario(destino: Path) -> Path:
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    return destino.with_name(destino.name + ".tmp")
+
+
 def salvar_resultados(dados: pd.DataFrame, destino: Path = DESTINO_PADRAO) -> Path:
-    """Exporta os dados limpos para CSV."""
+    """Exporta os dados limpos para CSV (substituição atômica do arquivo)."""
 
-    destino.parent.mkdir(parents=True, exist_ok=True)
-    dados.to_csv(destino, sep=";", encoding="utf8", index=False)
+    temporario = _temporario(destino)
+    dados.to_csv(temporario, sep=";", encoding="utf8", index=False)
+    os.replace(temporario, destino)
     return destino
 
 
+def anexar_resultados(novos: pd.DataFrame, destino: Path = DESTINO_PADRAO) -> bool:
+    """
+    Acrescenta ao CSV apenas as linhas dos concursos novos.
+
+    Retorna False (sem gravar) se as colunas não coincidirem com o cabeçalho salvo.
+    """
+
+    cabecalho = list(pd.read_csv(destino, sep=";", encoding="utf8", nrows=0).columns)
+    if sorted(cabecalho) != sorted(novos.columns):
+        return False
+
+    novos[cabecalho].to_csv(destino, sep=";", encoding="utf8", index=False, mode="a", header=False)
+    return True
+
+
 def gerar_concursos_long(
     dados: pd.DataFrame,
     destino: Path = DESTINO_LONG,
+    anexar: bool = False,
 ) -> Path:
-    """Cria a visão long (uma linha por dezena/concurso)."""
+    """
+    Cria a visão long (uma linha por dezena/concurso).
+
+    Com anexar=True e a visão já existente, só as linhas de `dados` são acrescentadas.
+    """
 
     dezenas_cols = [col for col in dados.columns if col.startswith("B")]
     long_df = dados.melt(
@@ -112,8 +231,12 @@ def gerar_concursos_long(
     )
     long_df["Sorteada"] = 1
 
-    destino.parent.mkdir(parents=True, exist_ok=True)
-    long_df.to_csv(destino, sep=";", encoding="utf8", index=False)
+    if anexar and destino.exists():
+        long_df.to_csv(destino, sep=";", encoding="utf8", index=False, mode="a", header=False)
+    else:
+        temporario = _temporario(destino)
+        long_df.to_csv(temporario, sep=";", encoding="utf8", index=False)
+        os.replace(temporario, destino)
     return destino
 
 
@@ -134,59 +257,359 @@ def calcular_estatisticas(dados: pd.DataFrame) -> Dict[str, object]:
     }
 
 
+def atualizar_estatisticas(
+    estatisticas: Dict[str, object],
+    novos: pd.DataFrame,
+) -> Dict[str, object]:
+    """Soma às estatísticas salvas apenas os concursos novos."""
+
+    dezenas_cols = [col for col in novos.columns if col.startswith("B")]
+    freq = {int(k): int(v) for k, v in estatisticas["frequencia_dezenas"].items()}
+    contagem = novos[dezenas_cols].melt(value_name="Dezena")["Dezena"].value_counts()
+    for dezena, quantidade in contagem.items():
+        freq[int(dezena)] = freq.get(int(dezena), 0) + int(quantidade)
+
+    resumo = obter_resumo_ultimo_concurso(novos)
+    return {
+        "total_concursos": int(estatisticas["total_concursos"]) + int(len(novos)),
+        "frequencia_dezenas": dict(sorted(freq.items())),
+        "ultimo_concurso": resumo.get("concurso"),
+        "ultima_data": resumo.get("data"),
+        "gerado_em": datetime.utcnow().isoformat() + "Z",
+    }
+
+
+def ler_json(destino: Path) -> Optional[Dict[str, object]]:
+    """Lê um JSON gravado pelo ETL, se existir."""
+
+    if destino.exists():
+        return json.loads(destino.read_text(encoding="utf8"))
+    return None
+
+
 def salvar_estatisticas(
     estatisticas: Dict[str, object],
     destino: Path = DESTINO_STATS,
 ) -> Path:
     """Grava as estatísticas em JSON."""
 
-    destino.parent.mkdir(parents=True, exist_ok=True)
-    destino.write_text(
+    temporario = _temporario(destino)
+    temporario.write_text(
         json.dumps(estatisticas, ensure_ascii=False, indent=2),
         encoding="utf8",
     )
+    os.replace(temporario, destino)
     return destino
 
 
 def salvar_meta(meta: Dict[str, object], destino: Path = DESTINO_META) -> Path:
     """Registra informações da última atualização."""
 
-    destino.parent.mkdir(parents=True, exist_ok=True)
-    destino.write_text(
+    temporario = _temporario(destino)
+    temporario.write_text(
         json.dumps(meta, ensure_ascii=False, indent=2),
         encoding="utf8",
     )
+    os.replace(temporario, destino)
     return destino
 
 
-def atualizar_resultados(
-    url: str = URL,
-    destino: Path = DESTINO_PADRAO,
-    gerar_visoes: bool = True,
-) -> Dict[str, object]:
+@dataclass(frozen=True)
+class Caminhos:
+    """Arquivos gerados pelo ETL em um mesmo diretório (snapshot, etapa ou ./base)."""
+
+    csv: Path
+    long: Path = DESTINO_LONG
+    stats: Path = DESTINO_STATS
+    meta: Path = DESTINO_META
+    snapshot: Optional[str] = None
+
+    @classmethod
+    def em(
+        cls,
+        diretorio: Path,
+        destino: Path = DESTINO_PADRAO,
+        snapshot: Optional[str] = None,
+    ) -> "Caminhos":
+        return cls(
+            diretorio / destino.name,
+            diretorio / DESTINO_LONG.name,
+            diretorio / DESTINO_STATS.name,
+            diretorio / DESTINO_META.name,
+            snapshot,
+        )
+
+    def arquivos(self) -> Tuple[Path, Path, Path, Path]:
+        return self.csv, self.long, self.stats, self.meta
+
+
+def _caminhos_snapshot(atual, destino: Path) -> Caminhos:
+    # Sem snapshot (histórico anterior a eles) valem os caminhos de ./base
+    if atual is None or not atual.caminho(destino.name).exists():
+        return Caminhos(destino)
+    return Caminhos.em(atual.diretorio, destino, atual.id)
+
+
+def caminhos_publicados(destino: Path = DESTINO_PADRAO) -> Caminhos:
     """
-    Executa o fluxo completo (download → limpeza → persistência + visões).
+    Caminhos dos arquivos do snapshot publicado, sem fixá-lo.
+
+    Usado pelo próprio ETL; leitores que abrem os arquivos depois devem usar
+    fixar_publicados para que a limpeza não remova o snapshot nesse meio tempo.
     """
 
-    dados = preparar_resultados(xls_resultados(url))
-    existente = ler_existente(destino)
-    combinado, novos = combinar_datasets(dados, existente)
-    salvar_resultados(combinado, destino)
+    from dados import snapshots
+
+    return _caminhos_snapshot(snapshots.ler_atual(), destino)
+
+
+@contextmanager
+def fixar_publicados(destino: Path = DESTINO_PADRAO) -> Iterator[Caminhos]:
+    """Fixa o snapshot publicado durante o bloco (ex.: uma requisição) e entrega seus caminhos."""
+
+    from dados import snapshots
+
+    with snapshots.fixar() as atual:
+        yield _caminhos_snapshot(atual, destino)
+
+
+def _meta_incremental(meta: Optional[Dict[str, object]], destino: Path, csv: Path) -> bool:
+    # O meta só descreve o CSV se foi gravado para o mesmo destino e o arquivo existe
+    return (
+        meta is not None
+        and csv.exists()
+        and meta.get("csv") == str(destino)
+        and meta.get("ultimo_concurso") is not None
+        and meta.get("total_concursos") is not None
+    )
+
+
+def _atualizar_estados(dados: pd.DataFrame, snapshot: Optional[str]) -> None:
+    # Marca no bitset de jogos sorteados e no banco indexado somente os
+    # concursos novos. O banco é o último: a versão registrada nele indica
+    # que todos os estados refletem o snapshot
+    from dados.armazem import atualizar_armazem
+    from processamento.sorteados import atualizar_sorteados
+
+    atualizar_sorteados(dados)
+    atualizar_armazem(dados, versao=snapshot)
+
+
+def _estados_persistidos() -> bool:
+    from dados import armazem
+    from processamento import sorteados
+
+    arquivos = (sorteados.ARQUIVO, armazem.BANCO)
+    return all(Path(arq).exists() for arq in arquivos)
+
+
+def _estados_sincronizados(snapshot: Optional[str]) -> bool:
+    from dados import armazem
+
+    if snapshot is None:
+        return True
+    if not _estados_persistidos():
+        return False
+    registrada = armazem.versao_registrada()
+    return registrada is not None and registrada >= snapshot
+
+
+def _aplicar_novos(
+    novos_df: pd.DataFrame,
+    ultimo: int,
+    caminhos: Caminhos,
+    gerar_visoes: bool,
+) -> Dict[str, object]:
+    # Estatísticas e visão long são gravadas juntas; se estiverem no mesmo
+    # concurso do meta, basta somar/acrescentar os concursos novos
+    novos = len(novos_df)
+    anteriores = ler_json(caminhos.stats)
+    sincronizadas = anteriores is not None and anteriores.get("ultimo_concurso") == ultimo
+    if not sincronizadas:
+        estatisticas = calcular_estatisticas(ler_existente(caminhos.csv))
+    elif novos:
+        estatisticas = atualizar_estatisticas(anteriores, novos_df)
+    else:
+        estatisticas = anteriores
 
-    estatisticas = calcular_estatisticas(combinado)
     if gerar_visoes:
-        gerar_concursos_long(combinado, DESTINO_LONG)
-        salvar_estatisticas(estatisticas, DESTINO_STATS)
+        if not sincronizadas or not caminhos.long.exists():
+            gerar_concursos_long(ler_existente(caminhos.csv), caminhos.long)
+        elif novos:
+            gerar_concursos_long(novos_df, caminhos.long, anexar=True)
+        if estatisticas is not anteriores:
+            salvar_estatisticas(estatisticas, caminhos.stats)
 
+    return estatisticas
+
+
+def _gravar_meta(
+    estatisticas: Dict[str, object],
+    novos: int,
+    destino: Path,
+    origem: Optional[Dict[str, Optional[str]]],
+    caminhos: Caminhos,
+) -> Dict[str, object]:
     meta = {
         "ultimo_concurso": estatisticas["ultimo_concurso"],
         "ultima_data": estatisticas["ultima_data"],
         "total_concursos": estatisticas["total_concursos"],
         "novos_registros": novos,
         "atualizado_em": estatisticas["gerado_em"],
+        "csv": str(destino),
+        "origem": origem,
     }
-    salvar_meta(meta, DESTINO_META)
-    return {"meta": meta, "estatisticas": estatisticas, "csv": str(destino)}
+    salvar_meta(meta, caminhos.meta)
+    return meta
+
+
+def _publicar(publicados: Caminhos, destino: Path, gravar) -> Tuple[Dict[str, object], Dict[str, object]]:
+    """
+    Executa `gravar(caminhos)` em um novo snapshot e o publica.
+
+    `gravar` retorna o meta, as estatísticas e os concursos a aplicar nos
+    estados persistidos. A etapa parte de cópias dos arquivos publicados; em
+    caso de erro é descartada e o snapshot anterior continua valendo. Após a
+    publicação os caminhos de ./base são trocados atomicamente para o novo
+    conteúdo e os estados (bitset e banco) são atualizados
+    com o id do snapshot.
+    """
+
+    from dados import snapshots
+
+    etapa = snapshots.preparar_etapa(publicados.arquivos())
+    try:
+        meta, estatisticas, estados = gravar(Caminhos.em(etapa, destino))
+    except BaseException:
+        snapshots.descartar_etapa(etapa)
+        raise
+
+    snapshot = snapshots.publicar(etapa)
+    snapshots.espelhar(snapshot, Caminhos(destino).arquivos())
+    meta["snapshot"] = snapshot.id
+    _atualizar_estados(estados, snapshot.id)
+    return meta, estatisticas
+
+
+def _sem_alteracao(
+    publicados: Caminhos,
+    meta_anterior: Dict[str, object],
+    destino: Path,
+) -> Dict[str, object]:
+    estatisticas = ler_json(publicados.stats)
+    if estatisticas is None:
+        estatisticas = calcular_estatisticas(ler_existente(publicados.csv))
+    if not _estados_sincronizados(publicados.snapshot):
+        # Uma atualização anterior publicou o snapshot mas não concluiu os estados
+        _atualizar_estados(ler_existente(publicados.csv), publicados.snapshot)
+    meta = dict(meta_anterior, novos_registros=0)
+    return {"meta": meta, "estatisticas": estatisticas, "csv": str(destino), "inalterado": True}
+
+
+def atualizar_resultados(
+    url: str = URL,
+    destino: Path = DESTINO_PADRAO,
+    gerar_visoes: bool = True,
+    forcar: bool = False,
+) -> Dict[str, object]:
+    """
+    Executa o fluxo completo (download → limpeza → persistência + visões).
+
+    O download é condicional (ETag/Last-Modified/SHA-256 do anterior): sem
+    mudança na planilha nada é reprocessado. Com concursos novos, o CSV, a
+    visão long e as estatísticas recebem apenas as linhas novas. Cada
+    atualização é gravada em um novo snapshot publicado atomicamente.
+    """
+
+    publicados = caminhos_publicados(destino)
+    meta_anterior = ler_json(publicados.meta)
+    incremental = not forcar and _meta_incremental(meta_anterior, destino, publicados.csv)
+
+    download = baixar_planilha(url, meta_anterior.get("origem") if incremental else None)
+    if download.inalterado:
+        return _sem_alteracao(publicados, meta_anterior, destino)
+
+    dados = preparar_resultados(ler_planilha(download.conteudo))
+
+    def gravar(caminhos: Caminhos):
+        completo = not incremental
+        if incremental:
+            ultimo = int(meta_anterior["ultimo_concurso"])
+            novos_df = dados[dados["Concurso"] > ultimo].sort_values("Concurso")
+            novos = len(novos_df)
+            completo = bool(novos) and not anexar_resultados(novos_df, caminhos.csv)
+
+        if not completo:
+            estados = dados
+            estatisticas = _aplicar_novos(novos_df, ultimo, caminhos, gerar_visoes)
+        else:
+            existente = ler_existente(caminhos.csv)
+            combinado, novos = combinar_datasets(dados, existente)
+            salvar_resultados(combinado, caminhos.csv)
+            estados = combinado
+
+            estatisticas = calcular_estatisticas(combinado)
+            if gerar_visoes:
+                gerar_concursos_long(combinado, caminhos.long)
+                salvar_estatisticas(estatisticas, caminhos.stats)
+
+        meta = _gravar_meta(estatisticas, novos, destino, download.origem(), caminhos)
+        return meta, estatisticas, estados
+
+    meta, estatisticas = _publicar(publicados, destino, gravar)
+    return {"meta": meta, "estatisticas": estatisticas, "csv": str(destino), "inalterado": False}
+
+
+def preencher_lacunas(
+    destino: Path = DESTINO_PADRAO,
+    gerar_visoes: bool = True,
+    transporte=None,
+    simultaneos: Optional[int] = None,
+    url_concurso: Optional[str] = None,
+    url_ultimo: Optional[str] = None,
+) -> Dict[str, object]:
+    """
+    Busca na API apenas os concursos que faltam após o último do meta.
+
+    Sem histórico local (ou meta de outro destino) executa o fluxo completo
+    do atualizar_resultados. Colunas que a API não fornece ficam vazias nas
+    linhas acrescentadas. `transporte` e as URLs permitem apontar a busca
+    para um servidor local.
+    """
+
+    from dados import api_concursos
+
+    publicados = caminhos_publicados(destino)
+    meta_anterior = ler_json(publicados.meta)
+    if not _meta_incremental(meta_anterior, destino, publicados.csv):
+        return atualizar_resultados(destino=destino, gerar_visoes=gerar_visoes)
+
+    ultimo = int(meta_anterior["ultimo_concurso"])
+    novos_df = api_concursos.baixar_faltantes(
+        ultimo,
+        transporte,
+        simultaneos=simultaneos or api_concursos.SIMULTANEOS,
+        url_concurso=url_concurso or api_concursos.URL_CONCURSO,
+        url_ultimo=url_ultimo or api_concursos.URL_ULTIMO,
+    )
+    if novos_df.empty:
+        return _sem_alteracao(publicados, meta_anterior, destino)
+
+    cabecalho = list(pd.read_csv(publicados.csv, sep=";", encoding="utf8", nrows=0).columns)
+    novos_df = novos_df.reindex(columns=cabecalho)
+
+    def gravar(caminhos: Caminhos):
+        anexar_resultados(novos_df, caminhos.csv)
+
+        # Os estados persistidos só recebem os concursos novos; sem eles, o histórico inteiro
+        estados = novos_df if _estados_persistidos() else ler_existente(caminhos.csv)
+        estatisticas = _aplicar_novos(novos_df, ultimo, caminhos, gerar_visoes)
+
+        meta = _gravar_meta(estatisticas, len(novos_df), destino, meta_anterior.get("origem"), caminhos)
+        return meta, estatisticas, estados
+
+    meta, estatisticas = _publicar(publicados, destino, gravar)
+    return {"meta": meta, "estatisticas": estatisticas, "csv": str(destino), "inalterado": False}
 
 
 def obter_resumo_ultimo_concurso(dados: pd.DataFrame) -> Dict[str, Optional[str]]:
@@ -201,7 +624,19 @@ def obter_resumo_ultimo_concurso(dados: pd.DataFrame) -> Dict[str, Optional[str]
 def main() -> None:
     """Função utilitária que roda o ETL completo."""
 
-    resultado = atualizar_resultados()
+    parser = argparse.ArgumentParser(description="Atualiza o histórico de concursos da Lotofácil.")
+    parser.add_argument(
+        "--lacunas",
+        action="store_true",
+        help="Busca na API apenas os concursos posteriores ao último salvo.",
+    )
+    parser.add_argument("--forcar", action="store_true", help="Reprocessa a planilha completa.")
+    opcoes = parser.parse_args()
+
+    if opcoes.lacunas:
+        resultado = preencher_lacunas()
+    else:
+        resultado = atualizar_resultados(forcar=opcoes.forcar)
     meta = resultado["meta"]
 
     print("\n\033[1;32mRESULTADOS ATUALIZADOS COM SUCESSO!\033[m")
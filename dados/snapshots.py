@@ -0,0 +1,229 @@
+"""
+Diretórios versionados (snapshots) com os arquivos publicados pelo ETL.
+
+Cada atualização grava em um diretório novo e só então troca o ponteiro
+CURRENT com os.replace. Arquivos de um snapshot publicado nunca são
+alterados: leitores que fixaram um snapshot leem (ou mapeiam em memória)
+sempre o mesmo conteúdo, sem travas. A fixação grava um arquivo no
+diretório do snapshot, que a limpeza respeita enquanto ele existir.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DIR_SNAPSHOTS = Path("./base/snapshots")
+ARQ_ATUAL = "CURRENT"
+SUFIXO_ETAPA = ".tmp"
+# Subdiretório com um arquivo por leitor que fixou o snapshot
+DIR_FIXACOES = ".fixacoes"
+
+# Snapshots antigos mantidos além do atual (leitores ainda podem estar com eles fixados)
+MANTER = 3
+# Idade (s) a partir da qual uma etapa não publicada é considerada abandonada
+ETAPA_ABANDONADA = 3600
+# Idade (s) a partir da qual uma fixação é ignorada (processo encerrado sem liberá-la)
+FIXACAO_EXPIRADA = 3600
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Snapshot publicado: o id serve de chave de cache para os leitores."""
+
+    id: str
+    diretorio: Path
+
+    def caminho(self, nome: str) -> Path:
+        return self.diretorio / nome
+
+
+def _novo_id() -> str:
+    # Ordenável pelo tempo; o pid evita colisão entre processos no mesmo instante
+    return f"{time.time_ns():020d}-{os.getpid()}"
+
+
+def ler_atual(raiz: Path = DIR_SNAPSHOTS) -> Optional[Snapshot]:
+    """Snapshot apontado pelo CURRENT (None se ainda não houver publicação)."""
+
+    try:
+        identificador = (raiz / ARQ_ATUAL).read_text(encoding="utf8").strip()
+    except FileNotFoundError:
+        return None
+    diretorio = raiz / identificador
+    return Snapshot(identificador, diretorio) if diretorio.is_dir() else None
+
+
+def _criar_fixacao(snapshot: Snapshot) -> Optional[Path]:
+    # Sem parents=True: se o snapshot já foi removido, a fixação falha
+    try:
+        diretorio = snapshot.caminho(DIR_FIXACOES)
+        diretorio.mkdir(exist_ok=True)
+        fixacao = diretorio / f"{os.getpid()}-{uuid.uuid4().hex}"
+        fixacao.touch(exist_ok=False)
+    except FileNotFoundError:
+        return None
+    return fixacao
+
+
+def marca_atual(raiz: Path = DIR_SNAPSHOTS) -> Optional[Tuple[int, int, int]]:
+    """
+    Identifica o CURRENT com um único stat (inode, mtime_ns, tamanho).
+
+    Cada publicação troca o CURRENT por um arquivo novo com os.replace, então
+    a marca muda a cada snapshot; serve para caches que não querem ler o arquivo.
+    """
+
+    try:
+        informacoes = os.stat(raiz / ARQ_ATUAL)
+    except FileNotFoundError:
+        return None
+    return informacoes.st_ino, informacoes.st_mtime_ns, informacoes.st_size
+
+
+@contextmanager
+def fixar(raiz: Path = DIR_SNAPSHOTS) -> Iterator[Optional[Snapshot]]:
+    """
+    Fixa o snapshot atual durante o bloco (ex.: uma requisição).
+
+    Publicações feitas durante o bloco não afetam o snapshot fixado, e a
+    limpeza não o remove enquanto a fixação existir (até FIXACAO_EXPIRADA).
+    """
+
+    while True:
+        atual = ler_atual(raiz)
+        if atual is None:
+            yield None
+            return
+
+        fixacao = _criar_fixacao(atual)
+        if fixacao is None:
+            continue
+        # O CURRENT nunca volta a um snapshot antigo: se ele ainda aponta para
+        # este, nenhuma limpeza anterior à fixação o escolheu para remoção
+        novo = ler_atual(raiz)
+        if novo is not None and novo.id == atual.id:
+            break
+        fixacao.unlink(missing_ok=True)
+
+    try:
+        yield atual
+    finally:
+        fixacao.unlink(missing_ok=True)
+
+
+def fixado(snapshot: Snapshot) -> bool:
+    """Indica se algum leitor fixou o snapshot (fixações expiradas são ignoradas)."""
+
+    limite = time.time() - FIXACAO_EXPIRADA
+    try:
+        fixacoes = list(snapshot.caminho(DIR_FIXACOES).iterdir())
+    except FileNotFoundError:
+        return False
+    for fixacao in fixacoes:
+        try:
+            if fixacao.stat().st_mtime >= limite:
+                return True
+        except FileNotFoundError:
+            continue
+    return False
+
+
+def preparar_etapa(arquivos: Iterable[Path], raiz: Path = DIR_SNAPSHOTS) -> Path:
+    """
+    Cria o diretório de uma nova versão com cópias dos arquivos informados.
+
+    Os arquivos vêm do snapshot atual ou, na primeira publicação, dos
+    caminhos informados; o ETL então acrescenta/substitui o que mudou na cópia.
+    """
+
+    atual = ler_atual(raiz)
+    etapa = raiz / (_novo_id() + SUFIXO_ETAPA)
+    etapa.mkdir(parents=True)
+    for arquivo in arquivos:
+        origem = atual.caminho(arquivo.name) if atual is not None else arquivo
+        if origem.exists():
+            shutil.copyfile(origem, etapa / arquivo.name)
+    return etapa
+
+
+def descartar_etapa(etapa: Path) -> None:
+    shutil.rmtree(etapa, ignore_errors=True)
+
+
+def publicar(etapa: Path, raiz: Path = DIR_SNAPSHOTS) -> Snapshot:
+    """Renomeia a etapa para seu id definitivo e troca o CURRENT atomicamente."""
+
+    identificador = etapa.name[: -len(SUFIXO_ETAPA)]
+    destino = raiz / identificador
+    os.replace(etapa, destino)
+
+    temporario = raiz / (ARQ_ATUAL + SUFIXO_ETAPA + f".{os.getpid()}")
+    with open(temporario, "w", encoding="utf8") as arquivo:
+        arquivo.write(identificador)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, raiz / ARQ_ATUAL)
+
+    limpar(raiz)
+    return Snapshot(identificador, destino)
+
+
+def listar(raiz: Path = DIR_SNAPSHOTS) -> List[str]:
+    """Ids dos snapshots publicados, do mais antigo ao mais recente."""
+
+    if not raiz.is_dir():
+        return []
+    return sorted(
+        entrada.name
+        for entrada in raiz.iterdir()
+        if entrada.is_dir() and not entrada.name.endswith(SUFIXO_ETAPA)
+    )
+
+
+def limpar(raiz: Path = DIR_SNAPSHOTS, manter: int = MANTER) -> None:
+    """
+    Remove snapshots além dos `manter` mais recentes e etapas abandonadas.
+
+    Snapshots fixados por algum leitor são mantidos até a fixação ser liberada.
+    """
+
+    atual = ler_atual(raiz)
+    antigos = [ident for ident in listar(raiz) if atual is None or ident != atual.id]
+    for identificador in antigos[: max(len(antigos) - manter, 0)]:
+        snapshot = Snapshot(identificador, raiz / identificador)
+        if not fixado(snapshot):
+            shutil.rmtree(snapshot.diretorio, ignore_errors=True)
+
+    limite = time.time() - ETAPA_ABANDONADA
+    for entrada in raiz.glob("*" + SUFIXO_ETAPA):
+        if entrada.is_dir() and entrada.stat().st_mtime < limite:
+            shutil.rmtree(entrada, ignore_errors=True)
+
+
+def espelhar(snapshot: Snapshot, destinos: Iterable[Path]) -> None:
+    """
+    Atualiza os caminhos legados (./base/*.csv) para o conteúdo do snapshot.
+
+    Usa hardlink + os.replace (sem cópia) quando possível; cada arquivo é
+    trocado atomicamente, então leitores antigos nunca veem arquivos parciais.
+    """
+
+    for destino in destinos:
+        origem = snapshot.caminho(destino.name)
+        if not origem.exists():
+            continue
+        temporario = destino.with_name(destino.name + SUFIXO_ETAPA)
+        if temporario.exists():
+            temporario.unlink()
+        try:
+            os.link(origem, temporario)
+        except OSError:
+            shutil.copyfile(origem, temporario)
+        os.replace(temporario, destino)
@@ -193,6 +193,9 @@ def render_fechamento_ia_tab():
     probabilidade_min = col2.slider("Probabilidade mínima (%)", 90.0, 99.9, 99.0, step=0.1)
     max_retreinos = col3.number_input("Limite de treinos (max_retreinos)", min_value=1, value=20, step=1)
     top_jogos = st.number_input("Manter top N jogos após score", min_value=10, value=100)
+    processos_treino = st.number_input(
+        "Processos de treino em paralelo (1 = sequencial)", min_value=1, value=1, step=1
+    )
 
     status_box = st.empty()
 
@@ -207,6 +210,7 @@ def render_fechamento_ia_tab():
                 probabilidade_min=probabilidade_min,
                 max_retreinos=int(max_retreinos),
                 progresso=atualizar_status,
+                processos_treino=int(processos_treino),
             )
         except RuntimeError as exc:
             st.error(str(exc))
@@ -222,6 +226,10 @@ def render_fechamento_ia_tab():
                 "Os números abaixo correspondem ao melhor resultado disponível."
             )
         st.write(f"Probabilidade do jogo base: {universo.probabilidade_jogo:.2f}%")
+        st.caption(
+            f"{universo.iteracoes} tentativas em {universo.duracao_busca:.1f}s "
+            f"({universo.iteracoes_por_segundo:,.0f} tentativas/s)."
+        )
         st.code(" ".join(str(d).zfill(2) for d in universo.dezenas), language="text")
 
         jogos = aplicar_fechamento(universo.dezenas, modelo.id_modelo)
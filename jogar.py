@@ -1,31 +1,29 @@
-from processamento.reajustar_dados import remover_resultado_concursos
-from processamento.possibilidades import obter_possibilidades
+from processamento.combinatoria import TOTAL_COMBINACOES
+from processamento.sorteados import carregar_sorteados
 from processamento.resultados import resultados_ordenados
 from calculos.pesos import calcular_numero_pesos
-from sorteios.sortear import sortear_numeros
-from modelo.modelo import criar_modelo
+from sorteios.sortear import ajustar_pesos, sortear_numeros
+from sorteios.lote import ConfigBusca, buscar_jogos
+from modelo.inferencia import ModeloNumpy
+from modelo.modelo import obter_modelo
+from modelo.tabela import obter_tabela
 from dados.dados import carregar_dados
-from dados.busca import buscar
+import argparse
 import os
 import csv
+import tempfile
 from pandas import DataFrame
 
-# Carrega a base de dados
-dados = carregar_dados()
-
-# Inicialização das variáveis
-probabilidade = 0.00
-predicao_alvo = 0.00
-sorteados = list()
-procurando = 0
-jogos_alta_probabilidade = []  # Lista para armazenar jogos com alta probabilidade
-
 # probabilidade desejada e limite para salvar em CSV
 prob_alvo = 99.9
 prob_salvar = 99.0  # Probabilidade mínima para salvar em CSV
 
+# Arquivo com os jogos de alta probabilidade
+ARQUIVO_PROBABILIDADES = "./base/probabilidades.csv"
+
+
 # Função para salvar jogos em CSV
-def salvar_jogos_csv(jogos, caminho="./base/probabilidades.csv"):
+def salvar_jogos_csv(jogos, caminho=ARQUIVO_PROBABILIDADES):
     """Salva os jogos de alta probabilidade em um arquivo CSV"""
     modo = 'a' if os.path.exists(caminho) else 'w'
     with open(caminho, modo, newline='') as arquivo:
@@ -34,105 +32,243 @@ def salvar_jogos_csv(jogos, caminho="./base/probabilidades.csv"):
         if modo == 'w':
             escritor.writerow(['Jogo', 'Probabilidade', 'Acurácia'])
         # Escreve os jogos
-        for jogo in jogos:
-            escritor.writerow([jogo['sequencia'], jogo['probabilidade'], jogo['acuracia']])
+        escritor.writerows([jogo['sequencia'], jogo['probabilidade'], jogo['acuracia']] for jogo in jogos)
     print(f"\nJogos de alta probabilidade salvos em {caminho}")
 
-# Obtém os pesos de cada dezena e um dicionários com as dezenas e seus pesos
-peso, numero_pesos = calcular_numero_pesos(dados)
-
-# Obtém o modelo e sua acuracidade
-modelo, pontuacao = criar_modelo(dados)
-
-# Carrega e reajusta os demais dados
-print()
-print(f'\033[1;33m[Carregando e reajustando os demais dados...]\033[m')
-print()
-
-possibilidades = obter_possibilidades()
-resultado_concursos = resultados_ordenados(dados)
-possibilidades_atualizada = remover_resultado_concursos(
-                                                        possibilidades, 
-                                                        resultado_concursos
-                                                        )
-indice_possibilidades = len(possibilidades_atualizada) - 1
-
-if indice_possibilidades < 0:
-    raise ValueError('Nenhuma possibilidade disponível para gerar novos jogos.')
-
-# Variável de verificação se o jogo gerado é aceitável
-jogo_aceito = False
-
-# Replica até que a probabilidade seja igual à probabilidade desejada
-# e o jogo seja aceitável 
-while probabilidade < prob_alvo and not jogo_aceito:
-
-    # Atribui a sequência dos números sorteados
-    sorteados = sortear_numeros(peso, numero_pesos)
-    # Ordena a lista dos números sorteados
-    jogo = sorted([numeros[0] for numeros in sorteados])
-
-    # Cria o dataframe com os números sorteados para realizar a predição
-    y_alvo = DataFrame(sorteados).iloc[:, 0].to_numpy(dtype='int16')
-    y_alvo = y_alvo.reshape(1, 15)
-
-    # Faz a predição da Classe/Alvo e reaproveita o resultado para a probabilidade
-    previsao = modelo.predict(y_alvo)
-    predicao_alvo = float(previsao.reshape(-1)[0])
-    probabilidade = round((predicao_alvo * 100), 1)
-
-    # Verifica se o jogo é possível e se ainda não foi sorteado em algum concurso
-    if probabilidade >= prob_alvo:
-        indice = buscar(
-                        possibilidades_atualizada,
-                        0,
-                        indice_possibilidades,
-                        jogo
-                       )
-        jogo_aceito = indice is not None
-    else:
-        jogo_aceito = False
 
-    # Conta quantas vezes procurou a sequência até atingir a probabilidade desejada
-    procurando += 1
+def argumentos():
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description='Gera jogos da Lotofácil com o modelo treinado.')
+    parser.add_argument('--lote', action='store_true',
+                        help='Busca em lote: predição em bloco, processos trabalhadores e saída em CSV.')
+    parser.add_argument('--retreinar', action='store_true',
+                        help='Treina um novo modelo mesmo se houver um modelo compatível no cache.')
+    parser.add_argument('--acuracia-min', type=float, default=0.0,
+                        help='Acurácia mínima (0 a 1) para reaproveitar um modelo do cache.')
+    parser.add_argument('--vazao', action='store_true',
+                        help='Treina com o modo de vazão (tf.data, lotes maiores), se for preciso treinar.')
+    parser.add_argument('--numpy', action='store_true',
+                        help='Avalia os jogos com o ModeloNumpy (pesos em .npz), sem o TensorFlow na busca.')
+    parser.add_argument('--tabela', action='store_true',
+                        help='Consulta a tabela de pontuações do modelo (gerada na primeira execução) '
+                             'em vez de sortear candidatos.')
+    parser.add_argument('--jogos', type=int, default=1, help='Quantidade de jogos a encontrar (modo lote).')
+    parser.add_argument('--processos', type=int, default=1, help='Processos trabalhadores (modo lote).')
+    parser.add_argument('--tamanho-lote', type=int, default=4096, help='Candidatos avaliados por bloco.')
+    parser.add_argument('--progresso', type=float, default=5.0, metavar='SEG',
+                        help='Intervalo em segundos entre os avisos de progresso (0 desativa).')
+    parser.add_argument('--silencioso', action='store_true', help='Não exibe o progresso (modo lote).')
+    parser.add_argument('--saida', default=ARQUIVO_PROBABILIDADES, help='Arquivo CSV com os jogos encontrados.')
+    parser.add_argument('--prob-alvo', type=float, default=prob_alvo, help='Probabilidade desejada.')
+    parser.add_argument('--prob-salvar', type=float, default=prob_salvar, help='Probabilidade mínima para salvar.')
+    parser.add_argument('--semente', type=int, default=None, help='Semente do sorteio (modo lote).')
+    parser.add_argument('--max-iteracoes', type=int, default=None, help='Limite de candidatos avaliados.')
+    return parser.parse_args()
+
+
+def jogar_interativo(modelo, pontuacao, peso, numero_pesos, jogos_sorteados, opcoes):
+    """Busca um jogo por vez, imprimindo cada tentativa"""
+
+    # Inicialização das variáveis
+    probabilidade = 0.00
+    predicao_alvo = 0.00
+    sorteados = list()
+    procurando = 0
+    jogos_alta_probabilidade = []  # Lista para armazenar jogos com alta probabilidade
+
+    # Variável de verificação se o jogo gerado é aceitável
+    jogo_aceito = False
+
+    # Replica até que a probabilidade seja igual à probabilidade desejada
+    # e o jogo seja aceitável
+    while probabilidade < opcoes.prob_alvo and not jogo_aceito:
+
+        # Atribui a sequência dos números sorteados
+        sorteados = sortear_numeros(peso, numero_pesos)
+        # Ordena a lista dos números sorteados
+        jogo = sorted([numeros[0] for numeros in sorteados])
+
+        # Cria o dataframe com os números sorteados para realizar a predição
+        y_alvo = DataFrame(sorteados).iloc[:, 0].to_numpy(dtype='int16')
+        y_alvo = y_alvo.reshape(1, 15)
+
+        # Faz a predição da Classe/Alvo e reaproveita o resultado para a probabilidade
+        previsao = modelo.predict(y_alvo)
+        predicao_alvo = float(previsao.reshape(-1)[0])
+        probabilidade = round((predicao_alvo * 100), 1)
+
+        # Verifica se o jogo é possível e se ainda não foi sorteado em algum concurso
+        if probabilidade >= opcoes.prob_alvo:
+            jogo_aceito = jogos_sorteados.verificar(jogo)
+        else:
+            jogo_aceito = False
+
+        # Conta quantas vezes procurou a sequência até atingir a probabilidade desejada
+        procurando += 1
+
+        # Formata a sequência de números sorteados para ser imprimida na tela
+        sequencia = [str(numero[0]).zfill(2) for numero in sorteados]
+
+        # Imprime as informações obtidas no ciclo atual de execução enquanto a probabilidade desejada não foi encontrada
+        print(f'Alvo = ({opcoes.prob_alvo}%) - ACURAC.: {round((pontuacao * 100), 1)}% - Rep.: {str(procurando).zfill(7)}'
+              f' - Prob. Enc.: ({str(probabilidade).zfill(2)}%) Sequência: [ ', end='')
+
+        print(*sequencia, ']')
+
+        # Verificar se o jogo tem alta probabilidade para salvar
+        if probabilidade >= opcoes.prob_salvar:
+            # Formatar o jogo como string para salvar
+            jogo_str = ' '.join(sequencia)
+            # Adicionar à lista de jogos de alta probabilidade
+            jogos_alta_probabilidade.append({
+                'sequencia': jogo_str,
+                'probabilidade': probabilidade,
+                'acuracia': round((pontuacao * 100), 1)
+            })
+            print(f"\033[1;32m[Jogo com {probabilidade}% de probabilidade adicionado à lista]\033[m")
+
+        # Se o jogo não é aceitável, zera a probabilidade para gerar novo jogo
+        if not jogo_aceito:
+            probabilidade = 0.0
+
+    # Após o loop, salvar os jogos de alta probabilidade (se houver)
+    if jogos_alta_probabilidade:
+        salvar_jogos_csv(jogos_alta_probabilidade, opcoes.saida)
+
+    # Resultados
+    print(f'\nAcuracidade do Modelo: {round((pontuacao * 100), 1)}%')
+
+    print('\n0 = Não tem chance de ganhar | 1 = Tem chance de ganhar')
+    print(f'Resultado: (Previsão Modelo) = {predicao_alvo}')
 
-    # Formata a sequência de números sorteados para ser imprimida na tela
-    sequencia = [str(numero[0]).zfill(2) for numero in sorteados]
+    print(f'\nProbabilidade das dezenas sairem: {probabilidade}%')
 
-    # Imprime as informações obtidas no ciclo atual de execução enquanto a probabilidade desejada não foi encontrada
-    print(f'Alvo = ({prob_alvo}%) - ACURAC.: {round((pontuacao * 100), 1)}% - Rep.: {str(procurando).zfill(7)}'
-          f' - Prob. Enc.: ({str(probabilidade).zfill(2)}%) Sequência: [ ', end='')
+    # Números sorteados (em ordem de sorteio e em ordem crescente)
+    print(f'\nNúmeros sorteados:  {[numeros[0] for numeros in sorteados]}')
+    print(f'\nNúmeros ordenados:  {jogo}')
 
-    print(*sequencia, ']')
 
-    # Verificar se o jogo tem alta probabilidade para salvar
-    if probabilidade >= prob_salvar:
-        # Formatar o jogo como string para salvar
-        jogo_str = ' '.join(sequencia)
-        # Adicionar à lista de jogos de alta probabilidade
-        jogos_alta_probabilidade.append({
-            'sequencia': jogo_str,
-            'probabilidade': probabilidade,
-            'acuracia': round((pontuacao * 100), 1)
-        })
-        print(f"\033[1;32m[Jogo com {probabilidade}% de probabilidade adicionado à lista]\033[m")
+def jogar_lote(modelo, pontuacao, peso, numero_pesos, jogos_sorteados, opcoes):
+    """Busca vários jogos em blocos, sem imprimir cada tentativa"""
 
-    # Se o jogo não é aceitável, zera a probabilidade para gerar novo jogo
-    if not jogo_aceito:
-        probabilidade = 0.0
+    # O sorteio em lote usa os pesos já ajustados pelo dicionário de dezenas
+    pesos = ajustar_pesos(peso, numero_pesos)
 
-# Após o loop, salvar os jogos de alta probabilidade (se houver)
-if jogos_alta_probabilidade:
-    salvar_jogos_csv(jogos_alta_probabilidade)
+    config = ConfigBusca(
+        alvo_jogos=opcoes.jogos,
+        prob_alvo=opcoes.prob_alvo,
+        prob_salvar=opcoes.prob_salvar,
+        tamanho_lote=opcoes.tamanho_lote,
+        processos=opcoes.processos,
+        max_iteracoes=opcoes.max_iteracoes,
+        semente=opcoes.semente,
+    )
 
-# Resultados
-print(f'\nAcuracidade do Modelo: {round((pontuacao * 100), 1)}%')
+    def progresso(parcial):
+        print(f'Rep.: {str(parcial.iteracoes).zfill(9)} - {parcial.iteracoes_por_segundo:,.0f} it/s'
+              f' - Encontrados: {len(parcial.aceitos)}/{config.alvo_jogos}'
+              f' - Acima de {config.prob_salvar}%: {len(parcial.alta_probabilidade)}')
 
-print('\n0 = Não tem chance de ganhar | 1 = Tem chance de ganhar')
-print(f'Resultado: (Previsão Modelo) = {predicao_alvo}')
+    intervalo = 0 if opcoes.silencioso else opcoes.progresso
+
+    # Cópia do modelo enviada aos processos trabalhadores
+    arquivo_modelo = 'modelo.npz' if isinstance(modelo, ModeloNumpy) else 'modelo.keras'
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultado = buscar_jogos(
+            modelo,
+            pontuacao,
+            pesos,
+            jogos_sorteados,
+            config,
+            progresso=progresso,
+            intervalo_progresso=intervalo,
+            caminho_modelo=os.path.join(diretorio, arquivo_modelo),
+        )
+
+    if resultado.alta_probabilidade:
+        salvar_jogos_csv(resultado.alta_probabilidade, opcoes.saida)
+
+    print(f'\nAcuracidade do Modelo: {round((pontuacao * 100), 1)}%')
+    print(f'Candidatos avaliados: {resultado.iteracoes} em {resultado.duracao:.1f}s'
+          f' ({resultado.iteracoes_por_segundo:,.0f} it/s)')
+
+    print(f'\nJogos encontrados ({len(resultado.aceitos)}/{config.alvo_jogos}):')
+    for jogo in resultado.aceitos:
+        print(f"[ {jogo['sequencia']} ] - Prob.: {jogo['probabilidade']}%")
+
+
+def jogar_tabela(modelo, pontuacao, jogos_sorteados, opcoes):
+    """Lê os jogos direto da tabela de pontuações de todas as combinações"""
+
+    print(f'\033[1;33m[Carregando a tabela de pontuações do modelo...]\033[m')
+    tabela = obter_tabela(modelo)
+    acuracia = round((pontuacao * 100), 1)
+
+    # Distribuição das probabilidades alcançáveis pelo modelo
+    print(f'\nModelo {tabela.impressao} - combinações por faixa de probabilidade:')
+    for faixa, quantidade in tabela.distribuicao().items():
+        if quantidade and faixa >= 90:
+            print(f'{faixa:>3}% a {faixa + 1:>3}%: {quantidade}')
+
+    indices = tabela.consultar(opcoes.prob_alvo, jogos_sorteados, limite=opcoes.jogos)
+    probabilidades = tabela.probabilidades()[indices]
+    jogos = [
+        {
+            'sequencia': ' '.join(str(numero).zfill(2) for numero in jogo),
+            'probabilidade': float(probabilidade),
+            'acuracia': acuracia
+        }
+        for jogo, probabilidade in zip(tabela.jogos(indices), probabilidades)
+    ]
+
+    if jogos:
+        salvar_jogos_csv(jogos, opcoes.saida)
+
+    print(f'\nAcuracidade do Modelo: {acuracia}%')
+    print(f'\nJogos encontrados ({len(jogos)}/{opcoes.jogos}):')
+    for jogo in jogos:
+        print(f"[ {jogo['sequencia']} ] - Prob.: {jogo['probabilidade']}%")
+
+
+def main():
+    opcoes = argumentos()
+
+    # Carrega a base de dados
+    dados = carregar_dados()
+
+    # Obtém os pesos de cada dezena e um dicionários com as dezenas e seus pesos
+    peso, numero_pesos = calcular_numero_pesos(dados)
+
+    # Obtém o modelo (do cache, se houver um treinado com os mesmos dados) e sua acuracidade
+    modelo, pontuacao = obter_modelo(
+        dados,
+        acuracia_min=opcoes.acuracia_min,
+        usar_cache=not opcoes.retreinar,
+        numpy=opcoes.numpy,
+        vazao=opcoes.vazao
+    )
+
+    # Carrega e reajusta os demais dados
+    print()
+    print(f'\033[1;33m[Carregando e reajustando os demais dados...]\033[m')
+    print()
+
+    resultado_concursos = resultados_ordenados(dados)
+    # Bitset persistido dos jogos já sorteados, completado com a base carregada
+    jogos_sorteados = carregar_sorteados()
+    jogos_sorteados.adicionar(resultado_concursos)
+
+    if jogos_sorteados.quantidade >= TOTAL_COMBINACOES:
+        raise ValueError('Nenhuma possibilidade disponível para gerar novos jogos.')
+
+    if opcoes.tabela:
+        jogar_tabela(modelo, pontuacao, jogos_sorteados, opcoes)
+    elif opcoes.lote:
+        jogar_lote(modelo, pontuacao, peso, numero_pesos, jogos_sorteados, opcoes)
+    else:
+        jogar_interativo(modelo, pontuacao, peso, numero_pesos, jogos_sorteados, opcoes)
 
-print(f'\nProbabilidade das dezenas sairem: {probabilidade}%')
 
-# Números sorteados (em ordem de sorteio e em ordem crescente)
-print(f'\nNúmeros sorteados:  {[numeros[0] for numeros in sorteados]}')
-print(f'\nNúmeros ordenados:  {jogo}')
+if __name__ == '__main__':
+    main()
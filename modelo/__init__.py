@@ -1,3 +1,3 @@
-from . import modelo
+from . import inferencia, modelo, paralelo, tabela, vazao
 
-__all__ = ['modelo']
+__all__ = ['inferencia', 'modelo', 'paralelo', 'tabela', 'vazao']
@@ -0,0 +1,165 @@
+import json
+
+import numpy as np
+
+from processamento.combinatoria import TOTAL_COMBINACOES, desranquear_lote
+
+# Quantidade de jogos avaliados por vez quando batch_size não é informado
+BLOCO = 65536
+
+# Diferença máxima aceita entre as saídas do Keras e do NumPy
+TOLERANCIA = 1e-5
+
+
+def _sigmoide(valores):
+    # exp(-x) estoura para x muito negativo; o resultado (0) continua correto
+    with np.errstate(over='ignore'):
+        return 1 / (1 + np.exp(-valores))
+
+
+ATIVACOES = {
+    'linear': lambda valores: valores,
+    'relu': lambda valores: np.maximum(valores, 0, out=valores),
+    'sigmoid': _sigmoide,
+    'tanh': np.tanh,
+}
+
+
+class ModeloNumpy:
+    """
+    Propagação da rede densa legada (criar_modelo) somente com NumPy.
+
+    Aceita as mesmas chamadas de predict do Keras, sem carregar o TensorFlow.
+    """
+
+    def __init__(self, pesos, vieses, ativacoes):
+        for ativacao in ativacoes:
+            if ativacao not in ATIVACOES:
+                raise ValueError(f'Função de ativação não suportada: {ativacao}')
+
+        self.pesos = [np.asarray(peso, dtype=np.float32) for peso in pesos]
+        self.vieses = [np.asarray(vies, dtype=np.float32) for vies in vieses]
+        self.ativacoes = list(ativacoes)
+
+    @classmethod
+    def de_keras(cls, modelo):
+        """
+        Copia os pesos e as ativações das camadas Dense de um modelo Keras.
+        """
+        pesos, vieses, ativacoes = [], [], []
+        for camada in modelo.layers:
+            peso, vies = camada.get_weights()
+            pesos.append(peso)
+            vieses.append(vies)
+            ativacoes.append(camada.get_config()['activation'])
+        return cls(pesos, vieses, ativacoes)
+
+    @classmethod
+    def carregar(cls, arquivo):
+        """
+        Lê os pesos exportados por salvar.
+        """
+        with np.load(arquivo) as dados:
+            ativacoes = json.loads(str(dados['ativacoes']))
+            pesos = [dados[f'peso_{camada}'] for camada in range(len(ativacoes))]
+            vieses = [dados[f'vies_{camada}'] for camada in range(len(ativacoes))]
+        return cls(pesos, vieses, ativacoes)
+
+    def salvar(self, arquivo):
+        """
+        Grava os pesos, os vieses e as ativações em um arquivo .npz.
+        """
+        camadas = {}
+        for camada, (peso, vies) in enumerate(zip(self.pesos, self.vieses)):
+            camadas[f'peso_{camada}'] = peso
+            camadas[f'vies_{camada}'] = vies
+
+        # Grava pelo objeto de arquivo para o NumPy não acrescentar a extensão
+        with open(arquivo, 'wb') as destino:
+            np.savez(destino, ativacoes=np.array(json.dumps(self.ativacoes)), **camadas)
+
+    # Mesmo nome do Keras, usado pela busca em lote para enviar o modelo aos processos
+    save = salvar
+
+    def get_weights(self):
+        """
+        Retorna os pesos na mesma ordem do Keras (peso e viés de cada camada).
+        """
+        return [valor for camada in zip(self.pesos, self.vieses) for valor in camada]
+
+    def predict(self, x, batch_size=None, verbose=0):
+        """
+        Calcula a saída da rede para as linhas de x.
+
+        :param x: array (quantidade, 15) com as dezenas.
+        :param batch_size: linhas avaliadas por vez (default: {BLOCO}).
+        :param verbose: ignorado, mantido por compatibilidade com o Keras.
+
+        :return: array float32 (quantidade, saídas).
+        """
+
+        x = np.asarray(x, dtype=np.float32)
+        bloco = batch_size or BLOCO
+        saida = np.empty((len(x), self.pesos[-1].shape[1]), dtype=np.float32)
+
+        for inicio in range(0, len(x), bloco):
+            valores = x[inicio:inicio + bloco]
+            for peso, vies, ativacao in zip(self.pesos, self.vieses, self.ativacoes):
+                valores = ATIVACOES[ativacao](valores @ peso + vies)
+            saida[inicio:inicio + bloco] = valores
+
+        return saida
+
+    def __call__(self, x):
+        return self.predict(x)
+
+
+def exportar_pesos(modelo, arquivo, verificar=True):
+    """
+    Exporta os pesos de um modelo Keras para o formato .npz do ModeloNumpy.
+
+    :param modelo: modelo Keras treinado (criar_modelo).
+    :param arquivo: arquivo .npz de destino.
+    :param verificar: confere a paridade entre Keras e NumPy antes de gravar.
+
+    :return: o ModeloNumpy exportado.
+    """
+
+    modelo_numpy = ModeloNumpy.de_keras(modelo)
+    if verificar:
+        verificar_paridade(modelo, modelo_numpy)
+    modelo_numpy.salvar(arquivo)
+
+    return modelo_numpy
+
+
+def verificar_paridade(modelo, modelo_numpy=None, amostras=4096, tolerancia=TOLERANCIA, semente=0):
+    """
+    Compara as saídas do Keras e do ModeloNumpy em jogos sorteados.
+
+    :param modelo: modelo Keras treinado.
+    :param modelo_numpy: ModeloNumpy a conferir (default: criado a partir do modelo).
+    :param amostras: quantidade de jogos avaliados.
+    :param tolerancia: diferença absoluta máxima aceita.
+    :param semente: semente do sorteio dos jogos.
+
+    :return: a maior diferença absoluta encontrada.
+    """
+
+    if modelo_numpy is None:
+        modelo_numpy = ModeloNumpy.de_keras(modelo)
+
+    rng = np.random.default_rng(semente)
+    jogos = desranquear_lote(rng.integers(TOTAL_COMBINACOES, size=amostras)).astype('int16')
+
+    # Inclui jogos fora da ordem crescente, como os da busca por sorteio
+    jogos[::2] = rng.permuted(jogos[::2], axis=1)
+
+    esperado = np.asarray(modelo.predict(jogos, batch_size=amostras, verbose=0), dtype=np.float32)
+    obtido = modelo_numpy.predict(jogos)
+    diferenca = float(np.max(np.abs(esperado - obtido)))
+
+    if diferenca > tolerancia:
+        raise ValueError(f'Saídas do NumPy divergem do Keras (diferença máxima {diferenca:.2e}).')
+
+    return diferenca
@@ -1,11 +1,23 @@
+from datetime import datetime
+from hashlib import sha256
+from os import makedirs, path, replace, scandir
+from secrets import randbelow
+from shutil import rmtree
 from typing import Any
+import json
 
-from dados.dados import dividir_dados
-import keras
-from keras import layers, models, callbacks
+from dados.colunar import hash_arquivo
+from dados.dados import CAMINHO, dividir_dados
+from modelo.inferencia import ModeloNumpy, exportar_pesos
 
 SILENT: Any = 0
 
+# Modelos treinados: um diretório por chave (dados + hiperparâmetros + semente)
+DIR_CACHE = './models/legado/treinados'
+ARQ_MODELO = 'modelo.keras'
+ARQ_PESOS = 'modelo.npz'
+ARQ_META = 'meta.json'
+
 
 def criar_modelo(
                     base_dados, 
@@ -14,7 +26,8 @@ def criar_modelo(
                     terceira_camada=15,
                     saida=1,
                     periodo=50,
-                    lote=15
+                    lote=15,
+                    semente=None
                 ):
     """
     Cria o modelo sequêncial com três camadas.
@@ -26,9 +39,17 @@ def criar_modelo(
     :param saida: camada de saída utilizando a função de ativação (sigmoid). Default: 1 neurônio.
     :param periodo: quantidade de iterações para ajuste do modelo.
     :param lote: ajuste do número de instâncias.
+    :param semente: semente dos pesos iniciais e do embaralhamento (None - aleatória).
     :return: o modelo gerado.
     """
 
+    # Importado aqui para que quem usa apenas o ModeloNumpy não carregue o TensorFlow
+    import keras
+    from keras import layers, models, callbacks
+
+    if semente is not None:
+        keras.utils.set_random_seed(semente)
+
     x_treino, x_teste, y_treino, y_teste, atributos = dividir_dados(base_dados)
 
     # Criando o modelo
@@ -67,3 +88,187 @@ def criar_modelo(
 
     return modelo, pontuacao[1]
 
+
+
+def hash_dados(arquivo=CAMINHO):
+    """
+    Calcula o SHA-256 do conteúdo da planilha da base de dados.
+
+    :param arquivo: planilha da base de dados (default: {CAMINHO}).
+    :return: o hash em hexadecimal.
+    """
+
+    return hash_arquivo(arquivo)
+
+
+def parametros_modelo(primeira_camada=30, segunda_camada=15, terceira_camada=15, saida=1, periodo=50, lote=15):
+    """
+    Agrupa os hiperparâmetros do criar_modelo que compõem a chave do cache.
+    """
+    return {
+        'primeira_camada': primeira_camada,
+        'segunda_camada': segunda_camada,
+        'terceira_camada': terceira_camada,
+        'saida': saida,
+        'periodo': periodo,
+        'lote': lote,
+    }
+
+
+def chave_modelo(digest_dados, parametros, semente):
+    """
+    Monta a chave do cache a partir dos dados, dos hiperparâmetros e da semente.
+
+    :param digest_dados: hash da planilha (hash_dados).
+    :param parametros: dicionário com as camadas, o período e o lote.
+    :param semente: semente do treinamento.
+    :return: a chave em hexadecimal.
+    """
+
+    conteudo = json.dumps(
+                            {'dados': digest_dados, 'parametros': parametros, 'semente': semente},
+                            sort_keys=True
+                        )
+    return sha256(conteudo.encode()).hexdigest()[:24]
+
+
+def salvar_modelo_cache(modelo, pontuacao, digest_dados, parametros, semente, diretorio=DIR_CACHE):
+    """
+    Grava o modelo treinado e a sua pontuação no cache.
+
+    :param modelo: modelo treinado.
+    :param pontuacao: acurácia do modelo nos dados de teste.
+    :param digest_dados: hash da planilha (hash_dados).
+    :param parametros: dicionário com as camadas, o período e o lote.
+    :param semente: semente do treinamento.
+    :param diretorio: diretório do cache (default: {DIR_CACHE}).
+    :return: o diretório do modelo gravado.
+    """
+
+    destino = path.join(diretorio, chave_modelo(digest_dados, parametros, semente))
+    temporario = destino + '.tmp'
+
+    rmtree(temporario, ignore_errors=True)
+    makedirs(temporario)
+
+    modelo.save(path.join(temporario, ARQ_MODELO))
+    exportar_pesos(modelo, path.join(temporario, ARQ_PESOS))
+    meta = {
+        'dados': digest_dados,
+        'parametros': parametros,
+        'semente': semente,
+        'pontuacao': float(pontuacao),
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(path.join(temporario, ARQ_META), 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, indent=2)
+
+    rmtree(destino, ignore_errors=True)
+    replace(temporario, destino)
+
+    return destino
+
+
+def buscar_modelo_cache(digest_dados, parametros, acuracia_min=0.0, diretorio=DIR_CACHE, numpy=False):
+    """
+    Procura no cache o modelo de maior acurácia treinado com os mesmos dados e hiperparâmetros.
+
+    :param digest_dados: hash da planilha (hash_dados).
+    :param parametros: dicionário com as camadas, o período e o lote.
+    :param acuracia_min: acurácia mínima aceita.
+    :param diretorio: diretório do cache (default: {DIR_CACHE}).
+    :param numpy: True - retorna o ModeloNumpy, sem carregar o TensorFlow.
+    :return: o modelo e sua acurácia, ou None se nenhum modelo atender.
+    """
+
+    if not path.isdir(diretorio):
+        return None
+
+    melhor = None
+    for entrada in scandir(diretorio):
+        arq_meta = path.join(entrada.path, ARQ_META)
+        if not entrada.is_dir() or entrada.name.endswith('.tmp') or not path.exists(arq_meta):
+            continue
+
+        with open(arq_meta, encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+
+        if meta.get('dados') != digest_dados or meta.get('parametros') != parametros:
+            continue
+
+        if meta['pontuacao'] >= acuracia_min and (melhor is None or meta['pontuacao'] > melhor[1]):
+            melhor = (entrada.path, meta['pontuacao'])
+
+    if melhor is None:
+        return None
+
+    if numpy and path.exists(path.join(melhor[0], ARQ_PESOS)):
+        return ModeloNumpy.carregar(path.join(melhor[0], ARQ_PESOS)), melhor[1]
+
+    from keras import models
+
+    modelo = models.load_model(path.join(melhor[0], ARQ_MODELO))
+    if numpy:
+        modelo = exportar_pesos(modelo, path.join(melhor[0], ARQ_PESOS))
+    return modelo, melhor[1]
+
+
+def obter_modelo(
+                    base_dados,
+                    acuracia_min=0.0,
+                    semente=None,
+                    arquivo=CAMINHO,
+                    diretorio=DIR_CACHE,
+                    usar_cache=True,
+                    numpy=False,
+                    vazao=False,
+                    **hiperparametros
+                ):
+    """
+    Retorna um modelo do cache com acurácia >= acuracia_min ou treina e grava um novo.
+
+    A chave do cache é o hash da planilha, as camadas, o período, o lote e a semente.
+
+    :param base_dados: DataFrame da base de dados (carregado de arquivo).
+    :param acuracia_min: acurácia mínima para reaproveitar um modelo do cache.
+    :param semente: semente usada se for preciso treinar (None - sorteada e registrada no cache).
+    :param arquivo: planilha da base de dados (default: {CAMINHO}).
+    :param diretorio: diretório do cache (default: {DIR_CACHE}).
+    :param usar_cache: False - sempre treina (o modelo novo é gravado no cache).
+    :param numpy: True - retorna o ModeloNumpy (modelo.npz) em vez do modelo Keras.
+    :param vazao: True - treina com o criar_modelo_vazao (lote padrão LOTE_VAZAO); entra na chave do cache.
+    :param hiperparametros: camadas, período e lote repassados ao criar_modelo.
+    :return: o modelo e sua acurácia.
+    """
+
+    if vazao:
+        from modelo.vazao import LOTE_VAZAO, criar_modelo_vazao
+
+        hiperparametros.setdefault('lote', LOTE_VAZAO)
+
+    parametros = parametros_modelo(**hiperparametros)
+    if vazao:
+        parametros['vazao'] = True
+    digest_dados = hash_dados(arquivo)
+
+    if usar_cache:
+        encontrado = buscar_modelo_cache(digest_dados, parametros, acuracia_min, diretorio, numpy)
+        if encontrado is not None:
+            print(f"Modelo reaproveitado do cache (acurácia {round(encontrado[1] * 100, 1)}%)")
+            return encontrado
+
+    if semente is None:
+        semente = randbelow(2 ** 31)
+
+    if vazao:
+        camadas = {chave: valor for chave, valor in parametros.items() if chave != 'vazao'}
+        modelo, pontuacao, metricas = criar_modelo_vazao(base_dados, semente=semente, **camadas)
+        print(metricas.resumo())
+    else:
+        modelo, pontuacao = criar_modelo(base_dados, semente=semente, **parametros)
+    salvar_modelo_cache(modelo, pontuacao, digest_dados, parametros, semente, diretorio)
+
+    if numpy:
+        modelo = ModeloNumpy.de_keras(modelo)
+
+    return modelo, pontuacao
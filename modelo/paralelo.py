@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+from os import cpu_count, path
+from secrets import randbelow
+from time import perf_counter
+from typing import Optional
+import multiprocessing
+
+from dados.dados import CAMINHO
+from modelo.modelo import (
+    ARQ_MODELO,
+    DIR_CACHE,
+    criar_modelo,
+    hash_dados,
+    parametros_modelo,
+    salvar_modelo_cache,
+)
+
+# Dados compartilhados por cada processo de treinamento (preenchido pelo inicializador)
+_ESTADO = {}
+
+
+@dataclass
+class RelatorioTreino:
+    """
+    Resultado do treinamento paralelo com várias sementes.
+    """
+
+    acuracia_min: float
+    sementes: list
+    pontuacoes: dict = field(default_factory=dict)
+    vencedora: Optional[int] = None
+    duracao: float = 0.0
+
+    @property
+    def atingiu(self):
+        return self.vencedora is not None and self.pontuacoes[self.vencedora] >= self.acuracia_min
+
+    def resumo(self):
+        linhas = [f'Semente {semente}: {round(pontuacao * 100, 2)}%' for semente, pontuacao in self.pontuacoes.items()]
+        canceladas = len(self.sementes) - len(self.pontuacoes)
+        if canceladas:
+            linhas.append(f'{canceladas} semente(s) cancelada(s)')
+        linhas.append(f'Vencedora: {self.vencedora} em {self.duracao:.1f}s')
+        return '\n'.join(linhas)
+
+
+def _inicializar(base_dados, digest_dados, parametros, diretorio, threads):
+    # Divide os núcleos entre os processos para evitar disputa de threads
+    try:
+        import tensorflow as tf
+
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    _ESTADO.update(
+        base_dados=base_dados,
+        digest_dados=digest_dados,
+        parametros=parametros,
+        diretorio=diretorio,
+    )
+
+
+def _treinar_semente(semente):
+    modelo, pontuacao = criar_modelo(_ESTADO['base_dados'], semente=semente, **_ESTADO['parametros'])
+    destino = salvar_modelo_cache(
+                                    modelo,
+                                    pontuacao,
+                                    _ESTADO['digest_dados'],
+                                    _ESTADO['parametros'],
+                                    semente,
+                                    _ESTADO['diretorio']
+                                )
+    return semente, pontuacao, destino
+
+
+def treinar_paralelo(
+                        base_dados,
+                        acuracia_min,
+                        sementes=None,
+                        tentativas=20,
+                        processos=None,
+                        arquivo=CAMINHO,
+                        diretorio=DIR_CACHE,
+                        progresso=None,
+                        **hiperparametros
+                    ):
+    """
+    Treina modelos com sementes diferentes em processos paralelos até um atingir a acurácia.
+
+    Os processos restantes são encerrados assim que um modelo atinge acuracia_min.
+    Todos os modelos concluídos são gravados no cache de modelos.
+
+    :param base_dados: DataFrame da base de dados.
+    :param acuracia_min: acurácia desejada.
+    :param sementes: lista de sementes (default: {tentativas} sementes sorteadas).
+    :param tentativas: quantidade de sementes quando sementes não é informada.
+    :param processos: quantidade de processos (default: quantidade de núcleos).
+    :param arquivo: planilha da base de dados, usada na chave do cache (default: {CAMINHO}).
+    :param diretorio: diretório do cache (default: {DIR_CACHE}).
+    :param progresso: função chamada com (semente, pontuacao) a cada modelo concluído.
+    :param hiperparametros: camadas, período e lote repassados ao criar_modelo.
+    :return: o melhor modelo, sua acurácia e o RelatorioTreino.
+    """
+
+    from keras import models
+
+    if sementes is None:
+        base = randbelow(2 ** 31 - tentativas)
+        sementes = list(range(base, base + tentativas))
+
+    processos = min(processos or cpu_count() or 1, len(sementes))
+    threads = max(1, (cpu_count() or 1) // processos)
+    parametros = parametros_modelo(**hiperparametros)
+    relatorio = RelatorioTreino(acuracia_min, list(sementes))
+    destinos = {}
+
+    inicio = perf_counter()
+    contexto = multiprocessing.get_context('spawn')
+    with contexto.Pool(
+                        processos,
+                        initializer=_inicializar,
+                        initargs=(base_dados, hash_dados(arquivo), parametros, diretorio, threads)
+                    ) as pool:
+        for semente, pontuacao, destino in pool.imap_unordered(_treinar_semente, sementes):
+            relatorio.pontuacoes[semente] = pontuacao
+            destinos[semente] = destino
+
+            if progresso:
+                progresso(semente, pontuacao)
+
+            if relatorio.vencedora is None or pontuacao > relatorio.pontuacoes[relatorio.vencedora]:
+                relatorio.vencedora = semente
+
+            if pontuacao >= acuracia_min:
+                pool.terminate()
+                break
+
+    relatorio.duracao = perf_counter() - inicio
+
+    modelo = models.load_model(path.join(destinos[relatorio.vencedora], ARQ_MODELO))
+    return modelo, relatorio.pontuacoes[relatorio.vencedora], relatorio
@@ -0,0 +1,216 @@
+from datetime import datetime
+from hashlib import sha256
+from os import makedirs, path, replace, scandir
+from shutil import rmtree
+import json
+
+import numpy as np
+
+from processamento.combinatoria import TOTAL_COMBINACOES, desranquear_lote
+
+# Diretório das tabelas de pontuação do modelo neural legado
+DIR_TABELAS = './models/legado'
+
+# Quantidade de jogos avaliados por chamada ao modelo
+BLOCO = 65536
+
+# Arquivos de cada tabela (um diretório por impressão digital do modelo)
+ARQ_PONTUACOES = 'pontuacoes.npy'
+ARQ_ORDEM = 'ordem.npy'
+ARQ_META = 'tabela.json'
+
+# Quantidade de tabelas mantidas no disco ao gerar uma nova
+MANTER_TABELAS = 3
+
+
+def impressao_digital(modelo):
+    """
+    Calcula a impressão digital do modelo a partir da arquitetura e dos pesos.
+
+    :param modelo: modelo Keras treinado.
+
+    :return: os 16 primeiros caracteres do SHA-256.
+    """
+
+    resumo = sha256()
+    for pesos in modelo.get_weights():
+        pesos = np.ascontiguousarray(pesos, dtype=np.float32)
+        resumo.update(str(pesos.shape).encode())
+        resumo.update(pesos.tobytes())
+
+    return resumo.hexdigest()[:16]
+
+
+class TabelaPontuacoes:
+    """
+    Pontuação do modelo para todas as combinações, indexada pelo ranque lexicográfico.
+    """
+
+    def __init__(self, pontuacoes, ordem, meta):
+        self.pontuacoes = pontuacoes
+        self.ordem = ordem
+        self.meta = meta
+
+    @property
+    def impressao(self):
+        return self.meta['impressao']
+
+    def probabilidades(self, casas=1):
+        """
+        Retorna a probabilidade (%) de cada combinação, arredondada como no jogar.py.
+        """
+        return np.round(self.pontuacoes * 100, casas)
+
+    def consultar(self, prob_min, sorteados=None, limite=None, casas=1):
+        """
+        Consulta as combinações com probabilidade >= prob_min ainda não sorteadas.
+
+        :param prob_min: probabilidade mínima (%).
+        :param sorteados: BitsetSorteados com os jogos já sorteados (opcional).
+        :param limite: quantidade máxima de combinações retornadas.
+        :param casas: casas decimais do arredondamento da probabilidade.
+
+        :return: array com os ranques, da maior para a menor pontuação.
+        """
+
+        quantidade = int(np.count_nonzero(self.probabilidades(casas) >= prob_min))
+        indices = np.asarray(self.ordem[:quantidade], dtype=np.int64)
+
+        if sorteados is not None and indices.size:
+            indices = indices[~sorteados.contem_indices(indices)]
+
+        return indices if limite is None else indices[:limite]
+
+    def jogos(self, indices):
+        """
+        Converte ranques em jogos (dezenas em ordem crescente).
+        """
+        return desranquear_lote(indices)
+
+    def distribuicao(self):
+        """
+        Retorna a quantidade de combinações por faixa de 1% de probabilidade.
+        """
+        return {int(faixa): quantidade for faixa, quantidade in self.meta['distribuicao'].items()}
+
+
+def _diretorio_tabela(impressao, diretorio=DIR_TABELAS):
+    return path.join(diretorio, impressao)
+
+
+def _remover_antigas(diretorio=DIR_TABELAS, manter=MANTER_TABELAS):
+    tabelas = [
+        entrada for entrada in scandir(diretorio)
+        if entrada.is_dir() and path.exists(path.join(entrada.path, ARQ_META))
+    ]
+    tabelas.sort(key=lambda entrada: entrada.stat().st_mtime, reverse=True)
+    for entrada in tabelas[manter:]:
+        rmtree(entrada.path, ignore_errors=True)
+
+
+def gerar_tabela(modelo, diretorio=DIR_TABELAS, bloco=BLOCO, manter=MANTER_TABELAS):
+    """
+    Avalia todas as combinações com o modelo e grava a tabela de pontuações.
+
+    As combinações são avaliadas com as dezenas em ordem crescente, em blocos
+    de `bloco` jogos. A tabela é gravada em um diretório temporário e movida
+    para o destino somente ao final.
+
+    :param modelo: modelo Keras treinado (criar_modelo).
+    :param diretorio: diretório das tabelas (default: {DIR_TABELAS}).
+    :param bloco: quantidade de jogos por chamada ao modelo (default: {BLOCO}).
+    :param manter: quantidade de tabelas mantidas no diretório (default: {MANTER_TABELAS}).
+
+    :return: a TabelaPontuacoes gerada.
+    """
+
+    impressao = impressao_digital(modelo)
+    destino = _diretorio_tabela(impressao, diretorio)
+    temporario = destino + '.tmp'
+
+    rmtree(temporario, ignore_errors=True)
+    makedirs(temporario)
+
+    pontuacoes = np.lib.format.open_memmap(
+                                            path.join(temporario, ARQ_PONTUACOES),
+                                            mode='w+',
+                                            dtype='<f4',
+                                            shape=(TOTAL_COMBINACOES,)
+                                            )
+
+    for inicio in range(0, TOTAL_COMBINACOES, bloco):
+        fim = min(inicio + bloco, TOTAL_COMBINACOES)
+        jogos = desranquear_lote(np.arange(inicio, fim)).astype('int16')
+        previsao = modelo.predict(jogos, batch_size=len(jogos), verbose=0)
+        pontuacoes[inicio:fim] = np.asarray(previsao, dtype=np.float32).reshape(-1)
+
+    # Ranques ordenados da maior para a menor pontuação (estável no ranque)
+    ordem = np.argsort(-pontuacoes, kind='stable').astype('<u4')
+    np.save(path.join(temporario, ARQ_ORDEM), ordem)
+
+    faixas = np.minimum(np.floor(pontuacoes * 100), 99).astype(np.int64)
+    contagem = np.bincount(faixas, minlength=100)
+    meta = {
+        'impressao': impressao,
+        'total': TOTAL_COMBINACOES,
+        'criado_em': datetime.now().isoformat(timespec='seconds'),
+        'ordem_dezenas': 'crescente',
+        'distribuicao': {str(faixa): int(quantidade) for faixa, quantidade in enumerate(contagem)},
+    }
+
+    pontuacoes.flush()
+    del pontuacoes
+
+    with open(path.join(temporario, ARQ_META), 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, indent=2)
+
+    rmtree(destino, ignore_errors=True)
+    replace(temporario, destino)
+    _remover_antigas(diretorio, manter)
+
+    return carregar_tabela(impressao, diretorio)
+
+
+def carregar_tabela(modelo, diretorio=DIR_TABELAS):
+    """
+    Abre a tabela de pontuações mapeada em memória.
+
+    :param modelo: modelo Keras treinado ou a sua impressão digital.
+    :param diretorio: diretório das tabelas (default: {DIR_TABELAS}).
+
+    :return: a TabelaPontuacoes, ou None se a tabela do modelo não existir.
+    """
+
+    impressao = modelo if isinstance(modelo, str) else impressao_digital(modelo)
+    destino = _diretorio_tabela(impressao, diretorio)
+    arq_meta = path.join(destino, ARQ_META)
+
+    if not path.exists(arq_meta):
+        return None
+
+    with open(arq_meta, encoding='utf-8') as arquivo:
+        meta = json.load(arquivo)
+
+    if meta.get('impressao') != impressao or meta.get('total') != TOTAL_COMBINACOES:
+        raise ValueError(f'Tabela de pontuações inconsistente: {destino}')
+
+    pontuacoes = np.load(path.join(destino, ARQ_PONTUACOES), mmap_mode='r')
+    ordem = np.load(path.join(destino, ARQ_ORDEM), mmap_mode='r')
+
+    return TabelaPontuacoes(pontuacoes, ordem, meta)
+
+
+def obter_tabela(modelo, diretorio=DIR_TABELAS):
+    """
+    Carrega a tabela do modelo, gerando-a caso ainda não exista.
+
+    :param modelo: modelo Keras treinado.
+    :param diretorio: diretório das tabelas (default: {DIR_TABELAS}).
+
+    :return: a TabelaPontuacoes do modelo.
+    """
+
+    tabela = carregar_tabela(modelo, diretorio)
+    if tabela is None:
+        tabela = gerar_tabela(modelo, diretorio)
+    return tabela
@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional
+import argparse
+
+from dados.dados import carregar_dados, dividir_dados
+
+SILENT = 0
+
+# Lote padrão do modo de vazão (o criar_modelo usa 15)
+LOTE_VAZAO = 512
+
+# Fração final dos dados de treino usada na validação (igual ao validation_split do criar_modelo)
+FRACAO_VALIDACAO = 0.2
+
+
+@dataclass
+class MetricasTreino:
+    """
+    Medidas de desempenho de um treinamento.
+    """
+
+    lote: int
+    epocas: int
+    amostras: int
+    duracao: float
+    amostras_por_segundo: float
+    tempo_ate_acuracia: Optional[float]
+    melhor_acuracia_validacao: float
+    pontuacao: float = 0.0
+
+    def resumo(self):
+        ate_acuracia = 'não atingida' if self.tempo_ate_acuracia is None else f'{self.tempo_ate_acuracia:.1f}s'
+        return (
+            f'Lote {self.lote}: {self.epocas} épocas em {self.duracao:.1f}s '
+            f'({self.amostras_por_segundo:,.0f} amostras/s) - acurácia alvo: {ate_acuracia} - '
+            f'validação {round(self.melhor_acuracia_validacao * 100, 1)}% - teste {round(self.pontuacao * 100, 1)}%'
+        )
+
+
+def configurar_threads(intra=None, inter=None):
+    """
+    Define as threads do TensorFlow (antes de qualquer operação ser executada).
+
+    :param intra: threads usadas dentro de cada operação (None - padrão do TensorFlow).
+    :param inter: operações executadas em paralelo (None - padrão do TensorFlow).
+    :return: True se a configuração foi aplicada.
+    """
+
+    import tensorflow as tf
+
+    try:
+        if intra is not None:
+            tf.config.threading.set_intra_op_parallelism_threads(intra)
+        if inter is not None:
+            tf.config.threading.set_inter_op_parallelism_threads(inter)
+    except RuntimeError:
+        # O runtime já foi iniciado neste processo
+        return False
+
+    return True
+
+
+def _medidor(acuracia_alvo):
+    from keras import callbacks
+
+    class MedidorVazao(callbacks.Callback):
+        """
+        Cronometra o treino e registra quando a acurácia de validação atinge o alvo.
+        """
+
+        def on_train_begin(self, logs=None):
+            self.inicio = perf_counter()
+            self.tempo_ate_acuracia = None
+            self.melhor = 0.0
+            self.epocas = 0
+
+        def on_epoch_end(self, epoca, logs=None):
+            self.epocas = epoca + 1
+            acuracia = (logs or {}).get('val_accuracy', 0.0)
+            self.melhor = max(self.melhor, acuracia)
+            if self.tempo_ate_acuracia is None and acuracia_alvo is not None and acuracia >= acuracia_alvo:
+                self.tempo_ate_acuracia = perf_counter() - self.inicio
+
+        def on_train_end(self, logs=None):
+            self.duracao = perf_counter() - self.inicio
+
+    return MedidorVazao()
+
+
+def _pipeline(x, y, lote, semente, embaralhar):
+    import tensorflow as tf
+
+    dados = tf.data.Dataset.from_tensor_slices((x.astype('float32'), y.astype('float32'))).cache()
+    if embaralhar:
+        dados = dados.shuffle(len(x), seed=semente, reshuffle_each_iteration=True)
+    return dados.batch(lote).prefetch(tf.data.AUTOTUNE)
+
+
+def criar_modelo_vazao(
+                        base_dados,
+                        primeira_camada=30,
+                        segunda_camada=15,
+                        terceira_camada=15,
+                        saida=1,
+                        periodo=200,
+                        lote=LOTE_VAZAO,
+                        taxa_aprendizado=0.01,
+                        semente=12,
+                        threads_intra=None,
+                        threads_inter=None,
+                        acuracia_alvo=None,
+                        paciencia=15
+                    ):
+    """
+    Treina o modelo do criar_modelo com foco em vazão.
+
+    Usa tf.data com cache e prefetch, lotes maiores com decaimento cosseno da
+    taxa de aprendizado, threads configuráveis e semente determinística.
+
+    :param base_dados: DataFrame da base de dados.
+    :param primeira_camada: neurônios da primeira camada (relu). Default: 30.
+    :param segunda_camada: neurônios da segunda camada (relu). Default: 15.
+    :param terceira_camada: neurônios da terceira camada (relu). Default: 15.
+    :param saida: neurônios da camada de saída (sigmoid). Default: 1.
+    :param periodo: quantidade máxima de épocas.
+    :param lote: quantidade de instâncias por passo.
+    :param taxa_aprendizado: taxa inicial do otimizador Adam.
+    :param semente: semente dos pesos, do embaralhamento e das operações.
+    :param threads_intra: threads dentro de cada operação (None - padrão do TensorFlow).
+    :param threads_inter: operações em paralelo (None - padrão do TensorFlow).
+    :param acuracia_alvo: acurácia de validação usada para medir o tempo até a acurácia.
+    :param paciencia: épocas sem melhora na validação antes de parar.
+    :return: o modelo gerado, sua acurácia e as MetricasTreino.
+    """
+
+    configurar_threads(threads_intra, threads_inter)
+
+    import keras
+    import tensorflow as tf
+    from keras import callbacks, layers, models, optimizers
+
+    keras.utils.set_random_seed(semente)
+    try:
+        tf.config.experimental.enable_op_determinism()
+    except AttributeError:
+        pass
+
+    x_treino, x_teste, y_treino, y_teste, atributos = dividir_dados(base_dados)
+
+    # Mesma separação do validation_split: a fração final dos dados de treino
+    corte = int(len(x_treino) * (1 - FRACAO_VALIDACAO))
+    treino = _pipeline(x_treino[:corte], y_treino[:corte], lote, semente, embaralhar=True)
+    validacao = _pipeline(x_treino[corte:], y_treino[corte:], lote, semente, embaralhar=False)
+
+    modelo = models.Sequential()
+    modelo.add(layers.Dense(primeira_camada, input_dim=atributos, activation='relu'))
+    modelo.add(layers.Dense(segunda_camada, activation='relu'))
+    modelo.add(layers.Dense(terceira_camada, activation='relu'))
+    modelo.add(layers.Dense(saida, activation='sigmoid'))
+
+    passos = periodo * -(-corte // lote)
+    taxa = optimizers.schedules.CosineDecay(taxa_aprendizado, decay_steps=max(1, passos), alpha=0.05)
+    modelo.compile(
+                    loss='binary_crossentropy',
+                    optimizer=optimizers.Adam(learning_rate=taxa),
+                    metrics=['accuracy'])
+
+    early_stopping = callbacks.EarlyStopping(monitor='val_loss', patience=paciencia, restore_best_weights=True)
+    medidor = _medidor(acuracia_alvo)
+
+    modelo.fit(
+                treino,
+                epochs=periodo,
+                verbose=SILENT,
+                validation_data=validacao,
+                callbacks=[early_stopping, medidor]
+              )
+
+    pontuacao = modelo.evaluate(x_teste, y_teste, batch_size=lote, verbose=SILENT)[1]
+
+    metricas = MetricasTreino(
+        lote=lote,
+        epocas=medidor.epocas,
+        amostras=corte * medidor.epocas,
+        duracao=medidor.duracao,
+        amostras_por_segundo=corte * medidor.epocas / medidor.duracao if medidor.duracao else 0.0,
+        tempo_ate_acuracia=medidor.tempo_ate_acuracia,
+        melhor_acuracia_validacao=medidor.melhor,
+        pontuacao=pontuacao,
+    )
+
+    return modelo, pontuacao, metricas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara configurações de treino do modelo legado.')
+    parser.add_argument('--lotes', type=int, nargs='+', default=[15, 128, 512, 1024])
+    parser.add_argument('--taxa', type=float, default=0.01, help='Taxa de aprendizado inicial.')
+    parser.add_argument('--periodo', type=int, default=200, help='Quantidade máxima de épocas.')
+    parser.add_argument('--threads-intra', type=int, default=None)
+    parser.add_argument('--threads-inter', type=int, default=None)
+    parser.add_argument('--acuracia-alvo', type=float, default=0.9, help='Acurácia de validação (0 a 1).')
+    parser.add_argument('--semente', type=int, default=12)
+    opcoes = parser.parse_args()
+
+    dados = carregar_dados()
+    for lote in opcoes.lotes:
+        _, _, metricas = criar_modelo_vazao(
+            dados,
+            periodo=opcoes.periodo,
+            lote=lote,
+            taxa_aprendizado=opcoes.taxa,
+            semente=opcoes.semente,
+            threads_intra=opcoes.threads_intra,
+            threads_inter=opcoes.threads_inter,
+            acuracia_alvo=opcoes.acuracia_alvo,
+        )
+        print(metricas.resumo())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
-from . import indice_resultado, possibilidades, reajustar_dados, resultados
+from . import combinatoria, indice_resultado, mascara, possibilidades, reajustar_dados, resultados, sorteados
 
 __all__ = [
+    'combinatoria',
     'indice_resultado',
+    'mascara',
     'possibilidades',
     'reajustar_dados',
     'resultados',
+    'sorteados',
 ]
@@ -0,0 +1,123 @@
+from math import comb
+
+import numpy as np
+
+
+# Quantidade de dezenas do volante e de dezenas por jogo
+TOTAL_DEZENAS = 25
+TAMANHO_JOGO = 15
+
+# Total de combinações possíveis da Lotofácil (3.268.760)
+TOTAL_COMBINACOES = comb(TOTAL_DEZENAS, TAMANHO_JOGO)
+
+# Tabela de coeficientes binomiais: BINOMIAIS[n, k] = C(n, k)
+BINOMIAIS = np.array(
+    [[comb(n, k) for k in range(TOTAL_DEZENAS + 1)] for n in range(TOTAL_DEZENAS + 1)],
+    dtype=np.int64,
+)
+
+
+def _validar_lote(jogos, n, k):
+    """
+    Ordena e valida um lote de jogos no formato (quantidade, k).
+    """
+
+    jogos = np.asarray(jogos, dtype=np.int64)
+    if jogos.size == 0:
+        return jogos.reshape(0, k)
+
+    jogos = np.atleast_2d(jogos)
+    if jogos.ndim != 2 or jogos.shape[1] != k:
+        raise ValueError(f'Cada jogo deve conter exatamente {k} dezenas.')
+
+    jogos = np.sort(jogos, axis=1)
+
+    if jogos.min() < 1 or jogos.max() > n:
+        raise ValueError(f'As dezenas devem estar entre 1 e {n}.')
+
+    if k > 1 and not np.all(np.diff(jogos, axis=1) > 0):
+        raise ValueError('As dezenas de cada jogo devem ser únicas.')
+
+    return jogos
+
+
+def ranquear_lote(jogos, n=TOTAL_DEZENAS, k=TAMANHO_JOGO):
+    """
+    Calcula a posição de cada jogo na ordem lexicográfica das combinações.
+
+    A posição é a mesma do jogo na lista de possibilidades (combinacoes.csv),
+    obtida apenas com aritmética sobre os coeficientes binomiais.
+
+    :param jogos: Array (quantidade, k) ou lista de jogos.
+    :param n: Quantidade de dezenas do universo (default: {25}).
+    :param k: Quantidade de dezenas por jogo (default: {15}).
+
+    :return: Array int64 com o índice (base 0) de cada jogo.
+    """
+
+    jogos = _validar_lote(jogos, n, k)
+
+    # Índice complementar: C(n, k) - 1 - soma C(n - c_i, k - i + 1)
+    restantes = np.arange(k, 0, -1)
+    soma = BINOMIAIS[n - jogos, restantes].sum(axis=1)
+
+    return comb(n, k) - 1 - soma
+
+
+def desranquear_lote(indices, n=TOTAL_DEZENAS, k=TAMANHO_JOGO):
+    """
+    Obtém os jogos correspondentes às posições informadas.
+
+    :param indices: Array ou lista de índices (base 0).
+    :param n: Quantidade de dezenas do universo (default: {25}).
+    :param k: Quantidade de dezenas por jogo (default: {15}).
+
+    :return: Array int64 (quantidade, k) com os jogos em ordem crescente.
+    """
+
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    total = comb(n, k)
+
+    if indices.size and (indices.min() < 0 or indices.max() >= total):
+        raise ValueError(f'Os índices devem estar entre 0 e {total - 1}.')
+
+    # Decomposição do índice complementar no sistema combinatório
+    resto = total - 1 - indices
+    jogos = np.empty((indices.size, k), dtype=np.int64)
+
+    for posicao in range(k):
+        restantes = k - posicao
+        coluna = BINOMIAIS[:n, restantes]
+        maior = np.searchsorted(coluna, resto, side='right') - 1
+        resto = resto - coluna[maior]
+        jogos[:, posicao] = n - maior
+
+    return jogos
+
+
+def ranquear(jogo, n=TOTAL_DEZENAS, k=TAMANHO_JOGO):
+    """
+    Calcula a posição de um jogo na lista de possibilidades.
+
+    :param jogo: Lista com as dezenas do jogo.
+    :param n: Quantidade de dezenas do universo (default: {25}).
+    :param k: Quantidade de dezenas por jogo (default: {15}).
+
+    :return: O índice (base 0) do jogo.
+    """
+
+    return int(ranquear_lote([jogo], n, k)[0])
+
+
+def desranquear(indice, n=TOTAL_DEZENAS, k=TAMANHO_JOGO):
+    """
+    Obtém o jogo que ocupa a posição informada na lista de possibilidades.
+
+    :param indice: Índice (base 0) do jogo.
+    :param n: Quantidade de dezenas do universo (default: {25}).
+    :param k: Quantidade de dezenas por jogo (default: {15}).
+
+    :return: Lista com as dezenas do jogo em ordem crescente.
+    """
+
+    return desranquear_lote([indice], n, k)[0].tolist()
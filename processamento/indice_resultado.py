@@ -1,6 +1,5 @@
 from pandas import read_csv
 
-from processamento.possibilidades import obter_possibilidades
 from processamento.reajustar_dados import obter_indices
 
 ARQUIVO = "./base/resultados.csv"
@@ -24,8 +23,7 @@ def dados_indice(atualizar_base_resultados=False):
         numeros.sort()
 
     resultados = num_ordenados.tolist()
-    possibilidades = obter_possibilidades()
-    indices = obter_indices(possibilidades, resultados)
+    indices = obter_indices(None, resultados)
 
     dados = resultado_concurso[["Concurso", "Data Sorteio", "Ganhou"]].copy()
     dia = dados["Data Sorteio"].apply(lambda data: data[0:2])
@@ -0,0 +1,213 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Quantidade de dezenas do volante
+TOTAL_DEZENAS = 25
+
+# Máscara com todas as dezenas marcadas (bits 0 a 24)
+MASCARA_COMPLETA = (1 << TOTAL_DEZENAS) - 1
+
+# Bit de cada dezena: a dezena d ocupa o bit d - 1
+BITS = np.left_shift(np.uint32(1), np.arange(TOTAL_DEZENAS, dtype=np.uint32))
+
+
+def empacotar(jogos):
+    """
+    Converte jogos (listas de dezenas) em máscaras de 25 bits.
+
+    :param jogos: Array (quantidade, n) ou lista de jogos, que podem ter
+    quantidades diferentes de dezenas.
+
+    :return: Array uint32 com uma máscara por jogo.
+    """
+
+    try:
+        matriz = np.asarray(jogos, dtype=np.int64)
+    except ValueError:
+        matriz = None
+
+    if matriz is None or matriz.ndim != 2:
+        # Jogos com quantidades diferentes de dezenas
+        return np.array([_empacotar_jogo(jogo) for jogo in jogos], dtype=np.uint32)
+
+    if matriz.size and (matriz.min() < 1 or matriz.max() > TOTAL_DEZENAS):
+        raise ValueError(f'As dezenas devem estar entre 1 e {TOTAL_DEZENAS}.')
+
+    return np.bitwise_or.reduce(BITS[matriz - 1], axis=1).astype(np.uint32)
+
+
+def _empacotar_jogo(jogo):
+    mascara = 0
+    for dezena in jogo:
+        dezena = int(dezena)
+        if not 1 <= dezena <= TOTAL_DEZENAS:
+            raise ValueError(f'As dezenas devem estar entre 1 e {TOTAL_DEZENAS}.')
+        mascara |= 1 << (dezena - 1)
+    return mascara
+
+
+def empacotar_vetores(vetores):
+    """
+    Converte vetores binários (quantidade, 25) em máscaras de 25 bits.
+
+    :param vetores: Matriz 0/1 onde a coluna i representa a dezena i + 1.
+
+    :return: Array uint32 com uma máscara por linha.
+    """
+
+    vetores = np.asarray(vetores).astype(bool)
+    return np.bitwise_or.reduce(np.where(vetores, BITS, np.uint32(0)), axis=1).astype(np.uint32)
+
+
+def para_vetores(mascaras):
+    """
+    Converte máscaras em vetores binários (quantidade, 25).
+
+    :param mascaras: Array ou lista de máscaras.
+
+    :return: Matriz uint8 onde a coluna i representa a dezena i + 1.
+    """
+
+    mascaras = np.asarray(mascaras, dtype=np.uint32).reshape(-1, 1)
+    return ((mascaras & BITS) != 0).astype(np.uint8)
+
+
+def desempacotar(mascaras):
+    """
+    Converte máscaras na forma de listas de dezenas em ordem crescente.
+
+    :param mascaras: Array ou lista de máscaras.
+
+    :return: Lista de jogos (listas de dezenas).
+    """
+
+    vetores = para_vetores(mascaras).astype(bool)
+    dezenas = np.arange(1, TOTAL_DEZENAS + 1)
+    return [dezenas[vetor].tolist() for vetor in vetores]
+
+
+def desempacotar_lote(mascaras, n_dz=15):
+    """
+    Converte máscaras com a mesma quantidade de dezenas em um array.
+
+    :param mascaras: Array ou lista de máscaras.
+    :param n_dz: Quantidade de dezenas de cada jogo (default: {15}).
+
+    :return: Array int64 (quantidade, n_dz) com as dezenas em ordem crescente.
+    """
+
+    mascaras = np.asarray(mascaras, dtype=np.uint32).reshape(-1)
+    if not np.all(contar(mascaras) == n_dz):
+        raise ValueError(f'Todas as máscaras devem conter {n_dz} dezenas.')
+
+    _, colunas = np.nonzero(para_vetores(mascaras))
+    return (colunas + 1).reshape(-1, n_dz).astype(np.int64)
+
+
+def _contar_swar(valores):
+    # Contagem de bits paralela para versões do NumPy sem bitwise_count
+    valores = valores - ((valores >> 1) & np.uint32(0x55555555))
+    valores = (valores & np.uint32(0x33333333)) + ((valores >> 2) & np.uint32(0x33333333))
+    valores = (valores + (valores >> 4)) & np.uint32(0x0F0F0F0F)
+    return ((valores * np.uint32(0x01010101)) >> 24).astype(np.uint8)
+
+
+def contar(mascaras):
+    """
+    Conta as dezenas marcadas em cada máscara (popcount).
+
+    :param mascaras: Array ou lista de máscaras.
+
+    :return: Array uint8 com a quantidade de dezenas.
+    """
+
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(mascaras).astype(np.uint8)
+    return _contar_swar(mascaras)
+
+
+def acertos(mascaras, sorteio):
+    """
+    Conta as dezenas em comum entre os jogos e um sorteio.
+
+    :param mascaras: Array de máscaras dos jogos.
+    :param sorteio: Máscara (ou array de máscaras, com broadcasting) do sorteio.
+
+    :return: Array uint8 com os acertos de cada jogo.
+    """
+
+    return contar(np.bitwise_and(np.asarray(mascaras, dtype=np.uint32), np.asarray(sorteio, dtype=np.uint32)))
+
+
+def matriz_acertos(jogos, sorteios):
+    """
+    Conta os acertos de todos os jogos em todos os sorteios.
+
+    :param jogos: Array de máscaras dos jogos.
+    :param sorteios: Array de máscaras dos sorteios.
+
+    :return: Matriz uint8 (sorteios, jogos) com a quantidade de acertos.
+    """
+
+    jogos = np.asarray(jogos, dtype=np.uint32).reshape(1, -1)
+    sorteios = np.asarray(sorteios, dtype=np.uint32).reshape(-1, 1)
+    return acertos(jogos, sorteios)
+
+
+def complemento(mascaras):
+    """
+    Retorna as máscaras com as dezenas não marcadas.
+
+    :param mascaras: Array ou lista de máscaras.
+
+    :return: Array uint32 com o complemento de cada máscara.
+    """
+
+    return np.bitwise_and(np.invert(np.asarray(mascaras, dtype=np.uint32)), np.uint32(MASCARA_COMPLETA))
+
+
+def deduplicar(mascaras):
+    """
+    Remove máscaras repetidas mantendo a ordem da primeira ocorrência.
+
+    :param mascaras: Array ou lista de máscaras.
+
+    :return: Array uint32 sem repetições.
+    """
+
+    mascaras = np.asarray(mascaras, dtype=np.uint32).reshape(-1)
+    _, primeiros = np.unique(mascaras, return_index=True)
+    return mascaras[np.sort(primeiros)]
+
+
+@dataclass(frozen=True)
+class Jogo:
+    """
+    Jogo ou sorteio representado por uma máscara de 25 bits.
+    """
+
+    mascara: int
+
+    @classmethod
+    def de_dezenas(cls, dezenas):
+        return cls(_empacotar_jogo(dezenas))
+
+    @property
+    def dezenas(self):
+        return [dezena for dezena in range(1, TOTAL_DEZENAS + 1) if self.mascara >> (dezena - 1) & 1]
+
+    def acertos(self, outro):
+        outro = outro.mascara if isinstance(outro, Jogo) else _empacotar_jogo(outro)
+        return bin(self.mascara & outro).count('1')
+
+    def complemento(self):
+        return Jogo(~self.mascara & MASCARA_COMPLETA)
+
+    def __contains__(self, dezena):
+        return 1 <= dezena <= TOTAL_DEZENAS and bool(self.mascara >> (dezena - 1) & 1)
+
+    def __len__(self):
+        return bin(self.mascara).count('1')
@@ -1,21 +1,126 @@
+from math import comb
+from os import path
+from struct import Struct
+from zlib import crc32
+
+import numpy as np
 from pandas import read_csv
 
+from processamento.mascara import desempacotar_lote
+
 
 ARQUIVO = './combinacoes/combinacoes.csv'
 
+# Arquivo binário: uma máscara uint32 por combinação, em ordem lexicográfica
+ARQUIVO_BIN = './combinacoes/combinacoes.bin'
+
+# Cabeçalho: assinatura, versão, dezenas do universo, dezenas por jogo,
+# total de combinações e CRC32 das máscaras (preenchido até 64 bytes)
+ASSINATURA = b'LOTOCOMB'
+VERSAO = 1
+CABECALHO = Struct('<8sHHHHQI')
+TAMANHO_CABECALHO = 64
 
-def obter_possibilidades(arq=ARQUIVO):
+# Quantidade de máscaras lidas por vez ao validar o CRC32
+BLOCO_VALIDACAO = 1 << 20
+
+
+def montar_cabecalho(n, k, total, checksum):
+	"""
+	Monta o cabeçalho do arquivo binário de combinações.
+
+	:param n: Quantidade de dezenas do universo
+	:param k: Quantidade de dezenas por jogo
+	:param total: Quantidade de combinações gravadas
+	:param checksum: CRC32 das máscaras gravadas
+
+	:return: Os bytes do cabeçalho (64 bytes)
+	"""
+
+	cabecalho = CABECALHO.pack(ASSINATURA, VERSAO, n, k, 0, total, checksum)
+	return cabecalho.ljust(TAMANHO_CABECALHO, b'\0')
+
+
+def ler_cabecalho(arq=ARQUIVO_BIN):
+	"""
+	Lê e valida o cabeçalho do arquivo binário de combinações.
+
+	:param arq: Arquivo binário com as combinações
+
+	:return: Dicionário com n, k, total e checksum
+	"""
+
+	with open(arq, 'rb') as arquivo:
+		bruto = arquivo.read(TAMANHO_CABECALHO)
+
+	if len(bruto) < TAMANHO_CABECALHO:
+		raise ValueError(f'Arquivo de combinações inválido: {arq}')
+
+	assinatura, versao, n, k, _, total, checksum = CABECALHO.unpack_from(bruto)
+
+	if assinatura != ASSINATURA or versao != VERSAO:
+		raise ValueError(f'Arquivo de combinações com formato desconhecido: {arq}')
+
+	if total != comb(n, k) or path.getsize(arq) != TAMANHO_CABECALHO + total * 4:
+		raise ValueError(f'Arquivo de combinações incompleto: {arq}')
+
+	return {'n': n, 'k': k, 'total': total, 'checksum': checksum}
+
+
+def abrir_combinacoes(arq=ARQUIVO_BIN, validar=False):
+	"""
+	Abre o arquivo binário de combinações mapeado em memória.
+
+	O mapeamento é somente leitura, então processos diferentes (API,
+	Streamlit, scheduler) compartilham o mesmo cache de páginas do sistema.
+
+	:param arq: Arquivo binário com as combinações
+	:param validar: Confere o CRC32 das máscaras (lê o arquivo inteiro)
+
+	:return: numpy.memmap uint32 com a máscara de cada combinação
+	"""
+
+	cabecalho = ler_cabecalho(arq)
+	mascaras = np.memmap(
+						arq,
+						dtype='<u4',
+						mode='r',
+						offset=TAMANHO_CABECALHO,
+						shape=(cabecalho['total'],)
+						)
+
+	if validar:
+		checksum = 0
+		for inicio in range(0, len(mascaras), BLOCO_VALIDACAO):
+			checksum = crc32(mascaras[inicio:inicio + BLOCO_VALIDACAO].tobytes(), checksum)
+
+		if checksum != cabecalho['checksum']:
+			raise ValueError(f'Checksum do arquivo de combinações não confere: {arq}')
+
+	return mascaras
+
+
+def obter_possibilidades(arq=ARQUIVO_BIN):
 	"""
 	Cria uma lista com todas as combinações possíveis da lotofácil
-		
-	:param arq: Arquivo CSV com as combinações
-	
-	:return: Uma lista com todas as combinações 
+
+	:param arq: Arquivo binário (ou CSV legado) com as combinações
+
+	:return: Uma lista com todas as combinações
 	"""
 
-	df = read_csv(arq, sep=';', encoding='utf-8')
-	
-	df.drop(columns=['seq'], inplace=True)
-	possibilidades = df.values
+	if arq.endswith('.csv'):
+		df = read_csv(arq, sep=';', encoding='utf-8')
+
+		df.drop(columns=['seq'], inplace=True)
+		possibilidades = df.values
+
+		return possibilidades.tolist()
+
+	if not path.exists(arq):
+		from dados.gerar_combinacoes import criar_combinacoes_bin
+
+		criar_combinacoes_bin(arq)
 
-	return possibilidades.tolist()
+	mascaras = abrir_combinacoes(arq)
+	return desempacotar_lote(mascaras, ler_cabecalho(arq)['k']).tolist()
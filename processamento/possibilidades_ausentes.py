@@ -1,5 +1,7 @@
 from pandas import read_csv
 
+from processamento.mascara import complemento, desempacotar, empacotar
+
 URL = "./base/resultados.csv"
 DEZENAS = [i for i in range(1, 26)]
 
@@ -14,13 +16,12 @@ def criar_nao_sorteados(
     Retorna lista com as dezenas não sorteadas em cada concurso.
     """
 
+    # Máscara das dezenas consideradas; o complemento fica restrito a elas
+    universo = int(empacotar([dz])[0]) if len(dz) else 0
+
     if base_lista is not None and isinstance(base_lista, list):
-        nao_sorteados = []
-        for resultado in base_lista:
-            resultado.sort()
-            diferenca = set(dz).difference(resultado)
-            nao_sorteados.append(list(diferenca))
-        return nao_sorteados
+        mascaras = empacotar(base_lista) if base_lista else []
+        return desempacotar(complemento(mascaras) & universo)
 
     if atualizar_base_resultados:
         # Atualiza o CSV com todos os resultados dos sorteios já realizados
@@ -31,10 +32,4 @@ def criar_nao_sorteados(
     dados = read_csv(base_url, sep=";", encoding="utf-8")
     resultados = dados.iloc[:, 2:17].values
 
-    nao_sorteados = []
-    for resultado in resultados:
-        resultado.sort()
-        diferenca = set(dz).difference(resultado)
-        nao_sorteados.append(list(diferenca))
-
-    return nao_sorteados
+    return desempacotar(complemento(empacotar(resultados)) & universo)
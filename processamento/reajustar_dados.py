@@ -1,36 +1,35 @@
-from dados.busca import buscar
+from itertools import compress
 
+from processamento.combinatoria import TOTAL_COMBINACOES, ranquear_lote
+from processamento.sorteados import BitsetSorteados
 
-def _obter_indices_validos(possibilidades, resultado_concursos):
+
+def _obter_indices_validos(resultado_concursos):
 	"""
-	Busca os ��ndices das combina����es informadas e garante que todos foram encontrados.
+	Calcula os índices das combinações informadas e garante que todas são válidas.
 	"""
-	elem_ini = 0
-	elem_fin = len(possibilidades) - 1
+	try:
+		return ranquear_lote(resultado_concursos).tolist()
+	except ValueError:
+		pass
 
-	indices = list()
+	# Algum resultado é inválido: identifica quais para compor a mensagem
 	nao_encontrados = list()
 
 	for valor_busca in resultado_concursos:
-		indice = buscar(
-                          possibilidades,
-                          elem_ini,
-                          elem_fin,
-                          valor_busca
-                         )
-		if indice is None:
+		try:
+			ranquear_lote([valor_busca])
+		except ValueError:
 			nao_encontrados.append(valor_busca)
-		else:
-			indices.append(indice)
 
 	if nao_encontrados:
 		exemplos = ', '.join(str(seq) for seq in nao_encontrados[:3])
 		raise ValueError(
-						f'{len(nao_encontrados)} resultado(s) n�o encontrados na lista de possibilidades. '
+						f'{len(nao_encontrados)} resultado(s) não encontrados na lista de possibilidades. '
 						f'Exemplos: {exemplos}'
 						)
 
-	return indices
+	return []
 
 
 def remover_resultado_concursos(possibilidades, resultado_concursos):
@@ -42,28 +41,29 @@ def remover_resultado_concursos(possibilidades, resultado_concursos):
 	
 	return:	A lista de possibilidades sem os resultados já sorteados.
 	"""
-	from pandas import Series
-
-	indices = _obter_indices_validos(possibilidades, resultado_concursos)
+	indices = _obter_indices_validos(resultado_concursos)
 
 	if not indices:
 		return possibilidades
 
-	s_possibilidades = Series(possibilidades)
-	removidos = s_possibilidades.drop(indices)
+	if len(possibilidades) != TOTAL_COMBINACOES:
+		raise ValueError('A lista de possibilidades deve conter todas as combinações da Lotofácil.')
 
-	lista_possibilidades_atualizada = removidos.values 
-	
-	return lista_possibilidades_atualizada.tolist()
+	# Bitset indexado pelo ranque: a posição na lista é o próprio índice
+	sorteados = BitsetSorteados()
+	sorteados.adicionar(resultado_concursos)
+
+	return list(compress(possibilidades, sorteados.livres()))
 
 
 def obter_indices(possibilidades, resultado_concursos):
 	"""
 	Obtém os índices da lista de possibilidades dos resultados já sorteados.
 	
-	:param possibilidades: Combinações possíveis da Lotofácil
+	:param possibilidades: Mantido por compatibilidade; os índices são calculados
+	pelo sistema combinatório, sem carregar a lista (pode ser None).
 	:param resultado_concursos: Resultado de todos os concursos
 	
 	return:	Uma lista com os índice dos resultados já sorteados nos concursos.
 	"""
-	return _obter_indices_validos(possibilidades, resultado_concursos)
+	return _obter_indices_validos(resultado_concursos)
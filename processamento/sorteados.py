@@ -0,0 +1,214 @@
+from os import makedirs, path, replace
+from struct import Struct
+
+import numpy as np
+
+from processamento.combinatoria import TOTAL_COMBINACOES, ranquear_lote
+
+
+# Bitset persistido: um bit por combinação, indexado pelo ranque lexicográfico
+ARQUIVO = './base/sorteados.bits'
+
+# Cabeçalho: assinatura, versão, total de combinações, último concurso
+# processado e quantidade de combinações marcadas (preenchido até 32 bytes)
+ASSINATURA = b'LOTOSORT'
+VERSAO = 1
+CABECALHO = Struct('<8sHHQqI')
+TAMANHO_CABECALHO = 32
+
+# Quantidade de bytes do bitset (aprox. 400 KB)
+TAMANHO_BITSET = (TOTAL_COMBINACOES + 7) // 8
+
+COLUNAS_DEZENAS = [f'B{i}' for i in range(1, 16)]
+
+
+class BitsetSorteados:
+	"""
+	Conjunto das combinações já sorteadas com consulta O(1) por jogo.
+	"""
+
+	def __init__(self, bits=None, ultimo_concurso=0):
+		if bits is None:
+			bits = np.zeros(TAMANHO_BITSET, dtype=np.uint8)
+		self.bits = bits
+		self.ultimo_concurso = ultimo_concurso
+
+	@property
+	def quantidade(self):
+		return int(np.unpackbits(self.bits).sum())
+
+	def adicionar(self, jogos):
+		"""
+		Marca os jogos informados como sorteados.
+
+		:param jogos: Lista ou array (quantidade, 15) de jogos.
+
+		:return: A quantidade de combinações que ainda não estavam marcadas.
+		"""
+		indices = ranquear_lote(jogos)
+		novos = int(np.count_nonzero(~self.contem_indices(np.unique(indices))))
+		np.bitwise_or.at(self.bits, indices >> 3, np.left_shift(1, indices & 7).astype(np.uint8))
+		return novos
+
+	def contem_indices(self, indices):
+		"""
+		Verifica, pelo ranque, quais combinações já foram sorteadas.
+
+		:param indices: Array de índices (base 0) das combinações.
+
+		:return: Array booleano (True - já sorteada).
+		"""
+		indices = np.asarray(indices, dtype=np.int64)
+		return ((self.bits[indices >> 3] >> (indices & 7).astype(np.uint8)) & 1).astype(bool)
+
+	def verificar_lote(self, jogos):
+		"""
+		Verifica quais jogos ainda não foram sorteados.
+
+		:param jogos: Lista ou array (quantidade, 15) de jogos.
+
+		:return: Array booleano (True - jogo aceito | False - já sorteado).
+		"""
+		return ~self.contem_indices(ranquear_lote(jogos))
+
+	def verificar(self, jogo):
+		"""
+		Verifica se um jogo ainda não foi sorteado.
+
+		:param jogo: Lista com as dezenas do jogo.
+
+		:return: True - (Jogo aceito) e False - (Jogo já sorteado).
+		"""
+		return bool(self.verificar_lote([jogo])[0])
+
+	def livres(self):
+		"""
+		Retorna um array booleano, indexado pelo ranque, das combinações não sorteadas.
+		"""
+		return ~np.unpackbits(self.bits, count=TOTAL_COMBINACOES, bitorder='little').astype(bool)
+
+	def salvar(self, arq=ARQUIVO):
+		"""
+		Grava o bitset no disco substituindo o arquivo de forma atômica.
+
+		:param arq: Arquivo do bitset (default: {ARQUIVO}).
+		"""
+		diretorio = path.dirname(arq)
+		if diretorio:
+			makedirs(diretorio, exist_ok=True)
+
+		cabecalho = CABECALHO.pack(
+								ASSINATURA,
+								VERSAO,
+								0,
+								TOTAL_COMBINACOES,
+								int(self.ultimo_concurso),
+								self.quantidade
+								)
+
+		temporario = arq + '.tmp'
+		with open(temporario, 'wb') as arquivo:
+			arquivo.write(cabecalho.ljust(TAMANHO_CABECALHO, b'\0'))
+			arquivo.write(self.bits.tobytes())
+		replace(temporario, arq)
+
+	@classmethod
+	def carregar(cls, arq=ARQUIVO):
+		"""
+		Lê o bitset do disco.
+
+		:param arq: Arquivo do bitset (default: {ARQUIVO}).
+
+		:return: O bitset, vazio caso o arquivo ainda não exista.
+		"""
+		if not path.exists(arq):
+			return cls()
+
+		with open(arq, 'rb') as arquivo:
+			bruto = arquivo.read()
+
+		assinatura, versao, _, total, ultimo_concurso, _ = CABECALHO.unpack_from(bruto)
+
+		if assinatura != ASSINATURA or versao != VERSAO or total != TOTAL_COMBINACOES:
+			raise ValueError(f'Arquivo de sorteados com formato desconhecido: {arq}')
+
+		bits = np.frombuffer(bruto, dtype=np.uint8, count=TAMANHO_BITSET, offset=TAMANHO_CABECALHO).copy()
+		return cls(bits, ultimo_concurso)
+
+	@classmethod
+	def de_resultados(cls, resultado_concursos):
+		"""
+		Cria o bitset a partir de uma lista de resultados.
+
+		:param resultado_concursos: Resultado de todos os concursos.
+		"""
+		sorteados = cls()
+		if len(resultado_concursos):
+			sorteados.adicionar(resultado_concursos)
+		return sorteados
+
+
+def dezenas_sorteadas(dados):
+	"""
+	Extrai as 15 dezenas de cada concurso.
+
+	:param dados: DataFrame com as colunas B1..B15 ou no layout da planilha (dezenas nas colunas 2 a 16).
+
+	:return: Array (concursos, 15) de int64.
+	"""
+
+	colunas = [coluna for coluna in COLUNAS_DEZENAS if coluna in dados.columns]
+	if len(colunas) == len(COLUNAS_DEZENAS):
+		return dados[colunas].to_numpy(dtype=np.int64)
+	return dados.iloc[:, 2:17].to_numpy(dtype=np.int64)
+
+
+def carregar_sorteados(arq=ARQUIVO):
+	"""
+	Carrega o bitset persistido das combinações já sorteadas.
+
+	:param arq: Arquivo do bitset (default: {ARQUIVO}).
+
+	:return: Instância de BitsetSorteados.
+	"""
+
+	return BitsetSorteados.carregar(arq)
+
+
+def atualizar_sorteados(dados, arq=ARQUIVO):
+	"""
+	Marca no bitset persistido apenas os concursos posteriores ao último processado.
+
+	:param dados: DataFrame com as colunas Concurso e as 15 dezenas sorteadas.
+	:param arq: Arquivo do bitset (default: {ARQUIVO}).
+
+	:return: A quantidade de concursos processados nesta atualização.
+	"""
+
+	sorteados = BitsetSorteados.carregar(arq)
+	novos = dados[dados['Concurso'] > sorteados.ultimo_concurso]
+
+	if novos.empty and path.exists(arq):
+		return 0
+
+	if not novos.empty:
+		sorteados.adicionar(dezenas_sorteadas(novos))
+		sorteados.ultimo_concurso = int(novos['Concurso'].max())
+
+	sorteados.salvar(arq)
+	return len(novos)
+
+
+def verificar_lote(jogos, sorteados=None):
+	"""
+	Verifica quais jogos ainda não foram sorteados.
+
+	:param jogos: Lista ou array (quantidade, 15) de jogos.
+	:param sorteados: Bitset a consultar (default: o bitset persistido).
+
+	:return: Array booleano (True - jogo aceito | False - já sorteado).
+	"""
+
+	if sorteados is None:
+		sorteados = carregar_sorteados()
+	return sorteados.verificar_lote(jogos)
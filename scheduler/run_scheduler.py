@@ -1,15 +1,24 @@
 """Scheduler simples para atualização de dados e re-treino periódico."""
 
+import http.client
 import os
 from apscheduler.schedulers.blocking import BlockingScheduler
 
-from dados import scrapping_resultados
+from dados import api_concursos, scrapping_resultados
 from app.ml.pipelines import treinar_modelo_dezena, treinar_modelo_jogo
-from app.core.logging import log_entretenimento
+from app.core.logging import LOGGER, log_entretenimento
+
+# Falhas da API que justificam baixar a planilha completa
+FALHAS_API = (api_concursos.ErroHttp, OSError, http.client.HTTPException)
 
 
 def atualizar_dados():
-    scrapping_resultados.atualizar_resultados()
+    # Busca só os concursos novos; a planilha completa fica como alternativa
+    try:
+        scrapping_resultados.preencher_lacunas()
+    except FALHAS_API:
+        LOGGER.exception("Scheduler: falha na API de concursos; baixando a planilha completa")
+        scrapping_resultados.atualizar_resultados()
     log_entretenimento("Scheduler: atualização de dados concluída")
 
 
@@ -1,3 +1,3 @@
-from . import sortear
+from . import lote, sortear
 
-__all__ = ['sortear']
+__all__ = ['lote', 'sortear']
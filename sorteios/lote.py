@@ -0,0 +1,211 @@
+"""
+Busca de jogos em lote: sorteio vetorizado, predição em bloco e processos trabalhadores.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from sorteios.sortear import sortear_lote
+
+
+@dataclass
+class ConfigBusca:
+    alvo_jogos: int = 1
+    prob_alvo: float = 99.9
+    prob_salvar: float = 99.0
+    tamanho_lote: int = 4096
+    processos: int = 1
+    max_iteracoes: Optional[int] = None
+    semente: Optional[int] = None
+
+
+@dataclass
+class ResultadoBusca:
+    aceitos: List[Dict[str, object]] = field(default_factory=list)
+    alta_probabilidade: List[Dict[str, object]] = field(default_factory=list)
+    iteracoes: int = 0
+    duracao: float = 0.0
+
+    @property
+    def iteracoes_por_segundo(self) -> float:
+        return self.iteracoes / self.duracao if self.duracao else 0.0
+
+
+# Estado de cada processo trabalhador (preenchido pelo inicializador)
+_ESTADO: Dict[str, object] = {}
+
+
+def carregar_modelo(caminho: str):
+    """Carrega o modelo salvo pelo processo principal (.npz usa o ModeloNumpy, sem TensorFlow)."""
+
+    if caminho.endswith(".npz"):
+        from modelo.inferencia import ModeloNumpy
+
+        return ModeloNumpy.carregar(caminho)
+
+    from keras import models
+
+    return models.load_model(caminho)
+
+
+def _inicializar(caminho_modelo: str, pesos: List[float], bits: bytes, config: ConfigBusca) -> None:
+    from processamento.sorteados import BitsetSorteados
+
+    _ESTADO["modelo"] = carregar_modelo(caminho_modelo)
+    _ESTADO["pesos"] = pesos
+    _ESTADO["sorteados"] = BitsetSorteados(np.frombuffer(bits, dtype=np.uint8).copy())
+    _ESTADO["config"] = config
+
+
+def avaliar_candidatos(modelo, pesos, sorteados, quantidade: int, rng) -> Dict[str, np.ndarray]:
+    """
+    Sorteia e avalia um bloco de candidatos com uma única chamada ao modelo.
+
+    :param modelo: modelo com método predict (Keras ou compatível).
+    :param pesos: pesos das dezenas 1..25.
+    :param sorteados: BitsetSorteados com os jogos já sorteados.
+    :param quantidade: quantidade de candidatos do bloco.
+    :param rng: numpy.random.Generator usado no sorteio.
+
+    :return: dicionário com os jogos (ordem de sorteio), a predição e se o jogo é inédito.
+    """
+
+    jogos = sortear_lote(pesos, quantidade, rng=rng)
+    previsao = np.asarray(modelo.predict(jogos.astype("int16"), batch_size=quantidade, verbose=0)).reshape(-1)
+    ineditos = sorteados.verificar_lote(jogos)
+    return {"jogos": jogos, "previsao": previsao, "ineditos": ineditos}
+
+
+def _avaliar_tarefa(semente: np.random.SeedSequence):
+    config: ConfigBusca = _ESTADO["config"]
+    rng = np.random.default_rng(semente)
+    avaliados = avaliar_candidatos(
+        _ESTADO["modelo"],
+        _ESTADO["pesos"],
+        _ESTADO["sorteados"],
+        config.tamanho_lote,
+        rng,
+    )
+    return _filtrar(avaliados, config)
+
+
+def _filtrar(avaliados: Dict[str, np.ndarray], config: ConfigBusca):
+    probabilidades = np.round(avaliados["previsao"] * 100, 1)
+    selecionados = np.nonzero(probabilidades >= min(config.prob_salvar, config.prob_alvo))[0]
+    registros = [
+        (
+            avaliados["jogos"][indice].tolist(),
+            float(probabilidades[indice]),
+            bool(probabilidades[indice] >= config.prob_alvo and avaliados["ineditos"][indice]),
+        )
+        for indice in selecionados
+    ]
+    return len(probabilidades), registros
+
+
+def buscar_jogos(
+    modelo,
+    pontuacao: float,
+    pesos: List[float],
+    sorteados,
+    config: Optional[ConfigBusca] = None,
+    progresso: Optional[Callable[[ResultadoBusca], None]] = None,
+    intervalo_progresso: float = 5.0,
+    caminho_modelo: Optional[str] = None,
+) -> ResultadoBusca:
+    """
+    Busca jogos com probabilidade >= prob_alvo ainda não sorteados.
+
+    Com processos > 1 o modelo é salvo em caminho_modelo e carregado por cada
+    processo trabalhador; cada bloco usa uma semente derivada de config.semente.
+
+    :param modelo: modelo treinado (criar_modelo).
+    :param pontuacao: acurácia do modelo, registrada junto aos jogos.
+    :param pesos: pesos das dezenas 1..25.
+    :param sorteados: BitsetSorteados com os jogos já sorteados.
+    :param config: parâmetros da busca (padrão: ConfigBusca()).
+    :param progresso: função chamada periodicamente com o resultado parcial.
+    :param intervalo_progresso: segundos entre as chamadas de progresso.
+    :param caminho_modelo: arquivo temporário do modelo para os processos.
+
+    :return: ResultadoBusca com os jogos aceitos, os de alta probabilidade e a vazão.
+    """
+
+    config = config or ConfigBusca()
+    resultado = ResultadoBusca()
+    sementes = np.random.SeedSequence(config.semente)
+    acuracia = round(pontuacao * 100, 1)
+    vistos = set()
+    inicio = time.perf_counter()
+    ultimo_aviso = inicio
+
+    def registrar(avaliados: int, registros) -> None:
+        resultado.iteracoes += avaliados
+        for jogo, probabilidade, aceito in registros:
+            sequencia = " ".join(str(numero).zfill(2) for numero in jogo)
+            if probabilidade >= config.prob_salvar:
+                resultado.alta_probabilidade.append(
+                    {"sequencia": sequencia, "probabilidade": probabilidade, "acuracia": acuracia}
+                )
+            chave = tuple(sorted(jogo))
+            if aceito and chave not in vistos and len(resultado.aceitos) < config.alvo_jogos:
+                vistos.add(chave)
+                resultado.aceitos.append(
+                    {"sequencia": sequencia, "probabilidade": probabilidade, "acuracia": acuracia}
+                )
+
+    def concluido() -> bool:
+        if len(resultado.aceitos) >= config.alvo_jogos:
+            return True
+        return config.max_iteracoes is not None and resultado.iteracoes >= config.max_iteracoes
+
+    def avisar() -> None:
+        nonlocal ultimo_aviso
+        agora = time.perf_counter()
+        resultado.duracao = agora - inicio
+        if progresso and intervalo_progresso > 0 and agora - ultimo_aviso >= intervalo_progresso:
+            ultimo_aviso = agora
+            progresso(resultado)
+
+    if config.processos <= 1:
+        while not concluido():
+            rng = np.random.default_rng(sementes.spawn(1)[0])
+            avaliados = avaliar_candidatos(modelo, pesos, sorteados, config.tamanho_lote, rng)
+            registrar(*_filtrar(avaliados, config))
+            avisar()
+    else:
+        if caminho_modelo is None:
+            raise ValueError("Informe caminho_modelo para usar processos trabalhadores.")
+        modelo.save(caminho_modelo)
+
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=config.processos,
+            mp_context=contexto,
+            initializer=_inicializar,
+            initargs=(caminho_modelo, list(pesos), sorteados.bits.tobytes(), config),
+        ) as executor:
+            pendentes = {
+                executor.submit(_avaliar_tarefa, semente)
+                for semente in sementes.spawn(config.processos * 2)
+            }
+            while pendentes:
+                feitos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in feitos:
+                    registrar(*futuro.result())
+                avisar()
+                if concluido():
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    break
+                for _ in feitos:
+                    pendentes.add(executor.submit(_avaliar_tarefa, sementes.spawn(1)[0]))
+
+    resultado.duracao = time.perf_counter() - inicio
+    return resultado
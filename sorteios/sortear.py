@@ -1,39 +1,86 @@
-from random import choices
+import numpy as np
 
 
 DEZENAS = [d for d in range(1, 26)]
 
 
-def sortear_numeros(n_pesos: list, n_numero_peso: dict, dz=DEZENAS, n_dz=15):
+def gerador_aleatorio(semente=None):
     """
-    Sorteia as dezenas do jogo.
- 
-    :param n_pesos: lista de peso das dezenas.
+    Normaliza a fonte de aleatoriedade dos sorteios.
+
+    :param semente: None, inteiro ou numpy.random.Generator.
+
+    :return: um numpy.random.Generator.
+    """
+
+    if isinstance(semente, np.random.Generator):
+        return semente
+    return np.random.default_rng(semente)
+
+
+def ajustar_pesos(n_pesos, n_numero_peso, dz=DEZENAS):
+    """
+    Aplica o dicionário de pesos por dezena sobre a lista de pesos.
+
+    :param n_pesos: lista de peso das dezenas, na mesma ordem de dz.
     :param n_numero_peso: dicionário com as dezenas e seus respectivos pesos.
     :param dz: Lista com a relação de dezenas default:{DEZENAS}.
+
+    :return: lista de pesos usada no sorteio.
+    """
+
+    return [n_numero_peso.get(dezena, peso) for dezena, peso in zip(dz, n_pesos)]
+
+
+def sortear_lote(n_pesos, n_jogos, rng=None, dz=DEZENAS, n_dz=15):
+    """
+    Sorteia vários jogos de uma vez, sem reposição e ponderando pelos pesos.
+
+    Cada dezena recebe a chave peso / Exp(1) (equivalente ao Gumbel top-k) e
+    as n_dz maiores chaves formam o jogo, na mesma distribuição do sorteio
+    sequencial com random.choices.
+
+    :param n_pesos: lista de peso das dezenas, na mesma ordem de dz.
+    :param n_jogos: quantidade de jogos a sortear.
+    :param rng: numpy.random.Generator (ou semente) usado no sorteio.
+    :param dz: Lista com a relação de dezenas default:{DEZENAS}.
     :param n_dz: Quantidade de dezenas a serem sorteadas default:{15}.
-    
-    :return: as dezenas sorteadas.
+
+    :return: array (n_jogos, n_dz) com as dezenas na ordem em que foram sorteadas.
     """
 
-    dezenas = dz[:]
-    pesos = n_pesos[:]
-    numero_peso = n_numero_peso.copy()
+    pesos = np.asarray(n_pesos, dtype=np.float64)
+    dezenas = np.asarray(dz)
+
+    if pesos.shape != dezenas.shape:
+        raise ValueError('A lista de pesos deve ter o mesmo tamanho da lista de dezenas.')
 
-    sorteados = list()
+    if np.any(pesos < 0) or np.count_nonzero(pesos) < n_dz:
+        raise ValueError(f'É preciso ao menos {n_dz} dezenas com peso positivo.')
 
-    # Sorteando as dezenas do jogo
-    while len(sorteados) != n_dz:
-        # Sorteia um número aleatoriamente ponderando o seu peso
-        numero_sorteado = choices(dezenas, weights=pesos, k=1)
+    rng = gerador_aleatorio(rng)
+    chaves = pesos / rng.standard_exponential((n_jogos, pesos.size))
 
-        # Remove da relação de sorteio os números já sorteados
-        dezenas.remove(numero_sorteado[-1])
-        p = numero_peso.pop(numero_sorteado[-1])
-        pesos.remove(p)
+    # Seleciona as n_dz maiores chaves e as ordena (ordem de sorteio)
+    topo = np.argpartition(-chaves, n_dz - 1, axis=1)[:, :n_dz]
+    ordem = np.argsort(-np.take_along_axis(chaves, topo, axis=1), axis=1)
 
-        # Atribui o número sorteado ao vetor
-        sorteados.append(numero_sorteado)
+    return dezenas[np.take_along_axis(topo, ordem, axis=1)]
+
+
+def sortear_numeros(n_pesos: list, n_numero_peso: dict, dz=DEZENAS, n_dz=15, rng=None):
+    """
+    Sorteia as dezenas do jogo.
+
+    :param n_pesos: lista de peso das dezenas.
+    :param n_numero_peso: dicionário com as dezenas e seus respectivos pesos.
+    :param dz: Lista com a relação de dezenas default:{DEZENAS}.
+    :param n_dz: Quantidade de dezenas a serem sorteadas default:{15}.
+    :param rng: numpy.random.Generator (ou semente) usado no sorteio.
+
+    :return: as dezenas sorteadas.
+    """
 
-    return sorteados
+    sorteados = sortear_lote(ajustar_pesos(n_pesos, n_numero_peso, dz), 1, rng=rng, dz=dz, n_dz=n_dz)[0]
 
+    return [[int(numero)] for numero in sorteados]
@@ -0,0 +1,147 @@
+"""Busca concorrente de concursos na API, com um transporte falso."""
+
+import asyncio
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dados import api_concursos as api
+from dados import scrapping_resultados as etl
+
+URL_CONCURSO = "fake://concurso/{concurso}"
+URL_ULTIMO = "fake://ultimo"
+
+rng = np.random.default_rng(3)
+DEZENAS = {concurso: np.sort(rng.choice(np.arange(1, 26), 15, replace=False)) for concurso in range(1, 61)}
+
+
+def resposta(concurso):
+    return {
+        "numero": concurso,
+        "dataApuracao": "02/02/2020",
+        "listaDezenas": [f"{dezena:02d}" for dezena in DEZENAS[concurso]],
+        "listaRateioPremio": [{"faixa": 1, "numeroDeGanhadores": concurso % 3}],
+    }
+
+
+class TransporteFalso:
+    """Responde pelo número do concurso; `falhas` lista os status devolvidos antes do sucesso."""
+
+    def __init__(self, ultimo, falhas=None, invalidos=()):
+        self.ultimo = ultimo
+        self.falhas = {concurso: list(status) for concurso, status in (falhas or {}).items()}
+        self.invalidos = set(invalidos)
+        self.chamadas = []
+        self.fechado = False
+
+    async def obter_json(self, url):
+        self.chamadas.append(url)
+        await asyncio.sleep(0)
+        if url == URL_ULTIMO:
+            return {"numero": self.ultimo}
+
+        concurso = int(url.rsplit("/", 1)[1])
+        pendentes = self.falhas.get(concurso)
+        if pendentes:
+            raise api.ErroHttp(pendentes.pop(0), url)
+        if concurso in self.invalidos:
+            return {"numero": concurso}
+        return resposta(concurso)
+
+    async def fechar(self):
+        self.fechado = True
+
+    def tentativas(self, concurso):
+        return self.chamadas.count(URL_CONCURSO.format(concurso=concurso))
+
+
+def buscar(concursos, transporte, tentativas=api.TENTATIVAS):
+    return asyncio.run(
+        api.buscar_concursos(concursos, transporte, simultaneos=3, tentativas=tentativas, espera_base=0, url=URL_CONCURSO)
+    )
+
+
+def test_repete_503():
+    transporte = TransporteFalso(10, falhas={2: [503, 503]})
+
+    registros = buscar([3, 1, 2], transporte)
+
+    assert [registro["Concurso"] for registro in registros] == [1, 2, 3]
+    assert transporte.tentativas(2) == 3
+    assert registros[1]["B1"] == DEZENAS[2][0] and registros[1]["Ganhou"] == 2
+    assert not transporte.fechado
+
+
+def test_para_no_primeiro_concurso_com_falha(caplog):
+    # 404 não é repetido; 503 além das tentativas também derruba o concurso
+    transporte = TransporteFalso(10, falhas={3: [404], 5: [503] * 3})
+
+    with caplog.at_level("WARNING", logger="lotofacil.dados"):
+        registros = buscar(range(1, 7), transporte, tentativas=3)
+
+    assert [registro["Concurso"] for registro in registros] == [1, 2]
+    assert transporte.tentativas(3) == 1
+    assert transporte.tentativas(5) == 3
+    assert "Concurso 3 indisponível" in caplog.text
+
+
+def test_resposta_invalida_nao_e_truncada():
+    # Mudança no formato da API é erro, não lacuna a preencher depois
+    transporte = TransporteFalso(10, falhas={2: [404]}, invalidos={4})
+
+    with pytest.raises(KeyError):
+        buscar(range(1, 6), transporte)
+
+
+def test_sem_concursos_novos():
+    transporte = TransporteFalso(8)
+
+    assert buscar([], transporte) == []
+    faltantes = api.baixar_faltantes(
+        8, transporte, tentativas=1, espera_base=0, url_concurso=URL_CONCURSO, url_ultimo=URL_ULTIMO
+    )
+    assert faltantes.empty
+    assert transporte.chamadas == [URL_ULTIMO]
+
+
+@pytest.fixture
+def historico(tmp_path, monkeypatch):
+    # Histórico local com os concursos 1..50 gerado pelo ETL da planilha (arquivo local)
+    monkeypatch.chdir(tmp_path)
+    linhas = [[concurso, "01/01/2020", *DEZENAS[concurso], concurso % 3] for concurso in range(1, 51)]
+    colunas = ["Concurso", "Data Sorteio", *[f"Bola{i}" for i in range(1, 16)], "Ganhadores_15_Números"]
+    planilha = tmp_path / "lotofacil.xlsx"
+    with io.BytesIO() as conteudo:
+        pd.DataFrame(linhas, columns=colunas).to_excel(conteudo, index=False)
+        planilha.write_bytes(conteudo.getvalue())
+    etl.atualizar_resultados(planilha.as_uri())
+    return tmp_path / "base" / "resultados.csv"
+
+
+def lacunas(transporte):
+    return etl.preencher_lacunas(transporte=transporte, url_concurso=URL_CONCURSO, url_ultimo=URL_ULTIMO)
+
+
+def test_preencher_lacunas(historico):
+    transporte = TransporteFalso(55, falhas={51: [503], 54: [404]})
+
+    resultado = lacunas(transporte)
+
+    # 54 falhou: só os concursos contíguos (51 a 53) entram; o 55 fica para a próxima execução
+    assert resultado["meta"]["novos_registros"] == 3
+    assert resultado["meta"]["ultimo_concurso"] == 53
+    dados = pd.read_csv(historico, sep=";")
+    assert dados["Concurso"].tolist() == list(range(1, 54))
+    assert dados.loc[dados["Concurso"] == 52, [f"B{i}" for i in range(1, 16)]].to_numpy().ravel().tolist() == (
+        DEZENAS[52].tolist()
+    )
+
+    resultado = lacunas(TransporteFalso(55))
+    assert resultado["meta"]["ultimo_concurso"] == 55
+    assert pd.read_csv(historico, sep=";")["Concurso"].tolist() == list(range(1, 56))
+
+    transporte = TransporteFalso(55)
+    assert lacunas(transporte)["inalterado"]
+    assert transporte.chamadas == [URL_ULTIMO]
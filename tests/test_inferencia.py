@@ -0,0 +1,60 @@
+"""Paridade entre o modelo Keras legado e o ModeloNumpy."""
+
+import numpy as np
+import pytest
+
+keras = pytest.importorskip("keras")
+
+from modelo.inferencia import TOLERANCIA, ModeloNumpy, exportar_pesos, verificar_paridade  # noqa: E402
+from processamento.combinatoria import TOTAL_COMBINACOES, desranquear_lote  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def modelo():
+    # Mesma arquitetura do criar_modelo, sem treino (pesos iniciais da semente)
+    from keras import layers, models
+
+    keras.utils.set_random_seed(7)
+    modelo = models.Sequential()
+    modelo.add(layers.Input(shape=(15,)))
+    modelo.add(layers.Dense(30, activation="relu"))
+    modelo.add(layers.Dense(15, activation="relu"))
+    modelo.add(layers.Dense(15, activation="relu"))
+    modelo.add(layers.Dense(1, activation="sigmoid"))
+    modelo.compile(loss="binary_crossentropy", optimizer="adam", metrics=["accuracy"])
+    return modelo
+
+
+@pytest.fixture(scope="module")
+def jogos():
+    rng = np.random.default_rng(0)
+    jogos = desranquear_lote(rng.integers(TOTAL_COMBINACOES, size=512)).astype("int16")
+    jogos[::2] = rng.permuted(jogos[::2], axis=1)
+    return jogos
+
+
+def test_predict_igual_ao_keras(modelo, jogos):
+    esperado = modelo.predict(jogos, verbose=0)
+    obtido = ModeloNumpy.de_keras(modelo).predict(jogos)
+
+    assert obtido.shape == esperado.shape
+    assert obtido.dtype == np.float32
+    np.testing.assert_allclose(obtido, esperado, rtol=0, atol=TOLERANCIA)
+
+
+def test_predict_em_blocos(modelo, jogos):
+    modelo_numpy = ModeloNumpy.de_keras(modelo)
+
+    np.testing.assert_array_equal(modelo_numpy.predict(jogos, batch_size=100), modelo_numpy.predict(jogos))
+
+
+def test_salvar_carregar(modelo, jogos, tmp_path):
+    arquivo = tmp_path / "modelo.npz"
+    exportado = exportar_pesos(modelo, str(arquivo))
+    carregado = ModeloNumpy.carregar(str(arquivo))
+
+    assert carregado.ativacoes == ["relu", "relu", "relu", "sigmoid"]
+    for original, lido in zip(exportado.get_weights(), carregado.get_weights()):
+        np.testing.assert_array_equal(original, lido)
+    np.testing.assert_allclose(carregado.predict(jogos), modelo.predict(jogos, verbose=0), rtol=0, atol=TOLERANCIA)
+    assert verificar_paridade(modelo, carregado) <= TOLERANCIA
@@ -0,0 +1,166 @@
+"""Download condicional e atualização incremental do ETL da planilha."""
+
+import hashlib
+import io
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dados import scrapping_resultados as etl
+
+INSTANTE = 1_700_000_000
+
+
+def planilha(quantidade, semente=1):
+    """Planilha no formato da Caixa com os concursos 1..quantidade."""
+
+    rng = np.random.default_rng(semente)
+    linhas = [
+        [concurso, f"{concurso % 28 + 1:02d}/01/2020", *np.sort(rng.choice(np.arange(1, 26), 15, replace=False)), 0]
+        for concurso in range(1, quantidade + 1)
+    ]
+    colunas = ["Concurso", "Data Sorteio", *[f"Bola{i}" for i in range(1, 16)], "Ganhadores_15_Números"]
+    conteudo = io.BytesIO()
+    pd.DataFrame(linhas, columns=colunas).to_excel(conteudo, index=False)
+    return conteudo.getvalue()
+
+
+class Servidor:
+    """Servidor HTTP local que entrega a planilha e responde 304 aos validadores."""
+
+    def __init__(self, corpo, validadores=True):
+        self.corpo = corpo
+        self.modificado = formatdate(INSTANTE, usegmt=True)
+        self.validadores = validadores
+        self.respostas = []
+
+        estado = self
+
+        class Tratador(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                etag = '"%s"' % hashlib.md5(estado.corpo).hexdigest()
+                if estado.validadores and (
+                    self.headers.get("If-None-Match") == etag
+                    or self.headers.get("If-Modified-Since") == estado.modificado
+                ):
+                    estado.respostas.append(304)
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                estado.respostas.append(200)
+                self.send_response(200)
+                if estado.validadores:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", estado.modificado)
+                self.send_header("Content-Length", str(len(estado.corpo)))
+                self.end_headers()
+                self.wfile.write(estado.corpo)
+
+        self.http = ThreadingHTTPServer(("127.0.0.1", 0), Tratador)
+        self.url = f"http://127.0.0.1:{self.http.server_port}/lotofacil.xlsx"
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def publicar(self, corpo):
+        # Nova versão da planilha, com outro ETag e Last-Modified posterior
+        self.corpo = corpo
+        self.modificado = formatdate(INSTANTE + len(self.respostas) + 1, usegmt=True)
+
+    def fechar(self):
+        self.http.shutdown()
+        self.http.server_close()
+
+
+@pytest.fixture
+def servidor():
+    servidores = []
+
+    def criar(corpo, validadores=True):
+        servidores.append(Servidor(corpo, validadores))
+        return servidores[-1]
+
+    yield criar
+    for aberto in servidores:
+        aberto.fechar()
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    # O ETL e os estados persistidos usam caminhos relativos a ./base
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / "base"
+
+
+def test_304_pelo_etag(servidor):
+    local = servidor(planilha(5))
+    primeiro = etl.baixar_planilha(local.url)
+    assert not primeiro.inalterado and primeiro.etag
+
+    segundo = etl.baixar_planilha(local.url, {"etag": primeiro.etag, "sha256": primeiro.sha256})
+
+    assert local.respostas == [200, 304]
+    assert segundo.inalterado and segundo.conteudo is None
+    assert segundo.origem() == {"etag": primeiro.etag, "last_modified": None, "sha256": primeiro.sha256}
+
+
+def test_304_pelo_if_modified_since(servidor):
+    local = servidor(planilha(5))
+    primeiro = etl.baixar_planilha(local.url)
+    assert primeiro.last_modified == local.modificado
+
+    segundo = etl.baixar_planilha(local.url, {"last_modified": primeiro.last_modified})
+
+    assert local.respostas == [200, 304]
+    assert segundo.inalterado
+
+
+def test_sha256_igual_sem_validadores(servidor):
+    local = servidor(planilha(5), validadores=False)
+    primeiro = etl.baixar_planilha(local.url)
+    segundo = etl.baixar_planilha(local.url, primeiro.origem())
+
+    assert local.respostas == [200, 200]
+    assert segundo.inalterado and segundo.sha256 == primeiro.sha256
+
+    local.publicar(planilha(6))
+    assert not etl.baixar_planilha(local.url, primeiro.origem()).inalterado
+
+
+def test_anexa_somente_concursos_novos(servidor, base):
+    local = servidor(planilha(50))
+    resultado = etl.atualizar_resultados(local.url)
+    assert resultado["meta"]["novos_registros"] == 50
+
+    assert etl.atualizar_resultados(local.url)["inalterado"]
+    assert local.respostas[-1] == 304
+
+    antes = (base / "resultados.csv").read_bytes()
+    local.publicar(planilha(53))
+    resultado = etl.atualizar_resultados(local.url)
+    depois = (base / "resultados.csv").read_bytes()
+
+    assert resultado["meta"]["novos_registros"] == 3
+    assert resultado["meta"]["ultimo_concurso"] == 53
+    # As linhas existentes não são reescritas: só as dos concursos > 50 são acrescentadas
+    assert depois.startswith(antes)
+    incremental = pd.read_csv(base / "resultados.csv", sep=";")
+    assert incremental["Concurso"].tolist() == list(range(1, 54))
+
+    etl.atualizar_resultados(local.url, forcar=True)
+    assert pd.read_csv(base / "resultados.csv", sep=";").equals(incremental)
+
+
+def test_anexar_recusa_cabecalho_diferente(tmp_path):
+    destino = tmp_path / "resultados.csv"
+    pd.DataFrame({"Concurso": [1], "B1": [5]}).to_csv(destino, sep=";", index=False)
+
+    assert not etl.anexar_resultados(pd.DataFrame({"Concurso": [2], "B2": [7]}), destino)
+    assert etl.anexar_resultados(pd.DataFrame({"B1": [7], "Concurso": [2]}), destino)
+    assert pd.read_csv(destino, sep=";").to_dict("list") == {"Concurso": [1, 2], "B1": [5, 7]}
@@ -0,0 +1,87 @@
+"""Fixação e limpeza de snapshots; estados atualizados com o id publicado."""
+
+import io
+import os
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dados import armazem, snapshots
+from dados import scrapping_resultados as etl
+
+
+def publicar(raiz, conteudo):
+    etapa = snapshots.preparar_etapa([], raiz)
+    (etapa / "dados.txt").write_text(conteudo)
+    return snapshots.publicar(etapa, raiz)
+
+
+def test_fixado_nao_e_removido(tmp_path):
+    primeiro = publicar(tmp_path, "0")
+
+    with snapshots.fixar(tmp_path) as fixado:
+        assert fixado == primeiro
+        for versao in range(1, snapshots.MANTER + 3):
+            publicar(tmp_path, str(versao))
+        assert fixado.diretorio.is_dir()
+        assert fixado.caminho("dados.txt").read_text() == "0"
+
+    snapshots.limpar(tmp_path)
+    assert not primeiro.diretorio.exists()
+    assert len(snapshots.listar(tmp_path)) == snapshots.MANTER + 1
+
+
+def test_fixacao_expirada_e_ignorada(tmp_path):
+    primeiro = publicar(tmp_path, "0")
+
+    with snapshots.fixar(tmp_path):
+        (fixacao,) = primeiro.caminho(snapshots.DIR_FIXACOES).iterdir()
+        antigo = time.time() - snapshots.FIXACAO_EXPIRADA - 1
+        os.utime(fixacao, (antigo, antigo))
+        for versao in range(1, snapshots.MANTER + 2):
+            publicar(tmp_path, str(versao))
+        assert not primeiro.diretorio.exists()
+
+
+def test_sem_publicacao(tmp_path):
+    with snapshots.fixar(tmp_path) as atual:
+        assert atual is None
+
+
+@pytest.fixture
+def planilha(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(5)
+    dezenas = [np.sort(rng.choice(np.arange(1, 26), 15, replace=False)) for _ in range(60)]
+    colunas = ["Concurso", "Data Sorteio", *[f"Bola{i}" for i in range(1, 16)], "Ganhadores_15_Números"]
+
+    def gerar(quantidade):
+        linhas = [[concurso, "01/01/2020", *dezenas[concurso - 1], 0] for concurso in range(1, quantidade + 1)]
+        with io.BytesIO() as conteudo:
+            pd.DataFrame(linhas, columns=colunas).to_excel(conteudo, index=False)
+            (tmp_path / "lotofacil.xlsx").write_bytes(conteudo.getvalue())
+        return (tmp_path / "lotofacil.xlsx").as_uri()
+
+    return gerar
+
+
+def test_estados_com_id_do_snapshot(planilha):
+    resultado = etl.atualizar_resultados(planilha(40))
+    snapshot = resultado["meta"]["snapshot"]
+    assert armazem.versao_registrada() == snapshot
+
+    url = planilha(45)
+    resultado = etl.atualizar_resultados(url)
+    snapshot = resultado["meta"]["snapshot"]
+    assert armazem.versao_registrada() == snapshot
+    assert armazem.ultimo_concurso() == 45
+
+    # Estados atrás do snapshot publicado são completados na execução seguinte
+    # (mesmo arquivo: a planilha regravada teria outro SHA-256 pela data de criação)
+    with closing(armazem.conectar()) as conexao, conexao:
+        conexao.execute(f"UPDATE {armazem.TABELA_META} SET valor = '0'")
+    assert etl.atualizar_resultados(url)["inalterado"]
+    assert armazem.versao_registrada() == snapshot